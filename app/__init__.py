@@ -1,10 +1,13 @@
 """
 Inicialización de la aplicación Flask
+
+Las rutas y Flask se importan dentro de create_app: importar un módulo
+suelto del paquete (por ejemplo app.registro desde tree_backend.py) no carga
+la aplicación completa. Los datos de egresados y empleos se construyen en la
+primera petición que los usa (app/models.py) y el hilo del registro con el
+primer evento (app/registro.py).
 """
 import os
-from flask import Flask
-from .config import config
-from .routes import init_routes
 
 
 def create_app(config_name=None):
@@ -24,16 +27,29 @@ def create_app(config_name=None):
         else:
             config_name = 'development'
     
+    from flask import Flask
+    from .config import config
+    from .routes import init_routes
+    from .serializacion import configurar_json
+    from .compresion import instalar_compresion
+    
     app = Flask(__name__)
     
     # Aplicar configuración
     config_class = config.get(config_name, config['default'])
     app.config.from_object(config_class)
     
+    # jsonify con orjson si está instalado
+    configurar_json(app)
+    
     # Inicializar configuración específica
     config_class.init_app(app)
     
     # Inicializar las rutas
     init_routes(app)
     
+    # Compresión gzip/deflate alrededor de la app WSGI
+    instalar_compresion(app, app.config['COMPRESION_NIVEL'], app.config['COMPRESION_MIN_BYTES'],
+                        app.config['COMPRESION_CACHE_ENTRADAS'])
+    
     return app
\ No newline at end of file
@@ -1,49 +1,85 @@
 """
 Funciones de autenticación y manejo de JWT
 """
-import jwt
+import hmac
+import os
 import datetime
 from .config import Config
+from .tokens import CacheTokens
+
+# Tokens ya verificados (se reutiliza el payload hasta su exp)
+cache_tokens = CacheTokens(max_entradas=int(os.getenv('CACHE_TOKENS_MAX_ENTRADAS', '4096')))
 
 
 def generar_token(egresado):
     """
     Genera un token JWT para un egresado autenticado
     
+    El token solo lleva la cédula (sub) y la versión del perfil (pv); el
+    perfil en texto se toma del egresado en cada ruta, así el header
+    Authorization no crece con el perfil.
+    
     Args:
         egresado: Instancia de la clase Egresado
     
     Returns:
         str: Token JWT codificado
     """
+    import jwt  # Diferido: solo las rutas con token lo necesitan
+    
     payload = {
-        "cedula": egresado.cedula,
-        "red": egresado.red,
-        "perfil": egresado.perfil,
-        "nombre": egresado.nombre,
+        "sub": egresado.cedula,
+        "pv": egresado.version_perfil,
         "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=Config.JWT_EXPIRATION_HOURS)
     }
     return jwt.encode(payload, Config.SECRET_KEY, algorithm="HS256")
 
 
-def verificar_token(token):
+def decodificar_token(token, secreto):
     """
-    Verifica y decodifica un token JWT
-    
-    Args:
-        token (str): Token JWT a verificar
+    Verifica la firma y decodifica un token JWT
     
     Returns:
         dict or None: Payload del token si es válido, None si es inválido o expirado
     """
+    import jwt
     try:
-        return jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
+        return jwt.decode(token, secreto, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
 
+def verificar_token(token):
+    """
+    Verifica y decodifica un token JWT
+    
+    Los tokens ya verificados se toman de la caché hasta su exp, sin
+    recalcular la firma ni decodificar el JSON (ver app/tokens.py).
+    
+    Args:
+        token (str): Token JWT a verificar
+    
+    Returns:
+        dict or None: Payload del token si es válido, None si es inválido, expirado o revocado
+    """
+    return cache_tokens.verificar(token, Config.SECRET_KEY, decodificar_token)
+
+
+def revocar_token(token):
+    """
+    Revoca un token antes de su expiración (por ejemplo al cerrar sesión)
+    
+    Args:
+        token (str): Token JWT a revocar
+    """
+    payload = decodificar_token(token, Config.SECRET_KEY)
+    if payload is None:
+        return  # Inválido o expirado: ya se rechaza
+    cache_tokens.revocar(token, exp=payload.get("exp"))
+
+
 def extraer_token_del_header(auth_header):
     """
     Extrae el token del header Authorization
@@ -60,16 +96,32 @@ def extraer_token_del_header(auth_header):
     return auth_header.split(" ")[1]
 
 
-def autenticar_egresado(cedula, ficha, egresados_lista):
+def es_token_admin(token, esperado):
+    """
+    Compara el token con el ADMIN_TOKEN configurado en tiempo constante
+    
+    Args:
+        token (str): Token recibido en el header Authorization
+        esperado (str): ADMIN_TOKEN configurado (None = administración desactivada)
+    
+    Returns:
+        bool: True si ambos existen y coinciden
+    """
+    if not esperado or not token:
+        return False
+    return hmac.compare_digest(token.encode(), esperado.encode())
+
+
+def autenticar_egresado(cedula, ficha, egresados):
     """
     Autentica un egresado con cedula y ficha
     
     Args:
         cedula (str): Cédula del egresado
         ficha (str): Ficha del egresado
-        egresados_lista (list): Lista de egresados registrados
+        egresados (IndiceEgresados): Egresados registrados, indexados por cédula
     
     Returns:
         Egresado or None: Egresado si las credenciales son válidas, None si no
     """
-    return next((e for e in egresados_lista if e.cedula == cedula and e.ficha == ficha), None)
\ No newline at end of file
+    return egresados.autenticar(cedula, ficha)
@@ -0,0 +1,144 @@
+"""
+Motor alternativo de búsqueda por palabras clave: índice invertido con BM25F
+
+Indexa los campos perfil_requerido, titulo y descripcion de cada empleo con
+un peso por campo. Las longitudes de cada campo se calculan al indexar y el
+IDF de cada término se calcula al consultar a partir del tamaño de su lista
+de publicación, así agregar, actualizar o retirar un empleo solo toca sus
+propios términos. Una consulta solo recorre las listas de publicación de los
+términos del egresado.
+"""
+import math
+import threading
+from collections import Counter
+
+from .normalizacion import ids_tokens
+from .palabras_clave import IDS_EXCLUIDAS
+
+# Campos indexados y su peso (el perfil requerido pesa más, como en el scoring 40/30/20/10)
+CAMPOS = ("perfil_requerido", "titulo", "descripcion")
+PESOS_CAMPOS = (3.0, 2.0, 1.0)
+
+K1 = 1.2   # Saturación de la frecuencia de término
+B = 0.75   # Normalización por longitud del campo
+
+
+def ids_terminos(texto):
+    """Ids de los tokens normalizados del texto (app.normalizacion.ids_tokens), sin conectores"""
+    return [id_token for id_token in ids_tokens(texto) if id_token not in IDS_EXCLUIDAS]
+
+
+class IndiceBM25:
+    """
+    Índice invertido BM25F sobre el catálogo de empleos.
+
+    Se registra como oyente de un CatalogoEmpleos para indexar cada empleo al
+    cargarlo y mantenerse al día cuando se actualiza o se retira. Los cambios
+    y las consultas toman el mismo lock: una consulta nunca recorre una lista
+    de publicación a medio modificar.
+    """
+
+    def __init__(self, k1=K1, b=B, pesos_campos=PESOS_CAMPOS):
+        self.k1 = k1
+        self.b = b
+        self.pesos_campos = pesos_campos
+        self._publicaciones = {}   # id de término -> {clave: (tf por campo)}
+        self._longitudes = {}      # clave -> (longitud por campo)
+        self._empleos = {}         # clave -> empleo
+        self._orden = {}           # clave -> orden de carga (desempate)
+        self._siguiente = 0
+        self._suma_longitudes = [0] * len(CAMPOS)
+        self._lock = threading.Lock()
+
+    def al_agregar(self, clave, empleo):
+        """Indexa los campos del empleo"""
+        with self._lock:
+            self._indexar(clave, empleo)
+
+    def _indexar(self, clave, empleo):
+        tokens_campos = [ids_terminos(getattr(empleo, campo) or "") for campo in CAMPOS]
+        frecuencias = [Counter(tokens) for tokens in tokens_campos]
+
+        for termino in set().union(*frecuencias):
+            self._publicaciones.setdefault(termino, {})[clave] = tuple(
+                frecuencia[termino] for frecuencia in frecuencias)
+
+        longitudes = tuple(len(tokens) for tokens in tokens_campos)
+        self._longitudes[clave] = longitudes
+        for i, longitud in enumerate(longitudes):
+            self._suma_longitudes[i] += longitud
+        self._empleos[clave] = empleo
+        if clave not in self._orden:
+            self._orden[clave] = self._siguiente
+            self._siguiente += 1
+
+    def _desindexar(self, clave):
+        for termino in set().union(*(ids_terminos(getattr(self._empleos[clave], campo) or "")
+                                     for campo in CAMPOS)):
+            publicaciones = self._publicaciones.get(termino)
+            if publicaciones is not None:
+                publicaciones.pop(clave, None)
+                if not publicaciones:
+                    del self._publicaciones[termino]
+        for i, longitud in enumerate(self._longitudes.pop(clave)):
+            self._suma_longitudes[i] -= longitud
+        del self._empleos[clave]
+
+    def al_actualizar(self, clave, anterior, empleo):
+        """Reindexa el empleo conservando su orden de carga"""
+        with self._lock:
+            self._desindexar(clave)
+            self._indexar(clave, empleo)
+
+    def al_retirar(self, clave, empleo):
+        """Quita el empleo del índice"""
+        with self._lock:
+            self._desindexar(clave)
+            del self._orden[clave]
+
+    def puntuar(self, terminos):
+        """
+        Score BM25F de cada empleo que contiene al menos uno de los términos.
+
+        Returns:
+            dict: clave del empleo -> score
+        """
+        with self._lock:
+            return self._puntuar(terminos)
+
+    def _puntuar(self, terminos):
+        n = len(self._empleos)
+        if not n:
+            return {}
+        promedios = [max(suma / n, 1e-9) for suma in self._suma_longitudes]
+
+        scores = {}
+        for termino in set(terminos):
+            publicaciones = self._publicaciones.get(termino)
+            if not publicaciones:
+                continue
+            idf = math.log(1 + (n - len(publicaciones) + 0.5) / (len(publicaciones) + 0.5))
+            for clave, frecuencias in publicaciones.items():
+                longitudes = self._longitudes[clave]
+                # Frecuencia combinada: suma ponderada de tf normalizado por longitud del campo
+                tf = 0.0
+                for peso, frecuencia, longitud, promedio in zip(
+                        self.pesos_campos, frecuencias, longitudes, promedios):
+                    if frecuencia:
+                        tf += peso * frecuencia / (1 - self.b + self.b * longitud / promedio)
+                scores[clave] = scores.get(clave, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1)
+        return scores
+
+    def buscar(self, egresado):
+        """
+        Empleos ordenados por score BM25F para la red y el perfil del egresado.
+
+        Returns:
+            list: Tuplas (score, empleo) con score > 0, de mayor a menor score
+        """
+        terminos = ids_terminos(egresado.red) + ids_terminos(egresado.perfil)
+        with self._lock:
+            scores = self._puntuar(terminos)
+            # Mayor score primero; a igual score, el empleo cargado antes
+            orden = sorted(scores.items(), key=lambda item: (-item[1], self._orden[item[0]]))
+            return [(round(score, 4), self._empleos[clave]) for clave, score in orden]
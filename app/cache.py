@@ -0,0 +1,87 @@
+"""
+Caché de rankings por egresado con desalojo LRU y expiración por TTL
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheRanking:
+    """
+    Caché LRU con expiración para los rankings de /trabajos.
+
+    La clave debe incluir la cédula y las versiones de los datos usados para
+    calcular el ranking (catálogo de empleos, árbol...). Cualquier cambio en
+    los datos sube su versión, así que una clave vieja ya no se vuelve a
+    pedir: nunca se sirve un ranking desactualizado y las entradas viejas
+    salen por LRU o por TTL.
+
+    Con max_entradas = 0 la caché queda desactivada.
+    """
+
+    def __init__(self, max_entradas=1024, ttl_segundos=300, reloj=time.monotonic):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._datos = OrderedDict()  # clave -> (instante de expiración, valor)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expirados = 0
+        self.desalojados = 0
+
+    @property
+    def activa(self):
+        return self.max_entradas > 0
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado o None si no está o expiró"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            expira, valor = entrada
+            if expira <= self._reloj():
+                del self._datos[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un valor, desalojando el menos usado si se supera el tamaño"""
+        if not self.activa:
+            return
+        with self._lock:
+            self._datos[clave] = (self._reloj() + self.ttl_segundos, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojados += 1
+
+    def invalidar(self, predicado=None):
+        """Elimina todas las entradas, o solo aquellas cuya clave cumple `predicado`"""
+        with self._lock:
+            if predicado is None:
+                self._datos.clear()
+                return
+            for clave in [c for c in self._datos if predicado(c)]:
+                del self._datos[clave]
+
+    def estadisticas(self):
+        """Contadores de uso para dimensionar la caché"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expirados": self.expirados,
+                "desalojados": self.desalojados,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0
+            }
@@ -0,0 +1,192 @@
+"""
+Catálogo de empleos con versión y estructuras derivadas
+"""
+import hashlib
+import threading
+
+
+class CatalogoEmpleos:
+    """
+    Catálogo ordenado de empleos.
+
+    Mantiene el orden de carga de los empleos (se usa para desempatar scores
+    igual que el recorrido lineal original), un contador de versión que
+    aumenta con cada cambio y una lista de oyentes: estructuras derivadas
+    (índices, cachés) que se actualizan de forma incremental cuando se
+    agrega, actualiza o retira un empleo.
+
+    Cada oyente implementa `al_agregar(clave, empleo)`,
+    `al_actualizar(clave, anterior, empleo)` y `al_retirar(clave, empleo)`.
+
+    `version` solo sirve dentro del proceso (vuelve a empezar en cada
+    arranque); `huella` identifica el contenido del catálogo y sirve entre
+    procesos (ETags).
+
+    Es seguro entre hilos: los cambios (y la notificación a los oyentes) se
+    hacen con el lock tomado. Recorrer el catálogo no copia nada: se recorre
+    una tupla inmutable de los empleos que cada cambio descarta y que se
+    vuelve a armar, una vez, en el siguiente recorrido (copia en escritura).
+    """
+
+    def __init__(self, empleos=None, clave=None):
+        """
+        Args:
+            empleos (list): Empleos iniciales
+            clave (callable): Función que obtiene la clave única de un empleo.
+                Si es None se usa un consecutivo interno.
+        """
+        self._clave = clave
+        self._empleos = {}   # clave -> empleo, en orden de carga
+        self._orden = {}     # clave -> posición de carga (para desempates)
+        self._siguiente = 0
+        self._oyentes = []
+        self.version = 0
+        self._huella = None  # Se calcula la primera vez que se pide
+        self._instantanea = None  # Tupla de los empleos; None tras cada cambio
+        self._lock = threading.RLock()  # Reentrante: un oyente puede leer el catálogo
+
+        for empleo in empleos or []:
+            self.agregar(empleo)
+
+    def __getstate__(self):
+        # El lock no se puede serializar (instantáneas de arranque, tree_arranque.py)
+        estado = self.__dict__.copy()
+        del estado["_lock"]
+        estado["_instantanea"] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.RLock()
+
+    def registrar(self, oyente):
+        """Registra una estructura derivada y la carga con los empleos actuales"""
+        with self._lock:
+            for clave, empleo in self._empleos.items():
+                oyente.al_agregar(clave, empleo)
+            self._oyentes.append(oyente)
+        return oyente
+
+    def agregar(self, empleo):
+        """
+        Agrega un empleo al catálogo y notifica a los oyentes
+
+        Returns:
+            La clave asignada al empleo
+        """
+        with self._lock:
+            clave = self._clave(empleo) if self._clave else self._siguiente
+            if clave in self._empleos:
+                raise KeyError(f"Ya existe un empleo con clave {clave!r}")
+
+            self._empleos[clave] = empleo
+            self._instantanea = None
+            self._orden[clave] = self._siguiente
+            self._siguiente += 1
+            self.version += 1
+
+            for oyente in self._oyentes:
+                oyente.al_agregar(clave, empleo)
+            self._combinar_huella(clave, empleo)
+        return clave
+
+    def actualizar(self, clave, empleo):
+        """
+        Reemplaza el empleo de esa clave (conserva su posición) y notifica a los oyentes
+
+        Returns:
+            El empleo anterior
+        """
+        with self._lock:
+            if clave not in self._empleos:
+                raise KeyError(f"No existe un empleo con clave {clave!r}")
+            if self._clave and self._clave(empleo) != clave:
+                raise ValueError(f"La clave del empleo no coincide con {clave!r}")
+
+            anterior = self._empleos[clave]
+            self._combinar_huella(clave, anterior)
+            self._empleos[clave] = empleo
+            self._instantanea = None
+            self.version += 1
+
+            for oyente in self._oyentes:
+                oyente.al_actualizar(clave, anterior, empleo)
+            self._combinar_huella(clave, empleo)
+        return anterior
+
+    def retirar(self, clave):
+        """
+        Quita el empleo del catálogo y notifica a los oyentes
+
+        Returns:
+            El empleo retirado
+        """
+        with self._lock:
+            if clave not in self._empleos:
+                raise KeyError(f"No existe un empleo con clave {clave!r}")
+
+            self._combinar_huella(clave, self._empleos[clave])
+            empleo = self._empleos.pop(clave)
+            self._instantanea = None
+            del self._orden[clave]
+            self.version += 1
+
+            for oyente in self._oyentes:
+                oyente.al_retirar(clave, empleo)
+        return empleo
+
+    @property
+    def huella(self):
+        """
+        Huella del contenido (hex): igual en dos procesos con los mismos
+        empleos en el mismo orden, aunque `version` coincida o no. Se calcula
+        sobre los campos del empleo, no sobre su JSON: no cambia según esté
+        instalado orjson o no.
+        """
+        with self._lock:
+            if self._huella is None:
+                huella = 0
+                for clave, empleo in self._empleos.items():
+                    huella ^= self._digesto(clave, empleo)
+                self._huella = huella
+            return f"{self._huella:016x}"
+
+    def _digesto(self, clave, empleo):
+        campos = empleo.to_dict() if hasattr(empleo, "to_dict") else vars(empleo)
+        contenido = repr((self._orden[clave], clave, sorted(campos.items()))).encode()
+        return int.from_bytes(hashlib.blake2b(contenido, digest_size=8).digest(), "big")
+
+    def _combinar_huella(self, clave, empleo):
+        """Agrega o quita (XOR) el digesto de un empleo de la huella, si ya se calculó"""
+        if self._huella is not None:
+            self._huella ^= self._digesto(clave, empleo)
+
+    def obtener(self, clave):
+        """Devuelve el empleo con esa clave o None"""
+        return self._empleos.get(clave)
+
+    def posicion(self, clave):
+        """Posición de carga del empleo (menor = cargado antes)"""
+        return self._orden[clave]
+
+    def en_orden(self, claves):
+        """
+        Devuelve los empleos de esas claves en el orden del catálogo (las
+        claves que ya no están, retiradas por otro hilo, se omiten)
+        """
+        with self._lock:
+            presentes = [clave for clave in claves if clave in self._orden]
+            return [self._empleos[clave] for clave in sorted(presentes, key=self._orden.__getitem__)]
+
+    def __iter__(self):
+        # La tupla no cambia aunque otro hilo agregue o retire empleos mientras se recorre
+        instantanea = self._instantanea
+        if instantanea is None:
+            with self._lock:
+                if self._instantanea is None:
+                    self._instantanea = tuple(self._empleos.values())
+                instantanea = self._instantanea
+        return iter(instantanea)
+
+    def __len__(self):
+        return len(self._empleos)
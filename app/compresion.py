@@ -0,0 +1,195 @@
+"""
+Compresión gzip/deflate de las respuestas (middleware WSGI)
+
+Se instala sobre `app.wsgi_app` con `instalar_compresion(app)`:
+
+- Negocia gzip o deflate según Accept-Encoding (con sus q) y solo comprime
+  respuestas de texto/JSON con Content-Length de al menos `tamano_minimo`.
+- Las respuestas con ETag fuerte (/trabajos, /arbol-info) se comprimen una
+  sola vez: el cuerpo comprimido queda en una caché LRU por (ETag,
+  codificación). El ETag de la variante comprimida lleva el sufijo
+  "-gzip"/"-deflate"; al recibir If-None-Match se le quita antes de pasar la
+  petición a la app, así el 304 sigue funcionando.
+"""
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+
+TIPOS_COMPRIMIBLES = ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def elegir_codificacion(accept_encoding):
+    """'gzip', 'deflate' o None según el header Accept-Encoding (a igual q, gzip)"""
+    if not accept_encoding:
+        return None
+    aceptadas = parse_accept_header(accept_encoding)
+    calidad_gzip, calidad_deflate = aceptadas.quality("gzip"), aceptadas.quality("deflate")
+    if calidad_gzip <= 0 and calidad_deflate <= 0:
+        return None
+    return "gzip" if calidad_gzip >= calidad_deflate else "deflate"
+
+
+def comprimir(datos, codificacion, nivel):
+    """Cuerpo comprimido (gzip sin fecha, para que sea el mismo en cada llamada)"""
+    if codificacion == "gzip":
+        return gzip.compress(datos, compresslevel=nivel, mtime=0)
+    return zlib.compress(datos, nivel)
+
+
+def _es_comprimible(tipo):
+    tipo = (tipo or "").split(";")[0].strip().lower()
+    return tipo.startswith("text/") or tipo in TIPOS_COMPRIMIBLES
+
+
+def _agregar_vary(cabeceras):
+    vary = [valor.strip() for valor in cabeceras.get("Vary", "").split(",") if valor.strip()]
+    if "accept-encoding" not in (valor.lower() for valor in vary):
+        cabeceras["Vary"] = ", ".join(vary + ["Accept-Encoding"])
+
+
+class MiddlewareCompresion:
+    """
+    Middleware WSGI que comprime las respuestas con gzip o deflate.
+
+    Args:
+        app: Aplicación WSGI (normalmente `flask_app.wsgi_app`)
+        nivel (int): Nivel de compresión 1-9
+        tamano_minimo (int): Bytes mínimos para comprimir
+        max_entradas (int): Cuerpos comprimidos guardados por ETag (0 = sin caché)
+    """
+
+    def __init__(self, app, nivel=6, tamano_minimo=1024, max_entradas=256):
+        self.app = app
+        self.nivel = nivel
+        self.tamano_minimo = tamano_minimo
+        self.max_entradas = max_entradas
+        self._comprimidos = OrderedDict()  # (etag, codificación) -> cuerpo comprimido
+        self._lock = threading.Lock()
+        self.comprimidas = 0
+        self.aciertos = 0
+        self.bytes_originales = 0
+        self.bytes_enviados = 0
+
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+        codificacion = elegir_codificacion(environ.get("HTTP_ACCEPT_ENCODING"))
+        if codificacion is None:
+            return self.app(environ, start_response)
+
+        # El cliente guarda el ETag de la variante comprimida: la app compara sin sufijo
+        sufijo = f'-{codificacion}"'
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+        if sufijo in if_none_match:
+            environ["HTTP_IF_NONE_MATCH"] = if_none_match.replace(sufijo, '"')
+
+        capturada = []
+        escritos = []
+
+        def capturar(status, headers, exc_info=None):
+            if exc_info and capturada:
+                raise exc_info[1].with_traceback(exc_info[2])
+            capturada[:] = [status, headers, exc_info]
+            return escritos.append
+
+        cuerpo = self.app(environ, capturar)
+        status, headers, exc_info = capturada
+        cabeceras = Headers(headers)
+        etag = cabeceras.get("ETag")
+        etag_fuerte = etag is not None and not etag.startswith("W/")
+
+        if status.startswith("304"):
+            # El 304 confirma la variante que tiene el cliente
+            if etag_fuerte and sufijo in if_none_match:
+                cabeceras["ETag"] = etag[:-1] + sufijo
+                _agregar_vary(cabeceras)
+            start_response(status, cabeceras.to_wsgi_list(), exc_info)
+            return cuerpo
+
+        if not self._debe_comprimir(status, cabeceras):
+            start_response(status, headers, exc_info)
+            if escritos:
+                return ClosingIterator(escritos + list(cuerpo), getattr(cuerpo, "close", None))
+            return cuerpo
+
+        try:
+            datos = b"".join(escritos) + b"".join(cuerpo)
+        finally:
+            if hasattr(cuerpo, "close"):
+                cuerpo.close()
+
+        comprimido = self._comprimido(datos, codificacion, etag if etag_fuerte else None)
+        cabeceras["Content-Encoding"] = codificacion
+        cabeceras["Content-Length"] = str(len(comprimido))
+        _agregar_vary(cabeceras)
+        if etag_fuerte:
+            cabeceras["ETag"] = etag[:-1] + sufijo
+        start_response(status, cabeceras.to_wsgi_list(), exc_info)
+        return [comprimido]
+
+    def _debe_comprimir(self, status, cabeceras):
+        if not status.startswith("2") or status.startswith(("204", "206")):
+            return False
+        if "Content-Encoding" in cabeceras or "no-transform" in cabeceras.get("Cache-Control", ""):
+            return False
+        if not _es_comprimible(cabeceras.get("Content-Type")):
+            return False
+        # Sin Content-Length es una respuesta en streaming: no se acumula en memoria
+        longitud = cabeceras.get("Content-Length")
+        return longitud is not None and longitud.isdigit() and int(longitud) >= self.tamano_minimo
+
+    def _comprimido(self, datos, codificacion, etag):
+        """Cuerpo comprimido, desde la caché si la respuesta tiene ETag fuerte"""
+        clave = (etag, codificacion)
+        if etag is not None and self.max_entradas > 0:
+            with self._lock:
+                comprimido = self._comprimidos.get(clave)
+                if comprimido is not None:
+                    self._comprimidos.move_to_end(clave)
+                    self.aciertos += 1
+                    self._contar(len(datos), len(comprimido))
+                    return comprimido
+
+        comprimido = comprimir(datos, codificacion, self.nivel)
+        with self._lock:
+            self.comprimidas += 1
+            self._contar(len(datos), len(comprimido))
+            if etag is not None and self.max_entradas > 0:
+                self._comprimidos[clave] = comprimido
+                while len(self._comprimidos) > self.max_entradas:
+                    self._comprimidos.popitem(last=False)
+        return comprimido
+
+    def _contar(self, originales, enviados):
+        self.bytes_originales += originales
+        self.bytes_enviados += enviados
+
+    def estadisticas(self):
+        """Contadores de uso"""
+        with self._lock:
+            return {
+                "comprimidas": self.comprimidas,
+                "aciertos_cache": self.aciertos,
+                "entradas": len(self._comprimidos),
+                "bytes_originales": self.bytes_originales,
+                "bytes_enviados": self.bytes_enviados
+            }
+
+
+def instalar_compresion(app, nivel=6, tamano_minimo=1024, max_entradas=256):
+    """
+    Envuelve `app.wsgi_app` con MiddlewareCompresion (nivel 0 = sin compresión).
+
+    El middleware queda en `app.extensions["compresion"]`.
+    """
+    if nivel <= 0:
+        return None
+    middleware = MiddlewareCompresion(app.wsgi_app, nivel, tamano_minimo, max_entradas)
+    app.wsgi_app = middleware
+    app.extensions["compresion"] = middleware
+    return middleware
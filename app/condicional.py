@@ -0,0 +1,42 @@
+"""
+Peticiones condicionales (ETag / If-None-Match) y Cache-Control
+
+El ETag de una respuesta se deriva de las versiones de los datos con que se
+calcula (árbol, empleos, perfil del egresado) y de los parámetros de la
+petición, así que se conoce antes de puntuar o serializar: si el cliente ya
+tiene esa versión se responde 304 sin cuerpo.
+"""
+import hashlib
+
+from flask import current_app, request
+
+# /trabajos depende del token: solo el navegador del egresado la guarda y
+# debe revalidar cada vez (con If-None-Match)
+CACHE_PRIVADA = "private, no-cache"
+
+
+def etag_de(*partes):
+    """ETag fuerte (sin comillas) a partir de las versiones y parámetros de una respuesta"""
+    return hashlib.sha256(repr(partes).encode()).hexdigest()[:32]
+
+
+def con_validadores(respuesta, etag, cache_control, vary=None):
+    """Agrega ETag, Cache-Control y Vary a la respuesta"""
+    respuesta.set_etag(etag)
+    respuesta.headers["Cache-Control"] = cache_control
+    if vary:
+        respuesta.vary.add(vary)
+    return respuesta
+
+
+def no_modificada(etag, cache_control, vary=None):
+    """
+    Respuesta 304 si el If-None-Match de la petición incluye el ETag.
+
+    Returns:
+        Response or None: 304 con los mismos validadores, None si hay que
+            generar la respuesta completa
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return con_validadores(current_app.response_class(status=304), etag, cache_control, vary)
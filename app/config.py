@@ -20,6 +20,18 @@ class Config:
     # Configuración JWT
     JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', '2'))
     
+    # Caché de rankings de /trabajos (0 entradas = desactivada)
+    CACHE_RANKING_MAX_ENTRADAS = int(os.getenv('CACHE_RANKING_MAX_ENTRADAS', '1024'))
+    CACHE_RANKING_TTL = int(os.getenv('CACHE_RANKING_TTL', '300'))
+    
+    # Compresión gzip/deflate de las respuestas (nivel 0 = desactivada)
+    COMPRESION_NIVEL = int(os.getenv('COMPRESION_NIVEL', '6'))
+    COMPRESION_MIN_BYTES = int(os.getenv('COMPRESION_MIN_BYTES', '1024'))
+    COMPRESION_CACHE_ENTRADAS = int(os.getenv('COMPRESION_CACHE_ENTRADAS', '256'))
+    
+    # Token para administrar empleos (POST/PUT/DELETE /empleos); sin él esas rutas responden 403
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+    
     # Configuración de CORS para producción
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
     
@@ -0,0 +1,75 @@
+"""
+Índice de egresados por cédula
+"""
+import hmac
+
+# Atributos derivados del perfil que se recalculan si el perfil cambia
+# (tokens de palabras clave, codificación del árbol jerárquico)
+ATRIBUTOS_DERIVADOS = ("palabras_clave", "codificacion")
+
+
+def ficha_coincide(egresado, ficha):
+    """
+    Compara la ficha en tiempo constante.
+
+    Si el egresado no existe se compara igual contra una ficha vacía, así el
+    tiempo de respuesta no revela si la cédula está registrada.
+    """
+    esperada = "" if egresado is None else str(egresado.ficha)
+    coincide = hmac.compare_digest(esperada.encode(), str(ficha).encode())
+    return egresado is not None and coincide
+
+
+class IndiceEgresados:
+    """
+    Egresados indexados por cédula (búsqueda O(1) para login y rutas).
+
+    Conserva el orden de carga. Cuando cambia el perfil de un egresado
+    (`actualizar`) su `version_perfil` aumenta y se descartan los datos
+    derivados del perfil anterior; las cachés que incluyen esa versión en su
+    clave dejan de usarse.
+    """
+
+    def __init__(self, egresados=None):
+        self._egresados = {}   # cedula -> egresado, en orden de carga
+        for egresado in egresados or []:
+            self.agregar(egresado)
+
+    def agregar(self, egresado):
+        """Agrega un egresado (KeyError si la cédula ya existe)"""
+        if egresado.cedula in self._egresados:
+            raise KeyError(f"Ya existe un egresado con cédula {egresado.cedula!r}")
+        self._egresados[egresado.cedula] = egresado
+
+    def actualizar(self, egresado):
+        """
+        Reemplaza el perfil del egresado con la misma cédula
+
+        Returns:
+            int: La nueva versión del perfil
+        """
+        anterior = self._egresados.get(egresado.cedula)
+        if anterior is None:
+            raise KeyError(f"No existe un egresado con cédula {egresado.cedula!r}")
+
+        for atributo in ATRIBUTOS_DERIVADOS:
+            if hasattr(egresado, atributo):
+                setattr(egresado, atributo, None)
+        egresado.version_perfil = anterior.version_perfil + 1
+        self._egresados[egresado.cedula] = egresado
+        return egresado.version_perfil
+
+    def obtener(self, cedula):
+        """Egresado con esa cédula o None"""
+        return self._egresados.get(cedula)
+
+    def autenticar(self, cedula, ficha):
+        """Egresado si la cédula existe y la ficha coincide, None si no"""
+        egresado = self._egresados.get(cedula)
+        return egresado if ficha_coincide(egresado, ficha) else None
+
+    def __iter__(self):
+        return iter(self._egresados.values())
+
+    def __len__(self):
+        return len(self._egresados)
@@ -0,0 +1,76 @@
+"""
+Normalización de texto en español e internado de tokens
+
+Los vocabularios usan formas sin tilde ('programacion', 'gestion') mientras
+que los perfiles y empleos están acentuados ("Gestión", "rehabilitación") y
+traen puntuación pegada ("datos,"). Aquí se normaliza todo a minúsculas sin
+diacríticos ni puntuación y cada token se convierte en un entero, de modo
+que el scoring compara conjuntos pequeños de enteros.
+
+Los resultados se guardan en caché por texto: la normalización de un mismo
+perfil o descripción se hace una sola vez.
+"""
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+
+# Todo lo que no sea letra o dígito separa tokens
+_SEPARADORES = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=65536)
+def normalizar_texto(texto):
+    """Minúsculas, sin tildes ni diéresis (ñ -> n) y con la puntuación convertida en espacios"""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_marcas = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _SEPARADORES.sub(" ", sin_marcas).strip()
+
+
+class InternadorTokens:
+    """Asigna un id entero estable a cada token distinto"""
+
+    def __init__(self):
+        self._ids = {}
+        self._tokens = []
+        self._lock = threading.Lock()
+
+    def id(self, token):
+        """Id del token, asignándole uno nuevo si no existía"""
+        id_token = self._ids.get(token)
+        if id_token is None:
+            with self._lock:
+                id_token = self._ids.get(token)
+                if id_token is None:
+                    id_token = len(self._tokens)
+                    self._ids[token] = id_token
+                    self._tokens.append(token)
+        return id_token
+
+    def token(self, id_token):
+        """Token correspondiente a un id"""
+        return self._tokens[id_token]
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+# Internador compartido por todos los motores de palabras clave
+internador = InternadorTokens()
+
+
+@lru_cache(maxsize=65536)
+def tokenizar(texto):
+    """Tokens normalizados del texto, en orden (tupla para poder cachearla)"""
+    return tuple(normalizar_texto(texto).split())
+
+
+@lru_cache(maxsize=65536)
+def ids_tokens(texto):
+    """Ids de los tokens normalizados del texto, en orden"""
+    return tuple(internador.id(token) for token in tokenizar(texto))
+
+
+def ids_vocabulario(palabras):
+    """Conjunto de ids de un vocabulario (cada palabra se normaliza igual que los textos)"""
+    return frozenset(id_token for palabra in palabras for id_token in ids_tokens(palabra))
@@ -0,0 +1,56 @@
+"""
+Paginación de rankings (limit/offset) con selección parcial por heap
+"""
+import heapq
+from operator import itemgetter
+
+# Máximo de resultados por página aceptado en ?limit=
+LIMITE_MAXIMO = 1000
+
+
+def leer_paginacion(args):
+    """
+    Lee `limit` y `offset` de los parámetros de la petición
+
+    Args:
+        args: request.args (o cualquier dict con .get)
+
+    Returns:
+        tuple: (limit, offset); limit es None si no se pidió paginación
+
+    Raises:
+        ValueError: Si los valores no son enteros válidos
+    """
+    limit = args.get("limit")
+    offset = args.get("offset", 0)
+    try:
+        limit = int(limit) if limit not in (None, "") else None
+        offset = int(offset) if offset not in (None, "") else 0
+    except (TypeError, ValueError):
+        raise ValueError("limit y offset deben ser números enteros")
+
+    if offset < 0 or (limit is not None and not 0 < limit <= LIMITE_MAXIMO):
+        raise ValueError(f"limit debe estar entre 1 y {LIMITE_MAXIMO} y offset no puede ser negativo")
+    return limit, offset
+
+
+def seleccionar_pagina(puntuados, limit=None, offset=0, clave=itemgetter(0)):
+    """
+    Devuelve la página pedida de un ranking sin ordenarlo completo
+
+    Con limit usa heapq.nlargest (O(n log k), k = offset + limit); equivale a
+    sorted(puntuados, key=clave, reverse=True)[offset:offset + limit], así que
+    los empates conservan el orden de entrada.
+
+    Args:
+        puntuados (list): Elementos a ordenar, por defecto tuplas (score, ...)
+        limit (int): Tamaño de página, None para todos
+        offset (int): Elementos a saltar
+        clave (callable): Obtiene el score de cada elemento
+
+    Returns:
+        list: Elementos de la página, de mayor a menor score
+    """
+    if limit is None:
+        return sorted(puntuados, key=clave, reverse=True)[offset:]
+    return heapq.nlargest(offset + limit, puntuados, key=clave)[offset:]
@@ -0,0 +1,169 @@
+"""
+Scoring por palabras clave entre egresados y empleos
+
+Los vocabularios se construyen una sola vez al importar el módulo, los
+tokens relevantes de cada empleo se calculan al cargarlo en el catálogo
+(CompiladorPalabrasClave) y los de cada egresado la primera vez que se
+puntúa. El score solo intersecta conjuntos ya calculados.
+
+Textos y vocabularios pasan por app.normalizacion (sin tildes ni
+puntuación) y los tokens se representan con ids enteros, así que
+"Gestión" coincide con 'gestion' y "datos," con "datos".
+"""
+from collections import namedtuple
+
+from .normalizacion import ids_tokens, ids_vocabulario, normalizar_texto
+
+# Palabras irrelevantes a excluir (conectores, artículos, preposiciones)
+PALABRAS_EXCLUIDAS = frozenset({
+    'de', 'del', 'la', 'el', 'los', 'las', 'en', 'con', 'por', 'para', 'y', 'o', 'un', 'una', 
+    'este', 'esta', 'ese', 'esa', 'su', 'sus', 'se', 'que', 'es', 'son', 'como', 'más', 'muy',
+    'al', 'le', 'lo', 'te', 'me', 'nos', 'les', 'pero', 'sino', 'aunque', 'porque', 'cuando',
+    'donde', 'quien', 'cual', 'cuales', 'todo', 'toda', 'todos', 'todas', 'otro', 'otra', 'otros',
+    'otras', 'mismo', 'misma', 'mismos', 'mismas', 'tanto', 'tanta', 'tantos', 'tantas'
+})
+
+# Palabras técnicas y profesionales relevantes por categorías
+PALABRAS_TECNICAS = frozenset({
+    # INFORMÁTICA, DISEÑO Y DESARROLLO DE SOFTWARE
+    'software', 'desarrollo', 'programacion', 'informatica', 'diseño', 'sistemas', 'aplicaciones',
+    'web', 'movil', 'frontend', 'backend', 'fullstack', 'digital',
+
+    # ACTIVIDAD FÍSICA, RECREACIÓN Y DEPORTE
+    'deportes', 'fisica', 'entrenamiento', 'gimnasio', 'fitness',
+    'terapia', 'rehabilitacion', 'nutricion', 'educacion',
+
+    # AGRÍCOLA
+    'agricola', 'agricultura', 'cultivos', 'agronomia','campo',
+    'cosecha', 'ganaderia', 'veterinaria', 'agroindustria',
+
+    # AMBIENTAL
+    'ambiental', 'medio', 'ambiente', 'ecologia', 'sostenibilidad', 'conservacion', 'recursos',
+    'naturales', 'biodiversidad', 'contaminacion', 'reciclaje', 'energia', 'renovable',
+
+    # ARTES Y OFICIOS
+    'artes', 'oficios', 'artesanias', 'manualidades', 'creatividad', 'pintura',
+    'textil', 'madera', 'metal', 'joyeria', 'decoracion',
+
+    # COMERCIO Y VENTAS
+    'comercio', 'ventas', 'marketing', 'publicidad', 'mercadeo', 'distribucion',
+    'atencion', 'cliente', 'negociacion', 'productos', 'servicios', 'logistica',
+
+    # CONSTRUCCIÓN
+    'construccion', 'edificacion', 'arquitectura', 'civil', 'estructural', 'obra',
+    'proyecto', 'planos', 'materiales', 'supervision', 'acabados', 'instalaciones',
+
+    # ELECTRÓNICA Y AUTOMATIZACIÓN
+    'electronica', 'automatizacion', 'control', 'industrial', 'robotica', 'sensores',
+    'circuitos', 'microcontroladores', 'instrumentacion', 'mantenimiento',
+
+    # GESTIÓN
+    'gestion', 'administracion', 'management', 'direccion', 'coordinacion', 'planificacion',
+    'organizacion', 'liderazgo', 'proyectos', 'procesos', 'calidad', 'estrategia',
+
+    # HOTELERÍA Y TURISMO
+    'hoteleria', 'turismo', 'hospitalidad', 'servicios', 'eventos', 'gastronomia',
+    'recepcion', 'reservas', 'entretenimiento',
+
+    # MECÁNICA INDUSTRIAL
+    'mecanica', 'industrial', 'maquinaria', 'equipos', 'mantenimiento', 'reparacion',
+    'soldadura', 'torneria', 'fresadora', 'hidraulica', 'neumatica', 'produccion',
+
+    # SALUD
+    'salud', 'medicina', 'enfermeria', 'terapia', 'rehabilitacion', 'farmacia',
+    'laboratorio', 'clinico', 'diagnostico', 'tratamiento', 'cuidado', 'paciente',
+
+})
+
+# Los mismos vocabularios como conjuntos de ids de tokens normalizados
+IDS_EXCLUIDAS = ids_vocabulario(PALABRAS_EXCLUIDAS)
+IDS_TECNICAS = ids_vocabulario(PALABRAS_TECNICAS)
+
+# Tokens relevantes precalculados (ids) de un empleo y de un egresado
+PalabrasEmpleo = namedtuple("PalabrasEmpleo", ["perfil_normalizado", "perfil", "titulo", "descripcion"])
+PalabrasEgresado = namedtuple("PalabrasEgresado", ["red_normalizada", "red", "perfil"])
+
+
+def filtrar_palabras_relevantes(texto):
+    """Filtra palabras relevantes (ids) excluyendo conectores y priorizando términos técnicos"""
+    palabras = set(ids_tokens(texto))
+    # Remover palabras excluidas
+    palabras_filtradas = palabras - IDS_EXCLUIDAS
+    # Priorizar palabras técnicas
+    palabras_tecnicas_encontradas = palabras_filtradas.intersection(IDS_TECNICAS)
+    # Si hay palabras técnicas, usarlas; sino, usar todas las filtradas
+    return frozenset(palabras_tecnicas_encontradas if palabras_tecnicas_encontradas else palabras_filtradas)
+
+
+def compilar_empleo(empleo):
+    """Calcula (y guarda en `empleo.palabras_clave`) los tokens relevantes del empleo"""
+    compilado = PalabrasEmpleo(
+        normalizar_texto(empleo.perfil_requerido),
+        filtrar_palabras_relevantes(empleo.perfil_requerido),
+        filtrar_palabras_relevantes(empleo.titulo),
+        filtrar_palabras_relevantes(empleo.descripcion)
+    )
+    empleo.palabras_clave = compilado
+    return compilado
+
+
+def compilar_egresado(egresado):
+    """Calcula (y guarda en `egresado.palabras_clave`) los tokens relevantes del egresado"""
+    compilado = PalabrasEgresado(
+        normalizar_texto(egresado.red),
+        filtrar_palabras_relevantes(egresado.red),
+        filtrar_palabras_relevantes(egresado.perfil)
+    )
+    egresado.palabras_clave = compilado
+    return compilado
+
+
+class CompiladorPalabrasClave:
+    """Oyente del CatalogoEmpleos que precalcula los tokens de cada empleo al cargarlo"""
+
+    def al_agregar(self, clave, empleo):
+        compilar_empleo(empleo)
+
+    def al_actualizar(self, clave, anterior, empleo):
+        compilar_empleo(empleo)
+
+    def al_retirar(self, clave, empleo):
+        pass
+
+
+def calcular_score_por_palabras_clave(egresado, empleo):
+    """
+    Calcula el score de compatibilidad basado en palabras clave relevantes
+    
+    Args:
+        egresado (Egresado): Objeto egresado con red y perfil descriptivo
+        empleo (Empleo): Objeto empleo a evaluar
+    
+    Returns:
+        int: Score de compatibilidad (0-100)
+    """
+    palabras_egresado = getattr(egresado, "palabras_clave", None) or compilar_egresado(egresado)
+    palabras_empleo = getattr(empleo, "palabras_clave", None) or compilar_empleo(empleo)
+    
+    # Match exacto de la red = 100 puntos (máxima prioridad)
+    if palabras_egresado.red_normalizada == palabras_empleo.perfil_normalizado:
+        return 100
+    
+    # Solo calcular score si el egresado tiene palabras relevantes
+    if not (palabras_egresado.red or palabras_egresado.perfil):
+        return 0
+    
+    # 1. Match de red con perfil requerido del empleo (peso muy alto)
+    score = len(palabras_egresado.red & palabras_empleo.perfil) * 40
+    
+    # 2. Match del perfil descriptivo con perfil requerido (peso alto)
+    score += len(palabras_egresado.perfil & palabras_empleo.perfil) * 30
+    
+    # 3. Match del perfil descriptivo con título del empleo (peso medio)
+    score += len(palabras_egresado.perfil & palabras_empleo.titulo) * 20
+    
+    # 4. Match del perfil descriptivo con descripción (peso bajo)
+    score += len(palabras_egresado.perfil & palabras_empleo.descripcion) * 10
+    
+    # Limitar score máximo a 100
+    return min(score, 100)
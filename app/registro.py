@@ -0,0 +1,149 @@
+"""
+Registro (logging) asíncrono, estructurado en JSON y con muestreo por tipo de evento
+
+Los registros se encolan en el hilo de la petición y un hilo en segundo plano
+(QueueListener) los formatea como JSON y los escribe en stdout, así la E/S
+del log nunca queda en el camino de la latencia de la petición.
+
+Cada tipo de evento tiene una tasa de muestreo (por ejemplo 1% de los
+resúmenes de /trabajos). Los errores se registran siempre.
+
+El hilo se inicia con el primer evento registrado (o al llamar a
+configurar_registro), no al importar: un arranque en frío que solo atiende
+/health no lo crea.
+
+Variables de entorno:
+    LOG_NIVEL      Nivel mínimo (INFO por defecto)
+    LOG_MUESTREO   Tasas por evento: "trabajos.resumen=0.01,login=0.1"
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Tasas de muestreo por defecto (los eventos no listados se registran siempre)
+TASAS_MUESTREO = {
+    "trabajos.resumen": 0.01,
+    "login.resumen": 0.1,
+}
+
+logger = logging.getLogger("pilape")
+
+_listener = None
+_lock_listener = threading.Lock()
+_tasas = dict(TASAS_MUESTREO)
+
+
+class FormateadorJSON(logging.Formatter):
+    """Formatea cada registro como una línea JSON"""
+
+    def format(self, record):
+        datos = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "evento": getattr(record, "evento", None),
+            "msg": record.getMessage(),
+        }
+        datos.update(getattr(record, "campos", None) or {})
+        if record.exc_info:
+            datos["traceback"] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class ManejadorCola(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que registra.
+
+    QueueHandler.prepare formatea el mensaje antes de encolarlo; aquí el
+    registro se encola tal cual y se formatea en el hilo del QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def leer_tasas(texto):
+    """Convierte "evento=tasa,evento=tasa" en un dict"""
+    tasas = {}
+    for parte in (texto or "").split(","):
+        if "=" in parte:
+            evento, tasa = parte.split("=", 1)
+            tasas[evento.strip()] = min(max(float(tasa), 0.0), 1.0)
+    return tasas
+
+
+def configurar_registro(nivel=None, tasas=None, destino=None):
+    """
+    Instala el registro asíncrono (una sola vez por proceso).
+
+    El logger "pilape" (eventos) y el logger raíz (si no tiene manejadores
+    propios) escriben en una cola atendida por un hilo en segundo plano.
+
+    Returns:
+        QueueListener: El listener en ejecución
+    """
+    global _listener
+    with _lock_listener:
+        if _listener is None:
+            _listener = _iniciar_listener(nivel, tasas, destino)
+    return _listener
+
+
+def _iniciar_listener(nivel, tasas, destino):
+    nivel = nivel or os.getenv("LOG_NIVEL", "INFO")
+    _tasas.update(tasas if tasas is not None else leer_tasas(os.getenv("LOG_MUESTREO")))
+
+    salida = logging.StreamHandler(destino or sys.stdout)
+    salida.setFormatter(FormateadorJSON())
+
+    cola = queue.SimpleQueue()
+    manejador = ManejadorCola(cola)
+
+    logger.setLevel(nivel)
+    logger.addHandler(manejador)
+    logger.propagate = False
+
+    raiz = logging.getLogger()
+    if not raiz.handlers:
+        raiz.setLevel(nivel)
+        raiz.addHandler(manejador)
+
+    listener = QueueListener(cola, salida, respect_handler_level=True)
+    listener.start()
+    # Vaciar la cola al terminar el proceso
+    atexit.register(listener.stop)
+    return listener
+
+
+def ajustar_muestreo(tasas):
+    """Cambia las tasas de muestreo de algunos eventos (0.0 a 1.0)"""
+    _tasas.update({evento: min(max(float(tasa), 0.0), 1.0) for evento, tasa in tasas.items()})
+
+
+def debe_registrar(evento, nivel=logging.INFO):
+    """Decide por muestreo si se registra un evento (los errores siempre)"""
+    if nivel >= logging.ERROR:
+        return True
+    tasa = _tasas.get(evento, 1.0)
+    return tasa >= 1.0 or (tasa > 0.0 and random.random() < tasa)
+
+
+def registrar_evento(evento, nivel=logging.INFO, exc_info=None, **campos):
+    """
+    Registra un evento estructurado si supera el muestreo.
+
+    La decisión se toma antes de crear el registro: un evento descartado no
+    cuesta ni formateo ni encolado.
+    """
+    if _listener is None:
+        configurar_registro()
+    if not logger.isEnabledFor(nivel) or not debe_registrar(evento, nivel):
+        return
+    logger.log(nivel, evento, exc_info=exc_info, extra={"evento": evento, "campos": campos})
@@ -1,29 +1,69 @@
 # Ruta de debug para ver egresados y empleos registrados
 from flask import Blueprint, jsonify
 import logging
-from .models import egresados_data, empleos_data
+from itertools import islice
+from .models import obtener_catalogo, obtener_egresados
 
 debug_bp = Blueprint('debug', __name__)
 
 @debug_bp.route('/debug-data')
 def debug_data():
+    egresados, catalogo_empleos = obtener_egresados(), obtener_catalogo()
     # Limitar la cantidad de datos para evitar sobrecarga
-    egresados_sample = [e.to_dict() for e in egresados_data[:5]]
-    empleos_sample = [e.to_dict() for e in empleos_data[:5]]
+    egresados_sample = [e.to_dict() for e in islice(egresados, 5)]
+    empleos_sample = [e.to_dict() for e in islice(catalogo_empleos, 5)]
     logging.warning(f"Egresados sample: {egresados_sample}")
     logging.warning(f"Empleos sample: {empleos_sample}")
     return jsonify({
         "egresados_sample": egresados_sample,
         "empleos_sample": empleos_sample,
-        "egresados_count": len(egresados_data),
-        "empleos_count": len(empleos_data)
+        "egresados_count": len(egresados),
+        "empleos_count": len(catalogo_empleos)
     })
 """
 Rutas y endpoints de la API
 """
 from flask import request, jsonify
-from .auth import generar_token, verificar_token, extraer_token_del_header, autenticar_egresado
-from .models import egresados_data, empleos_data, Pila
+from .auth import (generar_token, verificar_token, revocar_token, extraer_token_del_header,
+                   autenticar_egresado, es_token_admin, cache_tokens)
+from .models import obtener_catalogo, obtener_egresados, obtener_indice_bm25, Pila, Empleo
+from .paginacion import leer_paginacion, seleccionar_pagina
+from .cache import CacheRanking
+from .palabras_clave import calcular_score_por_palabras_clave
+from .registro import registrar_evento
+from .serializacion import arreglo_empleos, respuesta_json
+from .condicional import CACHE_PRIVADA, con_validadores, etag_de, no_modificada
+import time
+
+
+# Campos de un empleo en POST/PUT /empleos
+CAMPOS_EMPLEO = ("titulo", "descripcion", "salario", "perfil_requerido")
+
+
+def empleo_desde_json(datos):
+    """
+    Construye un Empleo desde el cuerpo JSON de POST/PUT /empleos
+    
+    Raises:
+        ValueError: Si faltan campos o el salario no es un entero
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("Se espera un objeto JSON con " + ", ".join(CAMPOS_EMPLEO))
+    faltantes = [campo for campo in CAMPOS_EMPLEO if datos.get(campo) in (None, "")]
+    if faltantes:
+        raise ValueError("Campos requeridos: " + ", ".join(faltantes))
+    try:
+        salario = int(datos["salario"])
+    except (TypeError, ValueError):
+        raise ValueError("El salario debe ser un entero") from None
+    return Empleo(str(datos["titulo"]), str(datos["descripcion"]), salario, str(datos["perfil_requerido"]))
+
+
+# Motores de ranking de /trabajos (?motor=) y nombre del algoritmo en la respuesta
+ALGORITMOS = {
+    "palabras_clave": "score_por_palabras_clave_mejorado",
+    "bm25": "bm25_indice_invertido"
+}
 
 
 def init_routes(app):
@@ -35,6 +75,12 @@ def init_routes(app):
     Args:
         app: Instancia de la aplicación Flask
     """
+    # Caché de rankings de /trabajos por egresado
+    cache_rankings = CacheRanking(
+        max_entradas=app.config.get("CACHE_RANKING_MAX_ENTRADAS", 1024),
+        ttl_segundos=app.config.get("CACHE_RANKING_TTL", 300)
+    )
+
     #==============================
     # Rutas de autenticación        
     #==============================
@@ -61,11 +107,12 @@ def init_routes(app):
                 return jsonify({"msg": "Cédula y ficha son requeridos"}), 400
 
             # Validar egresado
-            egresado = autenticar_egresado(cedula, ficha, egresados_data)
+            egresado = autenticar_egresado(cedula, ficha, obtener_egresados())
             if not egresado:
                 return jsonify({"msg": "Credenciales inválidas"}), 401
 
             token = generar_token(egresado)
+            registrar_evento("login.resumen", cedula=cedula)
 
             return jsonify({
                 "token": token,
@@ -76,140 +123,30 @@ def init_routes(app):
             })
             
         except Exception as e:
+            registrar_evento("login.error", nivel=logging.ERROR, exc_info=True, error=str(e))
             return jsonify({"msg": "Error interno del servidor"}), 500
         
-    #==============================
-    # Rutas de empleos            
-    #==============================
-    # Función para calcular score de compatibilidad    
-
-    def calcular_score_por_palabras_clave(egresado, empleo):
+    @app.route("/logout", methods=["POST"])
+    def logout():
         """
-        Calcula el score de compatibilidad basado en palabras clave relevantes
-        
-        Args:
-            egresado (Egresado): Objeto egresado con red y perfil descriptivo
-            empleo (Empleo): Objeto empleo a evaluar
+        Cierra la sesión: el token se rechaza desde ya aunque no haya expirado
         
-        Returns:
-            int: Score de compatibilidad (0-100)
+        Headers:
+            Authorization: Bearer <token>
         """
-        # Palabras irrelevantes a excluir (conectores, artículos, preposiciones)
-        palabras_excluidas = {
-            'de', 'del', 'la', 'el', 'los', 'las', 'en', 'con', 'por', 'para', 'y', 'o', 'un', 'una', 
-            'este', 'esta', 'ese', 'esa', 'su', 'sus', 'se', 'que', 'es', 'son', 'como', 'más', 'muy',
-            'al', 'le', 'lo', 'te', 'me', 'nos', 'les', 'pero', 'sino', 'aunque', 'porque', 'cuando',
-            'donde', 'quien', 'cual', 'cuales', 'todo', 'toda', 'todos', 'todas', 'otro', 'otra', 'otros',
-            'otras', 'mismo', 'misma', 'mismos', 'mismas', 'tanto', 'tanta', 'tantos', 'tantas'
-        }
-        
-        # Palabras técnicas y profesionales relevantes por categorías
-        palabras_tecnicas = {
-            # INFORMÁTICA, DISEÑO Y DESARROLLO DE SOFTWARE
-            'software', 'desarrollo', 'programacion', 'informatica', 'diseño', 'sistemas', 'aplicaciones',
-            'web', 'movil', 'frontend', 'backend', 'fullstack', 'digital',
-            
-            # ACTIVIDAD FÍSICA, RECREACIÓN Y DEPORTE
-            'deportes', 'fisica', 'entrenamiento', 'gimnasio', 'fitness',
-            'terapia', 'rehabilitacion', 'nutricion', 'educacion',
-            
-            # AGRÍCOLA
-            'agricola', 'agricultura', 'cultivos', 'agronomia','campo',
-            'cosecha', 'ganaderia', 'veterinaria', 'agroindustria',
-            
-            # AMBIENTAL
-            'ambiental', 'medio', 'ambiente', 'ecologia', 'sostenibilidad', 'conservacion', 'recursos',
-            'naturales', 'biodiversidad', 'contaminacion', 'reciclaje', 'energia', 'renovable',
-            
-            # ARTES Y OFICIOS
-            'artes', 'oficios', 'artesanias', 'manualidades', 'creatividad', 'pintura',
-            'textil', 'madera', 'metal', 'joyeria', 'decoracion',
-            
-            # COMERCIO Y VENTAS
-            'comercio', 'ventas', 'marketing', 'publicidad', 'mercadeo', 'distribucion',
-            'atencion', 'cliente', 'negociacion', 'productos', 'servicios', 'logistica',
-            
-            # CONSTRUCCIÓN
-            'construccion', 'edificacion', 'arquitectura', 'civil', 'estructural', 'obra',
-            'proyecto', 'planos', 'materiales', 'supervision', 'acabados', 'instalaciones',
-            
-            # ELECTRÓNICA Y AUTOMATIZACIÓN
-            'electronica', 'automatizacion', 'control', 'industrial', 'robotica', 'sensores',
-            'circuitos', 'microcontroladores', 'instrumentacion', 'mantenimiento',
-            
-            # GESTIÓN
-            'gestion', 'administracion', 'management', 'direccion', 'coordinacion', 'planificacion',
-            'organizacion', 'liderazgo', 'proyectos', 'procesos', 'calidad', 'estrategia',
-            
-            # HOTELERÍA Y TURISMO
-            'hoteleria', 'turismo', 'hospitalidad', 'servicios', 'eventos', 'gastronomia',
-            'recepcion', 'reservas', 'entretenimiento',
-            
-            # MECÁNICA INDUSTRIAL
-            'mecanica', 'industrial', 'maquinaria', 'equipos', 'mantenimiento', 'reparacion',
-            'soldadura', 'torneria', 'fresadora', 'hidraulica', 'neumatica', 'produccion',
-            
-            # SALUD
-            'salud', 'medicina', 'enfermeria', 'terapia', 'rehabilitacion', 'farmacia',
-            'laboratorio', 'clinico', 'diagnostico', 'tratamiento', 'cuidado', 'paciente',
-
-        }
-        
-        # Función para filtrar palabras relevantes
-        def filtrar_palabras_relevantes(texto):
-            """Filtra palabras relevantes excluyendo conectores y priorizando términos técnicos"""
-            palabras = set(texto.lower().split())
-            # Remover palabras excluidas
-            palabras_filtradas = palabras - palabras_excluidas
-            # Priorizar palabras técnicas
-            palabras_tecnicas_encontradas = palabras_filtradas.intersection(palabras_tecnicas)
-            # Si hay palabras técnicas, usarlas; sino, usar todas las filtradas
-            return palabras_tecnicas_encontradas if palabras_tecnicas_encontradas else palabras_filtradas
-        
-        score = 0
-        
-        # Convertir a minúsculas para comparación
-        red_lower = egresado.red.lower()
-        perfil_egresado_lower = egresado.perfil.lower()
-        empleo_perfil_lower = empleo.perfil_requerido.lower()
-        
-        # Match exacto de la red = 100 puntos (máxima prioridad)
-        if red_lower == empleo_perfil_lower:
-            score = 100
-        else:
-            # Obtener palabras relevantes del egresado
-            palabras_red_egresado = filtrar_palabras_relevantes(egresado.red)
-            palabras_perfil_egresado = filtrar_palabras_relevantes(egresado.perfil)
-            
-            # Obtener palabras relevantes del empleo
-            palabras_empleo_perfil = filtrar_palabras_relevantes(empleo.perfil_requerido)
-            palabras_titulo = filtrar_palabras_relevantes(empleo.titulo)
-            palabras_descripcion = filtrar_palabras_relevantes(empleo.descripcion)
-            
-            # Combinar palabras del egresado para matching
-            palabras_egresado_todas = palabras_red_egresado.union(palabras_perfil_egresado)
-            
-            # Solo calcular score si el egresado tiene palabras relevantes
-            if palabras_egresado_todas:
-                # 1. Match de red con perfil requerido del empleo (peso muy alto)
-                coincidencias_red = len(palabras_red_egresado.intersection(palabras_empleo_perfil))
-                score += coincidencias_red * 40
-                
-                # 2. Match del perfil descriptivo con perfil requerido (peso alto)
-                coincidencias_perfil_req = len(palabras_perfil_egresado.intersection(palabras_empleo_perfil))
-                score += coincidencias_perfil_req * 30
-                
-                # 3. Match del perfil descriptivo con título del empleo (peso medio)
-                coincidencias_titulo = len(palabras_perfil_egresado.intersection(palabras_titulo))
-                score += coincidencias_titulo * 20
-                
-                # 4. Match del perfil descriptivo con descripción (peso bajo)
-                coincidencias_descripcion = len(palabras_perfil_egresado.intersection(palabras_descripcion))
-                score += coincidencias_descripcion * 10
+        token = extraer_token_del_header(request.headers.get("Authorization"))
+        if not token:
+            return jsonify({"msg": "Token requerido"}), 401
+        data = verificar_token(token)
+        if not data:
+            return jsonify({"msg": "Token inválido o expirado"}), 401
+        revocar_token(token)
+        registrar_evento("logout.resumen", cedula=data.get("sub") or data.get("cedula"))
+        return jsonify({"msg": "Sesión cerrada"})
         
-        # Limitar score máximo a 100
-        return min(score, 100)
-
+    #==============================
+    # Rutas de empleos            
+    #==============================
     @app.route("/trabajos", methods=["GET"])
     def get_trabajos():
         """
@@ -221,6 +158,7 @@ def init_routes(app):
         Returns:
             JSON: Lista de trabajos disponibles para el perfil del usuario ordenados por compatibilidad
         """
+        inicio = time.perf_counter()
         try:
             auth_header = request.headers.get("Authorization")
             token = extraer_token_del_header(auth_header)
@@ -232,52 +170,171 @@ def init_routes(app):
             if not data:
                 return jsonify({"msg": "Token inválido o expirado"}), 401
 
-            # Obtener información del egresado desde el token
-            cedula = data["cedula"]
-            red = data["red"]
-            perfil_descriptivo = data["perfil"]
+            # El token solo identifica al egresado (también los del formato anterior)
+            cedula = data.get("sub") or data.get("cedula")
             
-            # Buscar el egresado completo (para tener acceso a todo el objeto)
-            egresado = next((e for e in egresados_data if e.cedula == cedula), None)
+            # Buscar el egresado completo (perfil vigente, aunque haya cambiado después del token)
+            egresado = obtener_egresados().obtener(cedula)
             if not egresado:
                 return jsonify({"msg": "Egresado no encontrado"}), 404
+            catalogo_empleos = obtener_catalogo()
+
+            try:
+                limit, offset = leer_paginacion(request.args)
+            except ValueError as e:
+                return jsonify({"msg": str(e)}), 400
 
-            # Calcular scores para todos los empleos
-            empleos_con_score = []
-            for empleo in empleos_data:
-                score = calcular_score_por_palabras_clave(egresado, empleo)
-                
-                # Solo incluir empleos con score > 0 (alguna compatibilidad)
-                if score > 0:
-                    empleo_dict = empleo.to_dict()
-                    empleo_dict["score_compatibilidad"] = score
-                    empleos_con_score.append(empleo_dict)
-
-            # Ordenar por score de mayor a menor
-            empleos_con_score.sort(key=lambda x: x["score_compatibilidad"], reverse=True)
+            # Motor: "palabras_clave" (por defecto) o "bm25" (índice invertido BM25F)
+            motor = request.args.get("motor", "palabras_clave")
+            if motor not in ALGORITMOS:
+                return jsonify({"msg": "Motor inválido. Use 'palabras_clave' o 'bm25'"}), 400
+
+            # El cuerpo solo cambia con el contenido del catálogo (su huella, que vale
+            # entre procesos) y la versión del perfil: si el cliente ya lo tiene se
+            # responde 304 sin puntuar ni serializar
+            etag = etag_de(cedula, egresado.version_perfil, catalogo_empleos.huella, motor, limit, offset)
+            no_modificado = no_modificada(etag, CACHE_PRIVADA, "Authorization")
+            if no_modificado is not None:
+                return no_modificado
+
+            # Ranking completo desde la caché (clave: cédula, motor, versión del
+            # catálogo y versión del perfil del egresado)
+            clave_cache = (cedula, motor, catalogo_empleos.version, egresado.version_perfil)
+            ranking = cache_rankings.obtener(clave_cache)
+            if ranking is None and motor == "bm25":
+                # El índice BM25 ya devuelve el ranking ordenado
+                ranking = obtener_indice_bm25().buscar(egresado)
+                cache_rankings.guardar(clave_cache, ranking)
+            elif ranking is None:
+                # Calcular scores para todos los empleos
+                empleos_con_score = []
+                for empleo in catalogo_empleos:
+                    score = calcular_score_por_palabras_clave(egresado, empleo)
+                    
+                    # Solo incluir empleos con score > 0 (alguna compatibilidad)
+                    if score > 0:
+                        empleos_con_score.append((score, empleo))
+
+                if cache_rankings.activa:
+                    ranking = seleccionar_pagina(empleos_con_score)
+                    cache_rankings.guardar(clave_cache, ranking)
+
+            if ranking is not None:
+                total = len(ranking)
+                pagina = ranking[offset:None if limit is None else offset + limit]
+            else:
+                # Sin caché: seleccionar solo la página pedida (heap), de mayor a menor score
+                total = len(empleos_con_score)
+                pagina = seleccionar_pagina(empleos_con_score, limit, offset)
             
             # Usar pila para la respuesta (manteniendo la lógica original pero con orden correcto)
             pila = Pila()
             # Meter los empleos en orden inverso para que salgan en el orden correcto
-            for empleo_dict in reversed(empleos_con_score):
-                pila.push(empleo_dict)
+            for score, empleo in reversed(pagina):
+                pila.push((score, empleo))
 
             # Convertir pila a lista para la respuesta
             trabajos = []
             while not pila.esta_vacia():
                 trabajos.append(pila.pop())
 
-            return jsonify({
-                "trabajos": trabajos,
-                "total": len(trabajos),
-                "red": red,
-                "perfil": perfil_descriptivo,
-                "algoritmo": "score_por_palabras_clave_mejorado"
-            })
+            registrar_evento(
+                "trabajos.resumen", cedula=cedula, motor=motor, total=total,
+                devueltos=len(trabajos), duracion_ms=round((time.perf_counter() - inicio) * 1000, 3))
+
+            # Cada empleo ya está codificado: se empalma su JSON con el score
+            respuesta = respuesta_json({
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+                "red": egresado.red,
+                "perfil": egresado.perfil,
+                "algoritmo": ALGORITMOS[motor]
+            }, trabajos=arreglo_empleos(trabajos, "score_compatibilidad"))
+            return con_validadores(respuesta, etag, CACHE_PRIVADA, "Authorization")
             
         except Exception as e:
+            registrar_evento("trabajos.error", nivel=logging.ERROR, exc_info=True, error=str(e))
             return jsonify({"msg": "Error interno del servidor"}), 500
 
+    #==============================
+    # Administración de empleos
+    #==============================
+    # El catálogo notifica cada cambio a sus oyentes (tokens de palabras
+    # clave, índice BM25), que solo actualizan lo que toca al empleo. La
+    # versión del catálogo cambia y los rankings cacheados dejan de usarse.
+    def es_administrador():
+        token = extraer_token_del_header(request.headers.get("Authorization"))
+        return es_token_admin(token, app.config.get("ADMIN_TOKEN"))
+
+    def invalidar_rankings_obsoletos():
+        version = obtener_catalogo().version
+        cache_rankings.invalidar(lambda clave: clave[2] != version)
+
+    @app.route("/empleos", methods=["POST"])
+    def crear_empleo():
+        """
+        Agrega un empleo al catálogo (requiere ADMIN_TOKEN)
+        
+        Returns:
+            JSON: El empleo creado y su clave en el catálogo
+        """
+        if not es_administrador():
+            return jsonify({"msg": "No autorizado"}), 403
+        try:
+            empleo = empleo_desde_json(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({"msg": str(e)}), 400
+
+        clave = obtener_catalogo().agregar(empleo)
+        invalidar_rankings_obsoletos()
+        registrar_evento("empleos.agregado", clave=clave)
+        return jsonify({"clave": clave, **empleo.to_dict()}), 201
+
+    @app.route("/empleos/<int:clave>", methods=["PUT"])
+    def actualizar_empleo(clave):
+        """
+        Reemplaza un empleo conservando su posición en el catálogo (requiere ADMIN_TOKEN)
+        """
+        if not es_administrador():
+            return jsonify({"msg": "No autorizado"}), 403
+        try:
+            empleo = empleo_desde_json(request.get_json(silent=True))
+            obtener_catalogo().actualizar(clave, empleo)
+        except ValueError as e:
+            return jsonify({"msg": str(e)}), 400
+        except KeyError:
+            return jsonify({"msg": "Empleo no encontrado"}), 404
+
+        invalidar_rankings_obsoletos()
+        registrar_evento("empleos.actualizado", clave=clave)
+        return jsonify({"clave": clave, **empleo.to_dict()})
+
+    @app.route("/empleos/<int:clave>", methods=["DELETE"])
+    def retirar_empleo(clave):
+        """
+        Retira un empleo del catálogo (requiere ADMIN_TOKEN)
+        """
+        if not es_administrador():
+            return jsonify({"msg": "No autorizado"}), 403
+        try:
+            obtener_catalogo().retirar(clave)
+        except KeyError:
+            return jsonify({"msg": "Empleo no encontrado"}), 404
+
+        invalidar_rankings_obsoletos()
+        registrar_evento("empleos.retirado", clave=clave)
+        return jsonify({"msg": "Empleo retirado", "clave": clave})
+
+    @app.route("/cache-stats", methods=["GET"])
+    def cache_stats():
+        """
+        Contadores de la caché de rankings, la de tokens verificados y la compresión
+        """
+        compresion = app.extensions.get("compresion")
+        return jsonify({**cache_rankings.estadisticas(), "tokens": cache_tokens.estadisticas(),
+                        "compresion": compresion.estadisticas() if compresion else None})
+
     @app.route("/", methods=["GET"])
     def home():
         """
@@ -288,7 +345,9 @@ def init_routes(app):
             "version": "1.0",
             "endpoints": [
                 "POST /login - Autenticación",
-                "GET /trabajos - Obtener trabajos (requiere token)"
+                "POST /logout - Cerrar sesión (revoca el token)",
+                "GET /trabajos - Obtener trabajos (requiere token)",
+                "POST/PUT/DELETE /empleos - Administrar empleos (requiere ADMIN_TOKEN)"
             ]
         })
 
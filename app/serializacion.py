@@ -0,0 +1,133 @@
+"""
+Serialización JSON de las respuestas
+
+- Con orjson instalado (opcional, `pip install orjson`) jsonify codifica con
+  él (ProveedorJSONRapido); sin él se usa el proveedor por defecto de Flask.
+- Cada empleo guarda su JSON ya codificado en `empleo.fragmento_json` (sin
+  la llave de cierre). Las respuestas de ranking se arman empalmando esos
+  fragmentos con el score de cada egresado, en lugar de volver a codificar
+  titulo, descripcion, tecnologías... del mismo empleo en cada petición.
+"""
+import json
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Opcional: se usa json de la biblioteca estándar
+    orjson = None
+
+
+def orjson_disponible():
+    return orjson is not None
+
+
+def codificar(obj):
+    """JSON compacto (bytes) de obj"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fragmento_empleo(empleo, renovar=False):
+    """
+    JSON de `empleo.to_dict()` sin la llave de cierre, guardado en el empleo.
+
+    Args:
+        renovar (bool): Volver a codificar aunque ya esté guardado
+    """
+    fragmento = None if renovar else getattr(empleo, "fragmento_json", None)
+    if fragmento is None:
+        fragmento = codificar(empleo.to_dict())[:-1]
+        empleo.fragmento_json = fragmento
+    return fragmento
+
+
+def arreglo_empleos(pares, campo_score, extra=None):
+    """
+    JSON (bytes) de la lista de empleos con su score.
+
+    Args:
+        pares: Tuplas (score, empleo) en el orden de la respuesta
+        campo_score (str): Nombre del campo del score en cada empleo
+        extra (dict): Campos fijos que se agregan a cada empleo
+
+    Returns:
+        bytes: Lo mismo que codificar([{**empleo.to_dict(), campo_score: score, **extra}, ...])
+    """
+    antes_score = b"," + codificar(campo_score) + b":"
+    cierre = b"," + codificar(extra)[1:] if extra else b"}"
+    return b"[" + b",".join(
+        fragmento_empleo(empleo) + antes_score + codificar(score) + cierre
+        for score, empleo in pares
+    ) + b"]"
+
+
+def respuesta_json(cuerpo, **codificados):
+    """
+    Respuesta JSON de `cuerpo` con campos ya codificados empalmados al inicio.
+
+    Args:
+        cuerpo (dict): Campos que se codifican normalmente
+        **codificados: nombre -> bytes con JSON ya codificado (p. ej. de arreglo_empleos)
+    """
+    partes = [codificar(nombre) + b":" + valor for nombre, valor in codificados.items()]
+    resto = codificar(cuerpo)[1:-1]
+    if resto:
+        partes.append(resto)
+    return current_app.response_class(b"{" + b",".join(partes) + b"}\n", mimetype="application/json")
+
+
+class FragmentosEmpleos:
+    """Oyente del catálogo: codifica cada empleo al cargarlo o actualizarlo"""
+
+    def al_agregar(self, clave, empleo):
+        # Un empleo cargado de una instantánea ya trae su fragmento
+        fragmento_empleo(empleo)
+
+    def al_actualizar(self, clave, anterior, empleo):
+        fragmento_empleo(empleo, renovar=True)
+
+    def al_retirar(self, clave, empleo):
+        """Un empleo retirado no tiene nada que liberar"""
+
+
+class ProveedorJSONRapido(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask que codifica con orjson.
+
+    Mantiene las opciones del proveedor por defecto (sort_keys, respuesta
+    indentada en modo debug) y delega en él lo que orjson no sabe codificar.
+    """
+
+    def _opciones(self):
+        opciones = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        return opciones
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._opciones()).decode()
+        except TypeError:
+            return super().dumps(obj)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            datos = orjson.dumps(obj, default=self.default, option=self._opciones())
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(datos + b"\n", mimetype=self.mimetype)
+
+
+def configurar_json(app):
+    """Usa ProveedorJSONRapido en la app si orjson está instalado"""
+    if orjson is not None:
+        app.json = ProveedorJSONRapido(app)
+    return app
@@ -0,0 +1,159 @@
+"""
+Caché de tokens JWT ya verificados
+
+Verificar un token HS256 exige recalcular el HMAC y decodificar el JSON en
+cada petición, aunque el cliente envíe el mismo token cientos de veces
+durante sus 2 horas de vida. Aquí se guarda el payload de cada token ya
+verificado hasta su `exp`:
+
+- La clave es un digest SHA-256 del token (el token no se guarda) junto con
+  una huella del SECRET_KEY: si el secreto rota, las entradas anteriores
+  dejan de coincidir y el token se vuelve a verificar con el secreto nuevo.
+- Una entrada nunca se usa después del `exp` del token.
+- `revocar(token, exp)` invalida un token antes de su `exp` (cierre de
+  sesión, credenciales comprometidas) aunque esté en la caché. La
+  revocación se descarta sola cuando el token expira (ya no pasaría la
+  verificación), así el conjunto de revocados no crece sin límite.
+"""
+import hashlib
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+
+def digest_token(token):
+    """Digest SHA-256 del token (lo que se guarda en lugar del token)"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+@lru_cache(maxsize=8)
+def huella_secreto(secreto):
+    """Huella corta del secreto de firma para separar entradas entre rotaciones"""
+    return hashlib.sha256(b"pilape-jwt:" + (secreto or "").encode()).digest()[:8]
+
+
+class CacheTokens:
+    """
+    Caché LRU acotada de payloads de tokens verificados, válidos hasta su `exp`.
+
+    Con max_entradas = 0 la caché queda desactivada (se verifica siempre),
+    pero la revocación sigue funcionando.
+    """
+
+    def __init__(self, max_entradas=4096, reloj=time.time):
+        self.max_entradas = max_entradas
+        self._reloj = reloj
+        self._datos = OrderedDict()   # (huella del secreto, digest) -> (exp, payload)
+        self._revocados = {}          # digest -> exp (se descartan al expirar)
+        self._vencimientos = []       # heap (exp, digest) para descartar los revocados expirados
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojados = 0
+
+    @property
+    def activa(self):
+        return self.max_entradas > 0
+
+    def verificar(self, token, secreto, decodificar):
+        """
+        Payload del token, desde la caché o verificándolo con `decodificar`.
+
+        Args:
+            token (str): Token JWT recibido
+            secreto (str): SECRET_KEY actual
+            decodificar (callable): decodificar(token, secreto) -> payload o
+                None si el token es inválido o expiró
+
+        Returns:
+            dict or None: Copia del payload, None si es inválido, expiró o fue revocado
+        """
+        digest = digest_token(token)
+        clave = (huella_secreto(secreto), digest)
+        ahora = self._reloj()
+
+        with self._lock:
+            self._descartar_revocados_expirados(ahora)
+            if digest in self._revocados:
+                return None
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                if ahora < entrada[0]:
+                    self._datos.move_to_end(clave)
+                    self.aciertos += 1
+                    return dict(entrada[1])
+                del self._datos[clave]
+            self.fallos += 1
+
+        payload = decodificar(token, secreto)
+        if payload is None:
+            return None
+
+        exp = payload.get("exp")
+        if self.activa and isinstance(exp, (int, float)):
+            with self._lock:
+                if digest not in self._revocados:
+                    self._datos[clave] = (exp, dict(payload))
+                    self._datos.move_to_end(clave)
+                    while len(self._datos) > self.max_entradas:
+                        self._datos.popitem(last=False)
+                        self.desalojados += 1
+        return payload
+
+    def revocar(self, token, exp=None):
+        """
+        Rechaza el token desde ya, esté o no en la caché.
+
+        Args:
+            exp (float): Expiración del token; la revocación se descarta
+                después de ella (el token ya no pasaría la verificación). Sin
+                exp se recuerda hasta `olvidar_revocados(todos=True)`.
+        """
+        digest = digest_token(token)
+        exp = float("inf") if exp is None else exp
+        with self._lock:
+            self._descartar_revocados_expirados(self._reloj())
+            if exp > self._revocados.get(digest, float("-inf")):
+                self._revocados[digest] = exp
+                if exp != float("inf"):
+                    heapq.heappush(self._vencimientos, (exp, digest))
+            for clave in [c for c in self._datos if c[1] == digest]:
+                del self._datos[clave]
+
+    def _descartar_revocados_expirados(self, ahora):
+        # Con el lock tomado; O(1) si no expiró ninguna revocación
+        vencimientos = self._vencimientos
+        while vencimientos and vencimientos[0][0] <= ahora:
+            exp, digest = heapq.heappop(vencimientos)
+            if self._revocados.get(digest) == exp:
+                del self._revocados[digest]
+
+    def olvidar_revocados(self, todos=False):
+        """Descarta las revocaciones de tokens ya expirados (o todas)"""
+        with self._lock:
+            if todos:
+                self._revocados.clear()
+                self._vencimientos.clear()
+                return
+            self._descartar_revocados_expirados(self._reloj())
+
+    def invalidar(self):
+        """Vacía la caché (las revocaciones se mantienen)"""
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        """Contadores de uso"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "revocados": len(self._revocados),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojados": self.desalojados,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0
+            }
@@ -3,7 +3,6 @@ PilAPE API - Versión simplificada para Vercel
 Sistema de matching de empleos para egresados
 """
 import os
-import jwt
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 import logging
@@ -75,14 +74,22 @@ class Cola:
 # =============================================
 # BASE DE DATOS (usar `app.models` como fuente única)
 # =============================================
-# Importar los datos desde `app.models` para evitar duplicidad entre entrypoints
-from app.models import egresados_data, empleos_data
+# Los datos vienen de `app.models` para evitar duplicidad entre entrypoints.
+# Se construyen en la primera petición que los usa (/health no los necesita).
+from app.models import obtener_egresados, obtener_indice_bm25, obtener_modelos
+
+# Motores de ranking de /trabajos (?motor=) y nombre del algoritmo en la respuesta
+ALGORITMOS = {
+    "palabras_clave": "score_por_palabras_clave_simplificado",
+    "bm25": "bm25_indice_invertido"
+}
 
 # =============================================
 # FUNCIONES DE AUTENTICACIÓN
 # =============================================
 def generar_token(egresado):
     """Genera token JWT para el egresado"""
+    import jwt  # Diferido: /health no lo necesita (ver tree_arranque.py)
     payload = {
         'cedula': egresado.cedula,
         'red': egresado.red,
@@ -93,6 +100,7 @@ def generar_token(egresado):
 
 def verificar_token(token):
     """Verifica y decodifica el token JWT"""
+    import jwt
     try:
         payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
         return payload
@@ -211,7 +219,7 @@ def login():
             return jsonify({"msg": "Cédula y ficha son requeridos"}), 400
 
         # Buscar egresado
-        egresado = next((e for e in egresados_data if e.cedula == cedula and e.ficha == ficha), None)
+        egresado = obtener_egresados().autenticar(cedula, ficha)
         if not egresado:
             return jsonify({"msg": "Credenciales inválidas"}), 401
 
@@ -233,6 +241,8 @@ def login():
 @app.route('/debug-data', methods=['GET'])
 def debug_data_index():
     try:
+        modelos = obtener_modelos()
+        egresados_data, empleos_data = modelos["egresados_data"], modelos["empleos_data"]
         egresados_sample = [
             {
                 'cedula': e.cedula,
@@ -277,24 +287,35 @@ def get_trabajos():
 
         # Obtener egresado
         cedula = data["cedula"]
-        egresado = next((e for e in egresados_data if e.cedula == cedula), None)
+        egresado = obtener_egresados().obtener(cedula)
         if not egresado:
             return jsonify({"msg": "Egresado no encontrado"}), 404
 
-        # Calcular scores
+        # Motor: "palabras_clave" (por defecto) o "bm25" (índice invertido BM25F de app.bm25)
+        motor = request.args.get("motor", "palabras_clave")
+        if motor not in ALGORITMOS:
+            return jsonify({"msg": "Motor inválido. Use 'palabras_clave' o 'bm25'"}), 400
+
         empleos_con_score = []
-        # Recorremos todos los empleos y calculamos su score para este egresado.
-        # Solo añadimos a la lista los empleos con score > 0 (alguna compatibilidad).
-        for empleo in empleos_data:
-            score = calcular_score_por_palabras_clave(egresado, empleo)
-            if score > 0:
+        if motor == "bm25":
+            # El índice solo recorre los empleos que comparten términos y ya devuelve el orden
+            for score, empleo in obtener_indice_bm25().buscar(egresado):
                 empleo_dict = empleo.to_dict()
                 empleo_dict["score_compatibilidad"] = score
                 empleos_con_score.append(empleo_dict)
-
-        # Ordenar por score (mayor -> menor). El empleo con mayor score queda
-        # en la posición 0 de la lista.
-        empleos_con_score.sort(key=lambda x: x["score_compatibilidad"], reverse=True)
+        else:
+            # Recorremos todos los empleos y calculamos su score para este egresado.
+            # Solo añadimos a la lista los empleos con score > 0 (alguna compatibilidad).
+            for empleo in obtener_modelos()["empleos_data"]:
+                score = calcular_score_por_palabras_clave(egresado, empleo)
+                if score > 0:
+                    empleo_dict = empleo.to_dict()
+                    empleo_dict["score_compatibilidad"] = score
+                    empleos_con_score.append(empleo_dict)
+
+            # Ordenar por score (mayor -> menor). El empleo con mayor score queda
+            # en la posición 0 de la lista.
+            empleos_con_score.sort(key=lambda x: x["score_compatibilidad"], reverse=True)
 
         # Usar Cola FIFO para respuesta: encolamos en orden descendente
         # (mayor->menor) para que, al desencolar FIFO, el primer elemento
@@ -314,7 +335,7 @@ def get_trabajos():
             "total": len(trabajos),
             "red": data["red"],
             "perfil": data["perfil"],
-            "algoritmo": "score_por_palabras_clave_simplificado"
+            "algoritmo": ALGORITMOS[motor]
         })
         
     except Exception as e:
@@ -1,5 +1,4 @@
 from flask import Flask, request, jsonify
-import jwt
 import datetime
 
 # ===============================
@@ -47,23 +46,40 @@ class Pila:
         return len(self.items) == 0
 
 # ===============================
-# Datos simulados
+# Datos simulados (se crean en la primera petición que los usa)
 # ===============================
-egresados = [
-    Egresado("123", "456", "Ana Pérez", "Software"),
-    Egresado("124", "457", "Luis Gómez", "Contabilidad"),
-]
-
-empleos = [
-    Empleo("Desarrollador Python", "Desarrollo de backend", 2500000, "Software"),
-    Empleo("Tester QA", "Pruebas de software", 2000000, "Software"),
-    Empleo("Auxiliar contable", "Balances financieros", 1800000, "Contabilidad"),
-]
+_datos = None
+
+def obtener_datos():
+    """(egresados, empleos) de ejemplo"""
+    global _datos
+    if _datos is None:
+        _datos = (
+            [
+                Egresado("123", "456", "Ana Pérez", "Software"),
+                Egresado("124", "457", "Luis Gómez", "Contabilidad"),
+            ],
+            [
+                Empleo("Desarrollador Python", "Desarrollo de backend", 2500000, "Software"),
+                Empleo("Tester QA", "Pruebas de software", 2000000, "Software"),
+                Empleo("Auxiliar contable", "Balances financieros", 1800000, "Contabilidad"),
+            ],
+        )
+    return _datos
+
+def __getattr__(nombre):
+    """`main.egresados` y `main.empleos`"""
+    if nombre == "egresados":
+        return obtener_datos()[0]
+    if nombre == "empleos":
+        return obtener_datos()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 # ===============================
 # Helpers
 # ===============================
 def generar_token(egresado):
+    import jwt  # Diferido: solo /login y /trabajos lo necesitan
     payload = {
         "cedula": egresado.cedula,
         "perfil": egresado.perfil,
@@ -72,6 +88,7 @@ def generar_token(egresado):
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
 
 def verificar_token(token):
+    import jwt
     try:
         return jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
@@ -89,6 +106,7 @@ def login():
     ficha = data.get("ficha")
 
     # Validar egresado
+    egresados, _ = obtener_datos()
     egresado = next((e for e in egresados if e.cedula == cedula and e.ficha == ficha), None)
     if not egresado:
         return jsonify({"msg": "Credenciales inválidas"}), 401
@@ -117,6 +135,7 @@ def get_trabajos():
 
     # Filtrar empleos por perfil y meter en pila
     pila = Pila()
+    _, empleos = obtener_datos()
     for empleo in empleos:
         if empleo.perfil_requerido == perfil:
             pila.push(empleo)
@@ -0,0 +1,212 @@
+"""
+Ranking offline egresados × empleos (árbol jerárquico)
+
+Calcula la afinidad de cada egresado con todo el catálogo de empleos y guarda
+solo los k mejores empleos por egresado. Pensado para generar cada noche las
+recomendaciones de todos los egresados, no solo de quien consulta /trabajos.
+
+El trabajo se hace por bloques: los egresados se leen en bloques y, para cada
+bloque, el catálogo se recorre también por bloques manteniendo un heap de
+tamaño k por egresado. La memoria depende del tamaño de los bloques y de k,
+no del tamaño de los datos. Los bloques de egresados se reparten en un pool
+de procesos.
+
+Uso:
+    python ranking_offline.py --salida ranking.jsonl.gz
+    python ranking_offline.py --egresados egresados.jsonl --empleos empleos.jsonl \\
+        --top-k 20 --procesos 4 --salida ranking.jsonl.gz
+
+Formato de entrada (JSONL): un objeto por línea con los mismos campos que
+los constructores de Egresado y Empleo en tree_models.py. Sin archivos se
+usan los datos de tree_models.py.
+
+Formato de salida (JSONL comprimido con gzip): una línea por egresado
+    {"cedula": "123", "empleos": [[id_empleo, score], ...]}
+"""
+import argparse
+import gzip
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tree_models import Egresado, Empleo
+
+_arbol = None
+
+
+def _obtener_arbol():
+    """Árbol jerárquico del proceso (se importa una vez por proceso del pool)"""
+    global _arbol
+    if _arbol is None:
+        from tree_backend import arbol_jerarquico
+        _arbol = arbol_jerarquico
+    return _arbol
+
+
+def leer_jsonl(ruta, modelo):
+    """Lee un archivo JSONL línea a línea y construye instancias de `modelo`"""
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea:
+                yield modelo(**json.loads(linea))
+
+
+def iterar_egresados(ruta=None):
+    """Egresados desde un JSONL o, sin ruta, desde tree_models.py"""
+    if ruta:
+        return leer_jsonl(ruta, Egresado)
+    from tree_models import egresados_data
+    return iter(egresados_data)
+
+
+def iterar_empleos(ruta=None):
+    """Empleos desde un JSONL o, sin ruta, desde tree_models.py"""
+    if ruta:
+        return leer_jsonl(ruta, Empleo)
+    from tree_models import empleos_data
+    return iter(empleos_data)
+
+
+def en_bloques(iterable, tamano):
+    """Agrupa un iterable en listas de `tamano` elementos"""
+    iterador = iter(iterable)
+    while True:
+        bloque = list(islice(iterador, tamano))
+        if not bloque:
+            return
+        yield bloque
+
+
+def procesar_bloque(tarea):
+    """
+    Calcula el top-k de un bloque de egresados contra todo el catálogo.
+
+    Args:
+        tarea (tuple): (perfiles, ruta_empleos, k, tamano_bloque_empleos) donde
+            perfiles es una lista de (cedula, PerfilCodificado)
+
+    Returns:
+        list: (cedula, [(id_empleo, score), ...]) por egresado, mejor score primero
+    """
+    perfiles, ruta_empleos, k, tamano_bloque_empleos = tarea
+    arbol = _obtener_arbol()
+    afinidad = arbol.afinidad_codificada
+
+    # Heap mínimo por egresado con (score, -posición, id): en empates gana el
+    # empleo que aparece antes en el catálogo, igual que en /trabajos
+    heaps = [[] for _ in perfiles]
+    posicion = 0
+    for bloque in en_bloques(iterar_empleos(ruta_empleos), tamano_bloque_empleos):
+        codificados = []
+        for empleo in bloque:
+            codificados.append((-posicion, empleo.id, arbol.codificar_empleo(empleo)))
+            posicion += 1
+
+        for (_, perfil), heap in zip(perfiles, heaps):
+            for orden, id_empleo, empleo in codificados:
+                score = afinidad(perfil, empleo)
+                if score <= 0:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, orden, id_empleo))
+                elif (score, orden) > heap[0][:2]:
+                    heapq.heapreplace(heap, (score, orden, id_empleo))
+
+    return [
+        (cedula, [(id_empleo, score) for score, _, id_empleo in sorted(heap, reverse=True)])
+        for (cedula, _), heap in zip(perfiles, heaps)
+    ]
+
+
+def generar_tareas(args):
+    """Bloques de egresados codificados, listos para enviar al pool"""
+    arbol = _obtener_arbol()
+    for bloque in en_bloques(iterar_egresados(args.egresados), args.bloque_egresados):
+        perfiles = [(e.cedula, arbol.codificar_egresado(e)) for e in bloque]
+        yield (perfiles, args.empleos, args.top_k, args.bloque_empleos)
+
+
+def mapear_acotado(pool, funcion, tareas, en_vuelo):
+    """
+    Como pool.map, pero con a lo sumo `en_vuelo` tareas enviadas a la vez.
+
+    Executor.map consume todo el iterable de tareas al empezar (y guarda los
+    resultados que terminan antes de tiempo); aquí la siguiente tarea solo se
+    genera y envía cuando se entrega un resultado, así la memoria depende de
+    `en_vuelo` y no del número de egresados.
+
+    Yields:
+        El resultado de cada tarea, en el orden de las tareas
+    """
+    tareas = iter(tareas)
+    pendientes = deque()
+    for tarea in islice(tareas, en_vuelo):
+        pendientes.append(pool.submit(funcion, tarea))
+    while pendientes:
+        resultado = pendientes.popleft().result()
+        for tarea in islice(tareas, 1):
+            pendientes.append(pool.submit(funcion, tarea))
+        yield resultado
+
+
+def ejecutar(args):
+    """Ejecuta el ranking completo y escribe el archivo de salida"""
+    inicio = time.perf_counter()
+    total_egresados = 0
+    procesos = args.procesos or os.cpu_count() or 1
+
+    with gzip.open(args.salida, "wt", encoding="utf-8") as salida:
+        def escribir(resultados):
+            for cedula, empleos in resultados:
+                salida.write(json.dumps({"cedula": cedula, "empleos": empleos},
+                                        separators=(",", ":")) + "\n")
+            return len(resultados)
+
+        if procesos > 1:
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                # Ventana de 2 bloques por proceso: los procesos no esperan y la
+                # memoria no crece con el número de egresados
+                for resultados in mapear_acotado(pool, procesar_bloque, generar_tareas(args), 2 * procesos):
+                    total_egresados += escribir(resultados)
+        else:
+            for tarea in generar_tareas(args):
+                total_egresados += escribir(procesar_bloque(tarea))
+
+    duracion = time.perf_counter() - inicio
+    print(f"Ranking generado: {total_egresados} egresados, top {args.top_k}, "
+          f"{procesos} proceso(s), {duracion:.2f}s -> {args.salida}")
+    return total_egresados
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(description="Ranking offline egresados × empleos por árbol jerárquico")
+    parser.add_argument("--egresados", help="Archivo JSONL de egresados (por defecto tree_models.py)")
+    parser.add_argument("--empleos", help="Archivo JSONL de empleos (por defecto tree_models.py)")
+    parser.add_argument("--salida", default="ranking.jsonl.gz", help="Archivo de salida (JSONL gzip)")
+    parser.add_argument("--top-k", type=int, default=20, help="Empleos a guardar por egresado")
+    parser.add_argument("--bloque-egresados", type=int, default=256, help="Egresados por bloque")
+    parser.add_argument("--bloque-empleos", type=int, default=10000, help="Empleos por bloque")
+    parser.add_argument("--procesos", type=int, default=0,
+                        help="Procesos del pool (0 = número de núcleos, 1 = sin pool)")
+    return parser
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    if args.top_k < 1 or args.bloque_egresados < 1 or args.bloque_empleos < 1:
+        print("--top-k y los tamaños de bloque deben ser mayores que 0", file=sys.stderr)
+        return 2
+    ejecutar(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
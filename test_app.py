@@ -0,0 +1,304 @@
+"""
+Pruebas de los módulos del paquete app
+"""
+import json
+import logging
+import sys
+import threading
+
+from app.bm25 import IndiceBM25
+from app.cache import CacheRanking
+from app.catalogo import CatalogoEmpleos
+from app.models import Egresado, Empleo
+from app.normalizacion import ids_vocabulario, normalizar_texto
+from app.palabras_clave import calcular_score_por_palabras_clave
+from app.registro import FormateadorJSON, debe_registrar, leer_tasas
+
+
+def test_cache_ranking_lru_y_ttl():
+    """Desaloja la entrada menos usada y expira las entradas vencidas"""
+    ahora = [0.0]
+    cache = CacheRanking(max_entradas=2, ttl_segundos=10, reloj=lambda: ahora[0])
+
+    cache.guardar(("123", 1), ["a"])
+    cache.guardar(("124", 1), ["b"])
+    assert cache.obtener(("123", 1)) == ["a"]      # 123 pasa a ser la más reciente
+    cache.guardar(("125", 1), ["c"])               # desaloja 124
+    assert cache.obtener(("124", 1)) is None
+    assert cache.obtener(("123", 2)) is None       # otra versión de datos: no se sirve
+
+    ahora[0] = 11.0
+    assert cache.obtener(("125", 1)) is None       # expirada
+
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (1, 3)
+    assert (estadisticas["desalojados"], estadisticas["expirados"]) == (1, 1)
+
+
+def test_score_por_palabras_clave_precompilado():
+    """Los tokens se calculan una vez y el score mantiene los pesos 40/30/20/10"""
+    egresado = Egresado("1", "1", "Prueba", "Gestión", "Coordina proyectos de calidad en software")
+    empleo = Empleo("Analista de software", "Control de calidad", 1, "Software")
+
+    # perfil ∩ perfil_requerido = {software} (30) + perfil ∩ título = {software} (20)
+    # + perfil ∩ descripción = {calidad} (10)
+    assert calcular_score_por_palabras_clave(egresado, empleo) == 60
+    assert egresado.palabras_clave.perfil == ids_vocabulario(["proyectos", "calidad", "software"])
+    assert empleo.palabras_clave.titulo == ids_vocabulario(["software"])
+
+    assert calcular_score_por_palabras_clave(
+        Egresado("2", "2", "Prueba", "software", "Otro perfil"), empleo) == 100
+
+
+def test_indice_bm25_prioriza_el_campo_perfil_requerido():
+    """Un término en perfil_requerido pesa más que en la descripción; sin términos comunes no hay score"""
+    indice = IndiceBM25()
+    catalogo = CatalogoEmpleos([
+        Empleo("Auxiliar", "Apoyo en salud ocupacional", 1, "Comercio"),
+        Empleo("Auxiliar", "Apoyo administrativo", 1, "Salud"),
+        Empleo("Vendedor", "Ventas de mostrador", 1, "Comercio"),
+    ])
+    catalogo.registrar(indice)
+
+    ranking = indice.buscar(Egresado("1", "1", "Prueba", "Salud", "Atención de pacientes"))
+    assert [empleo.perfil_requerido for _, empleo in ranking] == ["Salud", "Comercio"]
+    assert ranking[0][0] > ranking[1][0] > 0
+
+
+def test_index_elige_el_motor_bm25_por_peticion():
+    """index.py acepta ?motor=bm25 (índice de app.bm25) y rechaza motores desconocidos"""
+    import index
+    from app.models import obtener_egresados, obtener_indice_bm25
+
+    cliente = index.app.test_client()
+    token = cliente.post("/login", json={"cedula": "135", "ficha": "468"}).get_json()["token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    respuesta = cliente.get("/trabajos?motor=bm25", headers=auth).get_json()
+    esperado = obtener_indice_bm25().buscar(obtener_egresados().obtener("135"))
+    assert respuesta["algoritmo"] == "bm25_indice_invertido"
+    assert [(t["titulo"], t["score_compatibilidad"]) for t in respuesta["trabajos"]] == \
+        [(empleo.titulo, score) for score, empleo in esperado]
+    assert cliente.get("/trabajos", headers=auth).get_json()["algoritmo"] == "score_por_palabras_clave_simplificado"
+    assert cliente.get("/trabajos?motor=otro", headers=auth).status_code == 400
+
+
+def test_normalizacion_sin_tildes_ni_puntuacion():
+    """Los textos acentuados y con puntuación coinciden con el vocabulario sin tildes"""
+    assert normalizar_texto("Construcción, Gestión y rehabilitación.") == "construccion gestion y rehabilitacion"
+    assert normalizar_texto("Diseño") == "diseno"
+
+    egresado = Egresado("1", "1", "Prueba", "Construcción", "Supervisión de obras")
+    empleo = Empleo("Residente de obra", "Gestión de proyectos", 1, "Construccion")
+    assert calcular_score_por_palabras_clave(egresado, empleo) == 100
+
+
+def test_registro_muestreo_y_formato_json():
+    """Las tasas se leen del entorno, los errores no se muestrean y cada registro es una línea JSON"""
+    assert leer_tasas("trabajos.resumen=0.5, login.resumen=2") == {"trabajos.resumen": 0.5, "login.resumen": 1.0}
+    assert debe_registrar("evento.sin.tasa")
+    assert debe_registrar("trabajos.resumen", logging.ERROR)
+
+    registro = logging.LogRecord("pilape", logging.INFO, __file__, 1, "trabajos.resumen", None, None)
+    registro.evento = "trabajos.resumen"
+    registro.campos = {"cedula": "124", "total": 3}
+    datos = json.loads(FormateadorJSON().format(registro))
+    assert datos["evento"] == "trabajos.resumen" and datos["cedula"] == "124" and datos["total"] == 3
+
+
+def test_catalogo_actualiza_indices_de_forma_incremental():
+    """Tras agregar, actualizar y retirar empleos, BM25 y los tokens equivalen a indexar desde cero"""
+    empleos = [
+        Empleo("Auxiliar", "Apoyo en salud ocupacional", 1, "Comercio"),
+        Empleo("Auxiliar", "Apoyo administrativo", 1, "Salud"),
+        Empleo("Vendedor", "Ventas de mostrador", 1, "Comercio"),
+    ]
+    catalogo = CatalogoEmpleos(empleos)
+    indice = catalogo.registrar(IndiceBM25())
+    version = catalogo.version
+
+    clave = catalogo.agregar(Empleo("Enfermero", "Cuidado de pacientes", 1, "Salud"))
+    catalogo.actualizar(0, Empleo("Cajero", "Caja y ventas", 1, "Comercio"))
+    catalogo.retirar(1)
+    assert catalogo.version == version + 3
+
+    desde_cero = IndiceBM25()
+    for clave_empleo, empleo in zip([0, 2, clave], catalogo):
+        desde_cero.al_agregar(clave_empleo, empleo)
+
+    egresado = Egresado("1", "1", "Prueba", "Salud", "Atención de pacientes y ventas")
+    assert indice.buscar(egresado) == desde_cero.buscar(egresado)
+    assert {empleo.titulo for _, empleo in indice.buscar(egresado)} == {"Enfermero", "Vendedor", "Cajero"}
+    assert calcular_score_por_palabras_clave(egresado, catalogo.obtener(0)) == 10
+
+
+def test_huella_del_catalogo_distingue_contenidos_con_la_misma_version():
+    """Dos catálogos con el mismo contador pero distinto contenido no comparten huella (ETag)"""
+    def nuevo():
+        return CatalogoEmpleos([Empleo("Auxiliar", "Apoyo en salud", 1, "Salud"),
+                                Empleo("Vendedor", "Ventas de mostrador", 1, "Comercio")])
+
+    con_alta, con_cambio = nuevo(), nuevo()
+    assert con_alta.huella == con_cambio.huella
+    con_alta.agregar(Empleo("Enfermero", "Cuidado de pacientes", 1, "Salud"))
+    con_cambio.actualizar(0, Empleo("Cajero", "Caja y ventas", 1, "Comercio"))
+    assert con_alta.version == con_cambio.version
+    assert con_alta.huella != con_cambio.huella
+
+    # La huella se mantiene de forma incremental: deshacer los cambios la devuelve a la original
+    con_cambio.actualizar(0, Empleo("Auxiliar", "Apoyo en salud", 1, "Salud"))
+    assert con_cambio.huella == nuevo().huella
+    con_alta.retirar(2)
+    assert con_alta.huella == nuevo().huella
+
+    # No depende del serializador: el JSON guardado en el empleo (orjson o json) no cuenta
+    for empleo in con_alta:
+        empleo.fragmento_json = b'{"otro":"serializador"'
+    assert con_alta.huella == CatalogoEmpleos(list(con_alta)).huella == nuevo().huella
+
+
+def test_catalogo_admite_cambios_mientras_otros_hilos_rankean():
+    """Altas y bajas concurrentes con recorridos y búsquedas BM25 no fallan ni dejan el índice inconsistente"""
+    base = [Empleo(f"Auxiliar {i}", "Apoyo en salud y ventas", 1, "Salud") for i in range(300)]
+    catalogo = CatalogoEmpleos(base)
+    indice = catalogo.registrar(IndiceBM25())
+    egresado = Egresado("1", "111", "Ana", "Salud", "Apoyo en ventas")
+    errores = []
+    terminado = threading.Event()
+
+    def escribir():
+        try:
+            for i in range(300):
+                catalogo.agregar(Empleo(f"Vendedor {i}", "Ventas de salud", 1, "Comercio"))
+                catalogo.retirar(i)
+        except Exception as error:
+            errores.append(error)
+        finally:
+            terminado.set()
+
+    def leer():
+        try:
+            while not terminado.is_set():
+                assert all(empleo is not None for empleo in catalogo)
+                assert all(empleo is not None for _, empleo in indice.buscar(egresado))
+                catalogo.en_orden(range(0, 600, 7))
+                catalogo.huella
+        except Exception as error:
+            errores.append(error)
+
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        hilos = [threading.Thread(target=escribir)] + [threading.Thread(target=leer) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    assert errores == []
+    desde_cero = IndiceBM25()
+    CatalogoEmpleos(list(catalogo)).registrar(desde_cero)
+    assert indice.buscar(egresado) == desde_cero.buscar(egresado)
+
+
+def test_indice_egresados_por_cedula():
+    """Login por cédula con ficha en tiempo constante; un cambio de perfil sube la versión"""
+    from app.egresados import IndiceEgresados
+
+    egresados = IndiceEgresados([Egresado("1", "111", "Ana", "Salud", "Enfermería"),
+                                 Egresado("2", "222", "Luis", "Comercio", "Ventas")])
+    assert egresados.autenticar("2", "222").nombre == "Luis"
+    assert egresados.autenticar("2", "111") is None
+    assert egresados.autenticar("3", "333") is None
+
+    anterior = egresados.obtener("1")
+    calcular_score_por_palabras_clave(anterior, Empleo("Enfermero", "Cuidado", 1, "Salud"))
+    assert anterior.palabras_clave is not None
+
+    nuevo = Egresado("1", "111", "Ana", "Comercio", "Ventas")
+    nuevo.palabras_clave = anterior.palabras_clave
+    assert egresados.actualizar(nuevo) == 1
+    assert egresados.obtener("1") is nuevo and nuevo.palabras_clave is None
+    assert calcular_score_por_palabras_clave(nuevo, Empleo("Enfermero", "Cuidado", 1, "Salud")) == 0
+
+
+def test_cache_tokens_hasta_exp_con_rotacion_y_revocacion():
+    """El payload se reutiliza hasta exp; otro secreto o una revocación obligan a rechazar"""
+    from app.tokens import CacheTokens
+
+    ahora = [1000.0]
+    decodificados = []
+
+    def decodificar(token, secreto):
+        decodificados.append(token)
+        if secreto != "secreto" or ahora[0] >= 1100:
+            return None
+        return {"cedula": token, "exp": 1100}
+
+    cache = CacheTokens(max_entradas=2, reloj=lambda: ahora[0])
+    assert cache.verificar("a", "secreto", decodificar) == {"cedula": "a", "exp": 1100}
+    assert cache.verificar("a", "secreto", decodificar)["cedula"] == "a"
+    assert decodificados == ["a"]
+
+    # Rotación del secreto: no se reutiliza la entrada verificada con el anterior
+    assert cache.verificar("a", "otro-secreto", decodificar) is None
+
+    cache.revocar("a", exp=1100)
+    assert cache.verificar("a", "secreto", decodificar) is None
+
+    cache.verificar("b", "secreto", decodificar)
+    ahora[0] = 1100
+    # La revocación de "a" se descarta sola al expirar el token
+    assert cache.verificar("b", "secreto", decodificar) is None
+    assert cache.estadisticas()["revocados"] == 0
+
+
+def test_fragmentos_de_empleos_equivalen_a_codificar_el_diccionario():
+    """El JSON empalmado es el de to_dict con el score, y se renueva al actualizar el empleo"""
+    from app.serializacion import FragmentosEmpleos, arreglo_empleos
+
+    catalogo = CatalogoEmpleos([Empleo("Dev \"Python\"", "Backend ñ", 1000, "Software")])
+    catalogo.registrar(FragmentosEmpleos())
+    empleo = catalogo.obtener(0)
+    assert json.loads(arreglo_empleos([(7, empleo)], "score", {"fijo": True})) == [
+        dict(empleo.to_dict(), score=7, fijo=True)]
+
+    nuevo = Empleo("QA", "Pruebas", 900, "Software")
+    catalogo.actualizar(0, nuevo)
+    assert json.loads(arreglo_empleos([(1.5, nuevo), (2, empleo)], "score")) == [
+        dict(nuevo.to_dict(), score=1.5), dict(empleo.to_dict(), score=2)]
+
+
+def test_compresion_negocia_codificacion_y_reutiliza_el_cuerpo_por_etag():
+    """gzip/deflate según Accept-Encoding, umbral de tamaño y 304 con el ETag de la variante"""
+    import gzip
+    from flask import Flask, request
+    from app.compresion import instalar_compresion
+
+    app = Flask(__name__)
+
+    @app.route("/datos")
+    def datos():
+        respuesta = app.response_class(json.dumps({"x": ["repetido"] * int(request.args["n"])}),
+                                       mimetype="application/json")
+        respuesta.set_etag(request.args["n"])
+        return respuesta.make_conditional(request)
+
+    compresion = instalar_compresion(app, tamano_minimo=200)
+    cliente = app.test_client()
+
+    assert "Content-Encoding" not in cliente.get("/datos?n=5", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in cliente.get("/datos?n=500").headers
+
+    respuesta = cliente.get("/datos?n=500", headers={"Accept-Encoding": "gzip;q=1, deflate;q=0.5"})
+    assert respuesta.headers["Content-Encoding"] == "gzip" and respuesta.headers["ETag"] == '"500-gzip"'
+    assert json.loads(gzip.decompress(respuesta.data))["x"] == ["repetido"] * 500
+
+    cliente.get("/datos?n=500", headers={"Accept-Encoding": "gzip"})
+    assert compresion.estadisticas()["comprimidas"] == 1
+
+    no_modificada = cliente.get("/datos?n=500", headers={"Accept-Encoding": "gzip", "If-None-Match": '"500-gzip"'})
+    assert no_modificada.status_code == 304 and no_modificada.headers["ETag"] == '"500-gzip"'
+    assert cliente.get("/datos?n=500", headers={"Accept-Encoding": "deflate"}).headers["Content-Encoding"] == "deflate"
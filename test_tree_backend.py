@@ -0,0 +1,385 @@
+"""
+Pruebas del backend por árbol jerárquico usando los módulos reales
+(tree_backend.py y tree_models.py)
+"""
+import pytest
+
+from tree_backend import (arbol_jerarquico, ordenar_empleos_por_arbol, repositorio,
+                          obtener_motor_vectorizado)
+from tree_models import egresados_data, empleos_data, Egresado, Empleo
+
+
+def test_indice_de_nodos_equivale_a_busqueda_recursiva():
+    """El índice hash devuelve el mismo nodo que el recorrido recursivo"""
+    for nodo in arbol_jerarquico.nodos:
+        esperado = arbol_jerarquico.buscar_nodo(nodo.valor, arbol_jerarquico.raiz)
+        assert arbol_jerarquico.buscar_nodo(nodo.valor) is esperado
+        assert arbol_jerarquico.obtener_nodo(nodo.valor.upper()) is esperado
+        assert arbol_jerarquico.nodos[arbol_jerarquico.obtener_id_nodo(nodo.valor)] is esperado
+
+    assert arbol_jerarquico.obtener_nodo("Tecnología inexistente") is None
+    assert arbol_jerarquico.obtener_id_nodo("") is None
+
+
+def test_ordenamiento_por_arbol():
+    """El empleo más afín para un perfil fullstack es de su mismo rol y especialización"""
+    egresado = next(e for e in egresados_data if e.cedula == "123")
+    trabajos = ordenar_empleos_por_arbol(egresado, empleos_data)
+
+    assert trabajos
+    scores = [t["score_afinidad"] for t in trabajos]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1000 for score in scores)
+    assert trabajos[0]["rol_requerido"] == "Development Team"
+
+
+def test_indice_invertido_produce_el_mismo_ranking():
+    """Puntuar solo los candidatos del índice da el mismo resultado que el recorrido completo"""
+    for egresado in egresados_data:
+        completo = ordenar_empleos_por_arbol(egresado, empleos_data)
+        con_indice = ordenar_empleos_por_arbol(egresado, empleos_data, indice=repositorio)
+        assert con_indice == completo
+
+
+def test_afinidad_con_mascaras_de_tecnologias():
+    """Especialización (8×30) + React y JavaScript (2×7×15) + bonificación 50, con prioridad media (×1.1)"""
+    egresado = Egresado("1", "1", "Prueba", "Software", "", "QA Tester", "Frontend",
+                        ["React", "JavaScript", "Rust"])
+    empleo = Empleo(99, "Frontend", "", "Software", 0, "", "Development Team", "Frontend",
+                    ["react", "JavaScript", "Figma"], 2)
+
+    mascara = arbol_jerarquico.codificar_tecnologias(egresado.tecnologias)
+    assert mascara == arbol_jerarquico.codificar_tecnologias(["JavaScript", "React"])
+    assert arbol_jerarquico.calcular_afinidad_egresado_empleo(egresado, empleo) == int((240 + 210 + 50) * 1.1)
+
+
+def test_motor_vectorizado_reproduce_el_motor_por_arbol():
+    """El motor NumPy da exactamente los mismos scores y el mismo orden"""
+    pytest.importorskip("numpy")
+    motor = obtener_motor_vectorizado()
+    for egresado in egresados_data:
+        assert (ordenar_empleos_por_arbol(egresado, empleos_data, motor=motor)
+                == ordenar_empleos_por_arbol(egresado, empleos_data))
+
+
+def test_paginacion_equivale_a_recortar_el_ranking_completo():
+    """limit/offset con selección por heap devuelve el mismo tramo que ordenar todo"""
+    egresado = egresados_data[0]
+    completo = ordenar_empleos_por_arbol(egresado, empleos_data)
+    for limit, offset in [(1, 0), (3, 2), (5, 8), (20, 0)]:
+        pagina = ordenar_empleos_por_arbol(egresado, empleos_data, limit=limit, offset=offset)
+        assert pagina == completo[offset:offset + limit]
+
+
+def test_explicacion_suma_el_mismo_score():
+    """El desglose de ?explain=1 coincide con el score calculado sin explicación"""
+    for egresado in egresados_data:
+        for empleo in empleos_data:
+            explicacion = arbol_jerarquico.explicar_afinidad(egresado, empleo)
+            assert explicacion["score"] == arbol_jerarquico.calcular_afinidad_egresado_empleo(egresado, empleo)
+            assert explicacion["subtotal"] == (
+                (explicacion["rol"] or {}).get("puntos", 0)
+                + (explicacion["especializacion"] or {}).get("puntos", 0)
+                + sum(tech["puntos"] for tech in explicacion["tecnologias"])
+                + explicacion["bonificacion_tecnologias"])
+
+
+def test_repositorio_sqlite_equivale_al_de_memoria(tmp_path):
+    """Con SQLite se obtienen los mismos egresados, candidatos y ranking que en memoria"""
+    from tree_repositorio import RepositorioSQLite
+
+    sqlite = RepositorioSQLite(str(tmp_path / "datos.db"))
+    sqlite.importar(egresados_data, empleos_data)
+    assert sqlite.contar_empleos() == len(empleos_data) and sqlite.version == 1
+    assert sqlite.obtener_egresado("124").to_dict() == repositorio.obtener_egresado("124").to_dict()
+    assert sqlite.obtener_egresado("no-existe") is None
+    with pytest.raises(KeyError):
+        sqlite.agregar_empleo(empleos_data[0])
+
+    for egresado in egresados_data:
+        assert ([e.to_dict() for e in sqlite.candidatos(egresado)]
+                == [e.to_dict() for e in repositorio.candidatos(egresado)])
+        assert (ordenar_empleos_por_arbol(egresado, (), indice=sqlite)
+                == ordenar_empleos_por_arbol(egresado, empleos_data))
+
+    # Mayúsculas fuera de ASCII: COLLATE NOCASE de SQLite no igualaría "DISEÑO" con "Diseño"
+    from tree_repositorio import RepositorioMemoria
+    empleo = Empleo(900, "Diseñador", "Diseño de interfaces", "DISEÑO ÁGIL", 1, "Cali",
+                    "ÁREA DE DISEÑO", "ESPECIALIZACIÓN", ["ÑANDÚ"], 1)
+    memoria = RepositorioMemoria(empleos=[empleo])
+    sqlite = RepositorioSQLite(str(tmp_path / "no_ascii.db"))
+    sqlite.importar(empleos=[empleo])
+    # Cada egresado coincide solo por rol, solo por especialización o solo por tecnología
+    for buscado in (Egresado("901", "901", "Eva", "", "", "Área de diseño", None, []),
+                    Egresado("902", "902", "Eva", "", "", None, "Especialización", []),
+                    Egresado("903", "903", "Eva", "", "", None, None, ["ñandú"])):
+        assert [e.id for e in sqlite.candidatos(buscado)] == [e.id for e in memoria.candidatos(buscado)] == [900]
+    assert ([e.id for e in sqlite.empleos_por_perfil("Diseño ágil")]
+            == [e.id for e in memoria.empleos_por_perfil("Diseño ágil")] == [900])
+
+
+def test_importacion_csv_valida_tecnologias_y_duplicados(tmp_path):
+    """Las filas con tecnologías fuera del árbol o ids repetidos se rechazan sin detener el lote"""
+    from tree_importar import importar_archivo, validar_empleo
+    from tree_repositorio import RepositorioSQLite
+
+    ruta = tmp_path / "empleos.csv"
+    ruta.write_text(
+        "id,titulo,rol_requerido,especializacion_requerida,tecnologias_requeridas,prioridad_rol,salario\n"
+        "500,Backend Python,Development Team,Backend,Python|Django,1,4000000\n"
+        "501,Backend Cobol,Development Team,Backend,Cobol,2,3000000\n"
+        "500,Repetido,Development Team,Backend,Python,1,1\n"
+        "502,Tester,QA Tester,,Selenium,x,1\n"
+        "503,Frontend,Development Team,Frontend,React,2,\n",
+        encoding="utf-8")
+
+    sqlite = RepositorioSQLite(str(tmp_path / "datos.db"))
+    errores = tmp_path / "errores.txt"
+    with open(errores, "w", encoding="utf-8") as salida:
+        resultado = importar_archivo(str(ruta), validar_empleo, lambda lote: sqlite.importar(empleos=lote),
+                                     arbol_jerarquico, tamano_lote=2, salida_errores=salida)
+
+    assert (resultado.importados, resultado.rechazados) == (2, 3)
+    assert [e.id for e in sqlite.empleos()] == [500, 503]
+    assert sqlite.obtener_empleo(500).tecnologias_requeridas == ["Python", "Django"]
+    assert ":3: Tecnologías que no existen en el árbol: Cobol" in errores.read_text(encoding="utf-8")
+
+
+def test_administracion_de_empleos_incremental():
+    """POST/PUT/DELETE /empleos se reflejan en el siguiente /trabajos sin reconstruir índices"""
+    import tree_backend
+
+    cliente = tree_backend.app.test_client()
+    tree_backend.app.config["ADMIN_TOKEN"] = "admin-prueba"
+    admin = {"Authorization": "Bearer admin-prueba"}
+    egresado = repositorio.obtener_egresado("123")
+    token = cliente.post("/login", json={"cedula": "123", "ficha": egresado.ficha}).get_json()["token"]
+
+    def ids_trabajos():
+        respuesta = cliente.get("/trabajos", headers={"Authorization": f"Bearer {token}"}).get_json()
+        return [trabajo["id"] for trabajo in respuesta["trabajos"]]
+
+    nuevo = {"id": 9001, "titulo": "Fullstack", "rol_requerido": "Development Team",
+             "especializacion_requerida": "Fullstack", "tecnologias_requeridas": ["React", "Node.js"],
+             "prioridad_rol": 1}
+    try:
+        assert cliente.post("/empleos", json=nuevo).status_code == 403
+        assert cliente.post("/empleos", json=dict(nuevo, tecnologias_requeridas=["Cobol"]),
+                            headers=admin).status_code == 400
+        antes = ids_trabajos()
+        assert cliente.post("/empleos", json=nuevo, headers=admin).status_code == 201
+        assert cliente.post("/empleos", json=nuevo, headers=admin).status_code == 409
+        assert 9001 in ids_trabajos()
+
+        cambio = dict(nuevo, rol_requerido="UX/UI Designer", especializacion_requerida="",
+                      tecnologias_requeridas=["Figma"])
+        assert cliente.put("/empleos/9001", json=cambio, headers=admin).status_code == 200
+        assert 9001 not in ids_trabajos()
+        assert repositorio.candidatos(Egresado("x", "x", "", "", "", "", "", ["Figma"]))[-1].id == 9001
+    finally:
+        cliente.delete("/empleos/9001", headers=admin)
+        tree_backend.app.config["ADMIN_TOKEN"] = None
+
+    assert cliente.delete("/empleos/9001", headers=admin).status_code == 403
+    assert ids_trabajos() == antes
+    assert repositorio.obtener_empleo(9001) is None
+
+
+def test_trabajos_puntua_desde_los_claims_del_token():
+    """El token lleva el perfil codificado; si el perfil cambia se vuelve a buscar al egresado"""
+    import jwt
+    import tree_backend
+
+    cliente = tree_backend.app.test_client()
+    original = repositorio.obtener_egresado("123")
+    token = cliente.post("/login", json={"cedula": "123", "ficha": original.ficha}).get_json()["token"]
+    claims = jwt.decode(token, options={"verify_signature": False})
+    assert "perfil" not in claims and claims["sub"] == "123"
+    assert int(claims["t"], 16) == arbol_jerarquico.codificar_tecnologias(original.tecnologias)
+
+    def trabajos():
+        return cliente.get("/trabajos", headers={"Authorization": f"Bearer {token}"}).get_json()
+
+    esperado = [t["id"] for t in ordenar_empleos_por_arbol(original, repositorio.empleos())]
+    assert [t["id"] for t in trabajos()["trabajos"]] == esperado
+
+    cambiado = Egresado("123", original.ficha, original.nombre, original.red, original.perfil,
+                        "UX/UI Designer", "Prototipado", ["Figma"])
+    repositorio.actualizar_egresado(cambiado)
+    try:
+        respuesta = trabajos()
+        assert respuesta["egresado"]["rol_principal"] == "UX/UI Designer"
+        assert [t["id"] for t in respuesta["trabajos"]] == [
+            t["id"] for t in ordenar_empleos_por_arbol(cambiado, repositorio.empleos())]
+    finally:
+        repositorio.actualizar_egresado(original)
+
+
+def test_logout_revoca_el_token():
+    """Tras POST /logout el mismo token se rechaza aunque siga en la caché de tokens verificados"""
+    import tree_backend
+
+    cliente = tree_backend.app.test_client()
+    egresado = repositorio.obtener_egresado("125")
+    token = cliente.post("/login", json={"cedula": "125", "ficha": egresado.ficha}).get_json()["token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    assert cliente.get("/trabajos?limit=1", headers=auth).status_code == 200
+    assert cliente.post("/logout", headers=auth).status_code == 200
+    assert cliente.get("/trabajos?limit=1", headers=auth).status_code == 401
+    assert cliente.post("/logout", headers=auth).status_code == 401
+
+
+def test_trabajos_conserva_las_claves_de_la_respuesta():
+    """El bloque "egresado" mantiene red y perfil aunque el perfil llegue en el token"""
+    import tree_backend
+
+    cliente = tree_backend.app.test_client()
+    egresado = repositorio.obtener_egresado("123")
+    token = cliente.post("/login", json={"cedula": "123", "ficha": egresado.ficha}).get_json()["token"]
+    respuesta = cliente.get("/trabajos?limit=1", headers={"Authorization": f"Bearer {token}"}).get_json()
+
+    assert set(respuesta) == {"total", "limit", "offset", "egresado", "algoritmo", "motor", "descripcion",
+                              "criterios_ordenamiento", "trabajos"}
+    assert respuesta["egresado"] == {
+        "red": egresado.red, "perfil": egresado.perfil, "cedula": "123",
+        "rol_principal": egresado.rol_principal, "especializacion": egresado.especializacion,
+        "version_perfil": egresado.version_perfil}
+
+
+def test_version_del_arbol_es_la_huella_de_su_estructura():
+    """Otra taxonomía cambia la versión del árbol y los tokens emitidos con ella no se usan"""
+    from tree_backend import ArbolJerarquico, NodoArbol, egresado_desde_token
+
+    assert ArbolJerarquico().version == arbol_jerarquico.version
+    otro = ArbolJerarquico()
+    otro.obtener_nodo("Frontend").agregar_hijo(NodoArbol("Vue", peso=7))
+    otro._indexar_nodos()
+    assert otro.version != arbol_jerarquico.version
+
+    perfil = otro.codificar_egresado(repositorio.obtener_egresado("123"))
+    claims = {"sub": "123", "pv": 0, "av": otro.version, "r": perfil.rol, "e": perfil.especializacion,
+              "t": format(perfil.tecnologias, "x")}
+    assert egresado_desde_token(claims) is None
+    assert egresado_desde_token({**claims, "av": arbol_jerarquico.version}) is not None
+
+
+def test_etag_responde_304_hasta_que_cambia_el_perfil():
+    """If-None-Match con el ETag vigente da 304; un cambio de perfil genera otro ETag"""
+    import tree_backend
+
+    cliente = tree_backend.app.test_client()
+    etag = cliente.get("/arbol-info").headers["ETag"]
+    assert cliente.get("/arbol-info", headers={"If-None-Match": etag}).status_code == 304
+
+    egresado = repositorio.obtener_egresado("124")
+    token = cliente.post("/login", json={"cedula": "124", "ficha": egresado.ficha}).get_json()["token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    etag = cliente.get("/trabajos?limit=5", headers=auth).headers["ETag"]
+    assert cliente.get("/trabajos?limit=5", headers=dict(auth, **{"If-None-Match": etag})).status_code == 304
+    assert cliente.get("/trabajos?limit=6", headers=dict(auth, **{"If-None-Match": etag})).status_code == 200
+
+    repositorio.actualizar_egresado(egresado)
+    respuesta = cliente.get("/trabajos?limit=5", headers=dict(auth, **{"If-None-Match": etag}))
+    assert respuesta.status_code == 200 and respuesta.headers["ETag"] != etag
+
+
+def test_instantanea_del_repositorio_y_huella_del_arbol(tmp_path):
+    """La instantánea reproduce el repositorio y se descarta si el árbol cambia"""
+    from tree_arranque import cargar_instantanea, guardar_instantanea, preparar_repositorio
+    from tree_backend import ArbolJerarquico
+    from tree_repositorio import RepositorioMemoria
+
+    ruta = str(tmp_path / "datos.pkl")
+    guardar_instantanea(preparar_repositorio(RepositorioMemoria(egresados_data, empleos_data), arbol_jerarquico),
+                        arbol_jerarquico, ruta)
+    cargado = cargar_instantanea(ruta, arbol_jerarquico)
+    cargado.catalogo.registrar(arbol_jerarquico)
+    egresado = cargado.obtener_egresado("123")
+    assert ([e["id"] for e in ordenar_empleos_por_arbol(egresado, (), indice=cargado)] ==
+            [e["id"] for e in ordenar_empleos_por_arbol(egresado, empleos_data)])
+
+    otro = ArbolJerarquico()
+    otro.nodos[-1].peso += 1
+    assert cargar_instantanea(ruta, otro) is None
+    assert cargar_instantanea(str(tmp_path / "no-existe.pkl"), arbol_jerarquico) is None
+
+
+def test_puntos_de_entrada_no_construyen_datos_al_importar():
+    """Importar cualquier punto de entrada no carga PyJWT, los datos ni el hilo del registro"""
+    from tree_arranque import PUNTOS_DE_ENTRADA, reporte_importacion
+
+    for punto in ("tree_backend", "api", "index", "main"):
+        reporte = reporte_importacion(punto, codigo=PUNTOS_DE_ENTRADA[punto])
+        assert reporte["cargados_al_importar"] == [], punto
+
+
+def test_benchmark_de_arranque_atiende_health_y_trabajos():
+    """El arranque en frío medido en un proceso nuevo responde /health y /trabajos y desglosa la importación"""
+    from tree_arranque import medir_arranque
+
+    resultado = medir_arranque("tree_backend", repeticiones=1)
+
+    assert "error" not in resultado
+    assert resultado["health"]["status"] == 200 and resultado["trabajos"]["status"] == 200
+    assert resultado["app_ms"] <= resultado["health"]["ms"] <= resultado["trabajos"]["ms"]
+    assert resultado["importacion"]["total_ms"] > 0
+    assert any(fila["modulo"] == "flask" for fila in resultado["importacion"]["mas_costosos"])
+
+
+def test_micro_benchmarks_de_scoring():
+    """Los micro-benchmarks cubren cada función de scoring y devuelven el árbol del backend a su lugar"""
+    import tree_backend
+    from tree_benchmark import ArbolSintetico, ejecutar
+
+    assert len(ArbolSintetico(60).nodos) == 60
+    resultados = ejecutar(catalogos=(40,), arboles=(60,), repeticiones=1)
+
+    funciones = {resultado["funcion"] for resultado in resultados}
+    assert {"calcular_afinidad_egresado_empleo", "ordenar_empleos_por_arbol", "buscar_nodo",
+            "calcular_score_por_palabras_clave[app]", "calcular_score_por_palabras_clave[index]"} <= funciones
+    assert all(resultado["ops_s"] > 0 for resultado in resultados)
+    assert tree_backend.arbol_jerarquico is arbol_jerarquico
+
+
+def test_datos_sinteticos_siguen_el_arbol_y_son_reproducibles():
+    """Con la misma semilla se generan los mismos empleos, todos con rol, especialización y tecnologías del árbol"""
+    from tree_sintetico import GeneradorSintetico, poblar
+
+    generador = GeneradorSintetico(arbol_jerarquico, semilla=3)
+    empleos = list(generador.empleos(200))
+    otra_vez = GeneradorSintetico(arbol_jerarquico, semilla=3).empleos(200)
+    assert [e.to_dict() for e in empleos] == [e.to_dict() for e in otra_vez]
+    for empleo in empleos:
+        especializacion = arbol_jerarquico.obtener_nodo(empleo.especializacion_requerida)
+        assert especializacion.obtener_ruta_completa()[1] == empleo.rol_requerido
+        for tech in empleo.tecnologias_requeridas:
+            assert arbol_jerarquico.obtener_nodo(tech) is not None
+        assert empleo.prioridad_rol in (1, 2, 3) and empleo.salario > 0
+
+    egresados = list(egresados_data)
+    catalogo = list(empleos_data)
+    assert poblar(5, 7, arbol=arbol_jerarquico, egresados=egresados, empleos=catalogo) == (5, 7)
+    assert len({e.cedula for e in egresados}) == len(egresados)
+    assert len({e.id for e in catalogo}) == len(catalogo)
+    assert ordenar_empleos_por_arbol(egresados[-1], catalogo)
+
+
+def test_ranking_offline_envia_una_ventana_acotada_de_tareas():
+    """mapear_acotado no genera más de `en_vuelo` tareas por delante de los resultados entregados"""
+    from concurrent.futures import ThreadPoolExecutor
+    from ranking_offline import mapear_acotado
+
+    generadas = []
+
+    def tareas():
+        for i in range(50):
+            generadas.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        resultados = []
+        for resultado in mapear_acotado(pool, lambda x: x * x, tareas(), en_vuelo=4):
+            assert len(generadas) <= len(resultados) + 1 + 4
+            resultados.append(resultado)
+    assert resultados == [i * i for i in range(50)]
@@ -0,0 +1,327 @@
+"""
+Arranque en frío del backend: instantáneas de datos y reporte de importación
+
+En Vercel cada arranque en frío importa el módulo de entrada y construye los
+datos antes de atender la primera petición. Los puntos de entrada difieren
+esa construcción a la primera petición que la usa (/health no la necesita):
+tree_backend.py el repositorio, app/models.py (app, api.py e index.py) el
+catálogo y sus índices, main.py sus listas; PyJWT y el hilo del registro
+también esperan a la primera petición que los usa. Este módulo agrega:
+
+- Instantáneas: el repositorio en memoria ya preparado (empleos y perfiles
+  codificados en el árbol, JSON de cada empleo, índices) guardado con
+  pickle. Con INSTANTANEA=ruta.pkl tree_backend lo carga en lugar de
+  construirlo. La instantánea guarda una huella del árbol y se descarta si
+  el árbol cambió. Solo se deben cargar instantáneas propias (pickle
+  ejecuta código al cargar).
+- Reporte de importación: cuánto tarda cada punto de entrada en importarse
+  (python -X importtime en un intérprete nuevo), qué módulos pesan más y
+  qué trabajo diferible se hizo igual al importar (DIFERIDOS).
+- Benchmark de arranque: por cada punto de entrada, intérpretes nuevos que
+  crean la app y atienden /health, /login y /trabajos (con el cliente de
+  prueba de Flask, sin red). Mide el tiempo de reloj desde que se lanza el
+  proceso hasta cada respuesta y el RSS máximo, y agrega el reporte de
+  importación. Emite JSON para comparar versiones.
+
+Uso:
+    python tree_arranque.py instantanea datos.pkl
+    python tree_arranque.py reporte tree_backend app api index main
+    python tree_arranque.py benchmark --repeticiones 5 --etiqueta v1.4 --salida arranque.json
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORIO)
+
+FORMATO_INSTANTANEA = 1
+MARCA_INICIO = "-- inicio del punto de entrada --"
+
+# Código que deja la app WSGI de cada punto de entrada en la variable `app`
+PUNTOS_DE_ENTRADA = {
+    "tree_backend": "from tree_backend import app",
+    "app": "from app import create_app; app = create_app()",
+    "api": "from api import app",
+    "index": "from index import app",
+    "main": "from main import app",
+}
+
+# Lo que ningún punto de entrada debe cargar al importarse: módulos, datos
+# (módulo, variable que queda en None hasta construirlos) e hilos
+MODULOS_DIFERIDOS = ("jwt", "numpy", "tree_importar")
+DATOS_DIFERIDOS = (("tree_backend", "_repositorio"), ("app.models", "_modelos"), ("main", "_datos"))
+
+# Se ejecuta tras el código del punto de entrada; imprime lo que ya se cargó
+_SCRIPT_DIFERIDOS = f"""
+import json as _json, sys as _sys, threading as _threading
+_cargados = [_m for _m in {MODULOS_DIFERIDOS!r} if _m in _sys.modules]
+_cargados += [_m + "." + _v for _m, _v in {DATOS_DIFERIDOS!r}
+              if getattr(_sys.modules.get(_m), _v, None) is not None]
+_cargados += ["hilo " + _h.name for _h in _threading.enumerate() if _h is not _threading.main_thread()]
+print(_json.dumps(_cargados))
+"""
+
+# Egresado de los datos de ejemplo con el que se pide /trabajos (existe en todos los puntos)
+CREDENCIALES_BENCHMARK = {"cedula": "123", "ficha": "456"}
+
+# Se ejecuta en un intérprete nuevo: argv = inicio (time.time() del padre), código, cédula, ficha
+_SCRIPT_MEDICION = """
+import json
+import sys
+import time
+
+inicio = float(sys.argv[1])
+
+
+def transcurrido():
+    return round((time.time() - inicio) * 1000, 1)
+
+
+espacio = {}
+exec(sys.argv[2], espacio)
+resultado = {"app_ms": transcurrido()}
+cliente = espacio["app"].test_client()
+
+respuesta = cliente.get("/health")
+resultado["health"] = {"status": respuesta.status_code, "ms": transcurrido()}
+respuesta = cliente.post("/login", json={"cedula": sys.argv[3], "ficha": sys.argv[4]})
+resultado["login"] = {"status": respuesta.status_code, "ms": transcurrido()}
+token = (respuesta.get_json(silent=True) or {}).get("token")
+respuesta = cliente.get("/trabajos", headers={"Authorization": f"Bearer {token}"})
+resultado["trabajos"] = {"status": respuesta.status_code, "ms": transcurrido()}
+
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    resultado["rss_max_kb"] = rss // 1024 if sys.platform == "darwin" else rss
+except ImportError:  # Windows
+    resultado["rss_max_kb"] = None
+print(json.dumps(resultado))
+"""
+
+
+def huella_arbol(arbol):
+    """Huella de la estructura actual del árbol (ver ArbolJerarquico.calcular_huella)"""
+    return arbol.calcular_huella()
+
+
+def preparar_repositorio(repositorio, arbol):
+    """
+    Precalcula lo derivado de los datos en memoria: JSON de cada empleo y
+    codificación de empleos y perfiles en el árbol. El árbol no queda
+    registrado en el catálogo (se registra al cargar, con el árbol del proceso).
+    """
+    if repositorio.catalogo is None:
+        return repositorio  # SQLite: los datos ya persisten en la base
+    from app.serializacion import FragmentosEmpleos
+
+    repositorio.catalogo.registrar(FragmentosEmpleos())
+    for empleo in repositorio.catalogo:
+        arbol.codificar_empleo(empleo)
+    for egresado in repositorio.egresados():
+        arbol.codificar_egresado(egresado)
+    return repositorio
+
+
+def guardar_instantanea(repositorio, arbol, ruta):
+    """Guarda el repositorio en memoria ya preparado con preparar_repositorio"""
+    if repositorio.catalogo is None:
+        raise ValueError("Solo el repositorio en memoria admite instantáneas")
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        pickle.dump({"formato": FORMATO_INSTANTANEA, "huella_arbol": huella_arbol(arbol),
+                     "repositorio": repositorio}, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+
+
+def cargar_instantanea(ruta, arbol):
+    """
+    Repositorio guardado en la instantánea, o None si no existe, no se puede
+    leer o se generó con otro formato u otro árbol (hay que construirlo).
+    """
+    from app.registro import registrar_evento
+
+    try:
+        with open(ruta, "rb") as archivo:
+            datos = pickle.load(archivo)
+    except FileNotFoundError:
+        registrar_evento("arranque.instantanea_ausente", ruta=ruta)
+        return None
+    except Exception as e:
+        registrar_evento("arranque.instantanea_invalida", ruta=ruta, error=str(e))
+        return None
+
+    if not isinstance(datos, dict) or datos.get("formato") != FORMATO_INSTANTANEA:
+        registrar_evento("arranque.instantanea_invalida", ruta=ruta, error="Formato desconocido")
+        return None
+    if datos.get("huella_arbol") != huella_arbol(arbol):
+        registrar_evento("arranque.instantanea_invalida", ruta=ruta, error="El árbol cambió")
+        return None
+    return datos["repositorio"]
+
+
+def _leer_importtime(salida):
+    """Filas (profundidad, módulo, propio µs, acumulado µs) de la salida de -X importtime"""
+    filas = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        profundidad = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+        filas.append((profundidad, nombre.strip(), int(propio), int(acumulado)))
+    return filas
+
+
+def _entorno():
+    return dict(os.environ, LOG_NIVEL=os.environ.get("LOG_NIVEL", "ERROR"))
+
+
+def reporte_importacion(modulo, mas_costosos=10, python=sys.executable, codigo=None):
+    """
+    Ejecuta `codigo` (por defecto `import modulo`) en un intérprete nuevo con -X importtime.
+
+    Solo cuentan las importaciones hechas por `codigo`, no las del arranque
+    del intérprete.
+
+    Returns:
+        dict: total_ms de las importaciones, los `mas_costosos` módulos
+            importados directamente (si `codigo` importa un solo módulo, los
+            que importa ese módulo), por tiempo acumulado, y en
+            cargados_al_importar lo de MODULOS_DIFERIDOS, DATOS_DIFERIDOS e
+            hilos que ya se cargó
+    """
+    codigo = codigo or f"import {modulo}"
+    script = f"import sys; sys.stderr.write({MARCA_INICIO!r} + '\\n'); {codigo}\n{_SCRIPT_DIFERIDOS}"
+    proceso = subprocess.run([python, "-X", "importtime", "-c", script],
+                             cwd=DIRECTORIO, env=_entorno(), capture_output=True, text=True)
+    if proceso.returncode != 0:
+        return {"modulo": modulo, "error": proceso.stderr.strip().splitlines()[-1:]}
+
+    filas = _leer_importtime(proceso.stderr.split(MARCA_INICIO)[-1])
+    superiores = [fila for fila in filas if fila[0] == 0]
+    total = sum(acumulado for _, _, _, acumulado in superiores)
+    nivel = 1 if len(superiores) == 1 else 0
+    directos = sorted(((nombre, acumulado) for profundidad, nombre, _, acumulado in filas
+                       if profundidad == nivel), key=lambda fila: -fila[1])
+    return {
+        "modulo": modulo,
+        "total_ms": round(total / 1000, 1),
+        "mas_costosos": [{"modulo": nombre, "ms": round(acumulado / 1000, 1)}
+                         for nombre, acumulado in directos[:mas_costosos]],
+        "cargados_al_importar": json.loads(proceso.stdout.strip().splitlines()[-1])
+    }
+
+
+def medir_arranque(punto, repeticiones=3, python=sys.executable, mas_costosos=8):
+    """
+    Arranque en frío de un punto de entrada (ver PUNTOS_DE_ENTRADA).
+
+    Cada repetición es un intérprete nuevo. Los tiempos se miden desde que se
+    lanza el proceso (incluyen el arranque de Python) hasta que la app está
+    creada (app_ms) y hasta cada respuesta; un punto sin /health responde 404
+    y se informa igual.
+
+    Returns:
+        dict: mediana de cada medida, las corridas y el reporte de importación
+    """
+    codigo = PUNTOS_DE_ENTRADA[punto]
+    corridas = []
+    for _ in range(repeticiones):
+        inicio = time.time()
+        proceso = subprocess.run(
+            [python, "-c", _SCRIPT_MEDICION, repr(inicio), codigo,
+             CREDENCIALES_BENCHMARK["cedula"], CREDENCIALES_BENCHMARK["ficha"]],
+            cwd=DIRECTORIO, env=_entorno(), capture_output=True, text=True)
+        if proceso.returncode != 0:
+            return {"punto": punto, "error": proceso.stderr.strip().splitlines()[-1:]}
+        corridas.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+
+    def mediana(valores):
+        valores = [valor for valor in valores if valor is not None]
+        return round(statistics.median(valores), 1) if valores else None
+
+    return {
+        "punto": punto,
+        "app_ms": mediana(corrida["app_ms"] for corrida in corridas),
+        **{ruta: {"status": corridas[-1][ruta]["status"],
+                  "ms": mediana(corrida[ruta]["ms"] for corrida in corridas)}
+           for ruta in ("health", "login", "trabajos")},
+        "rss_max_kb": mediana(corrida["rss_max_kb"] for corrida in corridas),
+        "corridas": corridas,
+        "importacion": reporte_importacion(punto, mas_costosos, python, codigo)
+    }
+
+
+def benchmark_arranque(puntos=None, repeticiones=3, python=sys.executable, etiqueta=None):
+    """Resultado de medir_arranque para cada punto de entrada, con datos del entorno"""
+    return {
+        "etiqueta": etiqueta,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticiones": repeticiones,
+        "puntos": [medir_arranque(punto, repeticiones, python) for punto in (puntos or PUNTOS_DE_ENTRADA)]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Instantáneas de datos y reporte de importación")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    instantanea = subcomandos.add_parser("instantanea", help="Guarda el repositorio en memoria preparado")
+    instantanea.add_argument("ruta")
+    reporte = subcomandos.add_parser("reporte", help="Tiempo de importación de cada punto de entrada")
+    reporte.add_argument("modulos", nargs="*", default=tuple(PUNTOS_DE_ENTRADA))
+    reporte.add_argument("--top", type=int, default=8, help="Módulos más costosos a mostrar")
+    benchmark = subcomandos.add_parser("benchmark", help="Arranque en frío hasta /health y /trabajos (JSON)")
+    benchmark.add_argument("puntos", nargs="*", metavar="punto",
+                           help=f"Puntos de entrada (por defecto todos: {', '.join(PUNTOS_DE_ENTRADA)})")
+    benchmark.add_argument("--repeticiones", type=int, default=3)
+    benchmark.add_argument("--etiqueta", help="Versión o commit medido")
+    benchmark.add_argument("--salida", help="Archivo JSON (por defecto la salida estándar)")
+    args = parser.parse_args(argv)
+
+    if args.comando == "instantanea":
+        from tree_backend import arbol_jerarquico
+        from tree_repositorio import crear_repositorio
+
+        repositorio = preparar_repositorio(crear_repositorio("memoria"), arbol_jerarquico)
+        guardar_instantanea(repositorio, arbol_jerarquico, args.ruta)
+        print(f"{args.ruta}: {repositorio.contar_egresados()} egresados, "
+              f"{repositorio.contar_empleos()} empleos", file=sys.stderr)
+        return 0
+
+    if args.comando == "benchmark":
+        desconocidos = [punto for punto in args.puntos if punto not in PUNTOS_DE_ENTRADA]
+        if desconocidos:
+            parser.error(f"Puntos de entrada desconocidos: {', '.join(desconocidos)}")
+        resultado = benchmark_arranque(args.puntos, args.repeticiones, etiqueta=args.etiqueta)
+        texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as archivo:
+                archivo.write(texto + "\n")
+        else:
+            print(texto)
+        return 0 if all("error" not in punto for punto in resultado["puntos"]) else 1
+
+    for modulo in args.modulos:
+        resultado = reporte_importacion(modulo, args.top, codigo=PUNTOS_DE_ENTRADA.get(modulo))
+        if "error" in resultado:
+            print(f"{modulo}: error {' '.join(resultado['error'])}")
+            continue
+        print(f"{modulo}: {resultado['total_ms']} ms")
+        if resultado["cargados_al_importar"]:
+            print(f"    cargado al importar: {', '.join(resultado['cargados_al_importar'])}")
+        for fila in resultado["mas_costosos"]:
+            print(f"    {fila['ms']:>8.1f} ms  {fila['modulo']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
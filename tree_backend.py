@@ -3,16 +3,37 @@ PilAPE API - Versión con ordenamiento por árbol jerárquico
 Sistema de matching de empleos para egresados usando estructura de árbol
 """
 import os
-import jwt
+import hashlib
+import hmac
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 import logging
+import threading
+import time
+from collections import namedtuple
 
 # =============================================
 # CONFIGURACIÓN
 # =============================================
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'desarrollo_secret_key_cambiar_en_produccion')
+# Token para administrar empleos (POST/PUT/DELETE /empleos); sin él esas rutas responden 403
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+
+# Registro asíncrono en JSON con muestreo por evento (ver app/registro.py); el
+# hilo del registro arranca con el primer evento, no al importar
+from app.registro import registrar_evento
+
+# JSON con orjson si está instalado; empleos codificados una vez (ver app/serializacion.py)
+from app.serializacion import arreglo_empleos, configurar_json, respuesta_json
+configurar_json(app)
+
+# ETag / If-None-Match (ver app/condicional.py). /arbol-info solo cambia con el
+# árbol, así que un CDN delante de Vercel puede servirla sin llegar a la función.
+from app.condicional import CACHE_PRIVADA, con_validadores, etag_de, no_modificada
+from app.compresion import instalar_compresion
+app.config['CACHE_CONTROL_ARBOL'] = os.environ.get(
+    'CACHE_CONTROL_ARBOL', 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=86400')
 
 # =============================================
 # MODELOS DE DATOS
@@ -58,6 +79,16 @@ class Empleo:
             "prioridad_rol": self.prioridad_rol
         }
 
+# Perfil del egresado y empleo reducidos a ids de nodo y máscara de tecnologías
+PerfilCodificado = namedtuple("PerfilCodificado", ["rol", "especializacion", "tecnologias"])
+EmpleoCodificado = namedtuple("EmpleoCodificado", ["rol", "especializacion", "tecnologias", "prioridad"])
+
+if hasattr(int, "bit_count"):
+    _contar_bits = int.bit_count
+else:  # Python < 3.10
+    def _contar_bits(mascara):
+        return bin(mascara).count("1")
+
 class NodoArbol:
     """
     Nodo del árbol jerárquico para ordenamiento de empleos.
@@ -135,6 +166,7 @@ class ArbolJerarquico:
     def __init__(self):
         self.raiz = NodoArbol("Software Development", peso=10)
         self._construir_arbol()
+        self._indexar_nodos()
     
     def _construir_arbol(self):
         """Construye la estructura completa del árbol jerárquico"""
@@ -239,10 +271,66 @@ class ArbolJerarquico:
             metodo_node = NodoArbol(metodo, peso=6)
             investigacion_ux.agregar_hijo(metodo_node)
     
+    def _indexar_nodos(self):
+        """
+        Construye los índices hash del árbol (nombre -> nodo, nombre -> id).
+        
+        Los nodos se recorren en preorden, igual que la búsqueda recursiva,
+        de modo que si dos nodos comparten nombre gana el primero encontrado.
+        El id de cada nodo es su posición en ese recorrido.
+        """
+        self._nodos_por_nombre = {}
+        self._ids_por_nombre = {}
+        self.nodos = []
+        pendientes = [self.raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            nombre = nodo.valor.lower()
+            if nombre not in self._nodos_por_nombre:
+                self._nodos_por_nombre[nombre] = nodo
+                self._ids_por_nombre[nombre] = len(self.nodos)
+            self.nodos.append(nodo)
+            # Hijos en orden inverso para que salgan en orden de izquierda a derecha
+            pendientes.extend(reversed(nodo.hijos))
+        
+        # Tabla de pesos por id y máscaras de bits agrupadas por peso
+        self.pesos_nodos = [nodo.peso for nodo in self.nodos]
+        mascaras = {}
+        for id_nodo, nodo in enumerate(self.nodos):
+            if self._ids_por_nombre[nodo.valor.lower()] == id_nodo:
+                mascaras[nodo.peso] = mascaras.get(nodo.peso, 0) | (1 << id_nodo)
+        self._mascaras_por_peso = sorted(mascaras.items(), reverse=True)
+        
+        # La versión es la huella de la estructura: cambia en cada despliegue que
+        # modifique la taxonomía (y con ella los ids de nodo de tokens y codificaciones)
+        self.version = self.calcular_huella()
+    
+    def calcular_huella(self):
+        """Huella de la estructura actual (valor, peso y padre de cada nodo, en orden de id)"""
+        ids = {id(nodo): i for i, nodo in enumerate(self.nodos)}
+        estructura = [(nodo.valor, nodo.peso, ids.get(id(nodo.padre))) for nodo in self.nodos]
+        return hashlib.sha256(repr(estructura).encode()).hexdigest()[:16]
+    
+    def obtener_nodo(self, valor):
+        """Devuelve el nodo con ese nombre (sin distinguir mayúsculas) en O(1), o None"""
+        if not valor:
+            return None
+        return self._nodos_por_nombre.get(valor.lower())
+    
+    def obtener_id_nodo(self, valor):
+        """Devuelve el id (posición en preorden) del nodo con ese nombre, o None"""
+        if not valor:
+            return None
+        return self._ids_por_nombre.get(valor.lower())
+    
     def buscar_nodo(self, valor, nodo_inicio=None):
-        """Busca un nodo por su valor en el árbol"""
+        """
+        Busca un nodo por su valor en el árbol.
+        
+        Sin nodo_inicio usa el índice hash; con nodo_inicio recorre solo ese subárbol.
+        """
         if nodo_inicio is None:
-            nodo_inicio = self.raiz
+            return self.obtener_nodo(valor)
         
         if nodo_inicio.valor.lower() == valor.lower():
             return nodo_inicio
@@ -268,67 +356,176 @@ class ArbolJerarquico:
         Returns:
             int: Score de afinidad (0-1000)
         """
+        return self.afinidad_codificada(self.codificar_egresado(egresado),
+                                        self.codificar_empleo(empleo))
+    
+    # ===== CODIFICACIÓN COMPACTA DE PERFILES Y EMPLEOS =====
+    # Cada nodo tiene un bit en la posición de su id (las hojas son las
+    # tecnologías), así una lista de tecnologías se representa como un entero
+    # y el cruce de tecnologías es un AND binario en lugar de un doble bucle.
+    
+    def codificar_tecnologias(self, tecnologias):
+        """Convierte una lista de tecnologías en una máscara de bits (ignora las que no están en el árbol)"""
+        mascara = 0
+        for tech in tecnologias or []:
+            id_nodo = self._ids_por_nombre.get(tech.lower())
+            if id_nodo is not None:
+                mascara |= 1 << id_nodo
+        return mascara
+    
+    def decodificar_tecnologias(self, mascara):
+        """Nombres de las tecnologías de una máscara de bits (inversa de codificar_tecnologias)"""
+        tecnologias = []
+        while mascara:
+            bit = mascara & -mascara
+            tecnologias.append(self.nodos[bit.bit_length() - 1].valor)
+            mascara ^= bit
+        return tecnologias
+    
+    def codificar_egresado(self, egresado):
+        """
+        Devuelve el PerfilCodificado del egresado.
+        
+        La codificación se guarda en `egresado.codificacion` junto con la
+        versión del árbol y se reutiliza mientras el árbol no cambie.
+        """
+        guardada = getattr(egresado, "codificacion", None)
+        if guardada is not None and guardada[0] == self.version:
+            return guardada[1]
+        perfil = PerfilCodificado(
+            self.obtener_id_nodo(egresado.rol_principal),
+            self.obtener_id_nodo(egresado.especializacion),
+            self.codificar_tecnologias(egresado.tecnologias)
+        )
+        egresado.codificacion = (self.version, perfil)
+        return perfil
+    
+    def codificar_empleo(self, empleo):
+        """Devuelve el EmpleoCodificado del empleo (guardado en `empleo.codificacion`)"""
+        guardada = getattr(empleo, "codificacion", None)
+        if guardada is not None and guardada[0] == self.version:
+            return guardada[1]
+        codificado = EmpleoCodificado(
+            self.obtener_id_nodo(empleo.rol_requerido),
+            self.obtener_id_nodo(empleo.especializacion_requerida),
+            self.codificar_tecnologias(empleo.tecnologias_requeridas),
+            empleo.prioridad_rol
+        )
+        empleo.codificacion = (self.version, codificado)
+        return codificado
+    
+    def al_agregar(self, clave, empleo):
+        """Oyente del catálogo: codifica cada empleo al cargarlo"""
+        self.codificar_empleo(empleo)
+    
+    def al_actualizar(self, clave, anterior, empleo):
+        """Oyente del catálogo: codifica la nueva versión del empleo"""
+        self.codificar_empleo(empleo)
+    
+    def al_retirar(self, clave, empleo):
+        """Oyente del catálogo: un empleo retirado no tiene nada que liberar"""
+    
+    def afinidad_codificada(self, perfil, empleo):
+        """
+        Score de afinidad entre un PerfilCodificado y un EmpleoCodificado.
+        
+        Mismos pesos que calcular_afinidad_egresado_empleo: rol ×50,
+        especialización ×30, cada tecnología común ×15, bonificación +50/+100
+        por 2/3+ tecnologías, ajuste ×1.2/×1.1 por prioridad y máximo 1000.
+        """
         score_total = 0
         
         # ===== MATCHING POR ROL PRINCIPAL =====
-        # Si el rol del egresado coincide exactamente con el rol requerido del empleo
-        if egresado.rol_principal.lower() == empleo.rol_requerido.lower():
-            nodo_rol = self.buscar_nodo(egresado.rol_principal)
-            if nodo_rol:
-                # Bonificación alta por coincidencia exacta de rol
-                score_total += nodo_rol.peso * 50
-                logging.info(f"Coincidencia de rol: {egresado.rol_principal} = +{nodo_rol.peso * 50}")
+        if perfil.rol is not None and perfil.rol == empleo.rol:
+            score_total += self.pesos_nodos[perfil.rol] * 50
         
         # ===== MATCHING POR ESPECIALIZACIÓN =====
-        # Si la especialización del egresado coincide con la requerida
-        if (egresado.especializacion and empleo.especializacion_requerida and 
-            egresado.especializacion.lower() == empleo.especializacion_requerida.lower()):
-            nodo_esp = self.buscar_nodo(egresado.especializacion)
-            if nodo_esp:
-                # Bonificación media por especialización
-                score_total += nodo_esp.peso * 30
-                logging.info(f"Coincidencia de especialización: {egresado.especializacion} = +{nodo_esp.peso * 30}")
+        if perfil.especializacion is not None and perfil.especializacion == empleo.especializacion:
+            score_total += self.pesos_nodos[perfil.especializacion] * 30
         
         # ===== MATCHING POR TECNOLOGÍAS =====
-        # Calcula coincidencias entre tecnologías del egresado y las requeridas
-        tecnologias_egresado = [tech.lower() for tech in egresado.tecnologias] if egresado.tecnologias else []
-        tecnologias_empleo = [tech.lower() for tech in empleo.tecnologias_requeridas] if empleo.tecnologias_requeridas else []
-        
+        # Intersección de máscaras; la suma ponderada se hace por grupos de
+        # nodos con el mismo peso (popcount por grupo × peso × 15)
+        comunes = perfil.tecnologias & empleo.tecnologias
         coincidencias_tecnologicas = 0
-        for tech_egresado in tecnologias_egresado:
-            for tech_empleo in tecnologias_empleo:
-                if tech_egresado == tech_empleo:
-                    nodo_tech = self.buscar_nodo(tech_egresado)
-                    if nodo_tech:
-                        # Bonificación por cada tecnología coincidente
-                        score_total += nodo_tech.peso * 15
-                        coincidencias_tecnologicas += 1
-                        logging.info(f"Coincidencia tecnológica: {tech_egresado} = +{nodo_tech.peso * 15}")
+        if comunes:
+            coincidencias_tecnologicas = _contar_bits(comunes)
+            for peso, mascara in self._mascaras_por_peso:
+                score_total += _contar_bits(comunes & mascara) * peso * 15
         
         # ===== BONIFICACIONES POR MÚLTIPLES COINCIDENCIAS =====
-        # Bonificación extra si hay múltiples tecnologías en común
         if coincidencias_tecnologicas >= 3:
             score_total += 100  # Bonificación por dominio amplio
-            logging.info(f"Bonificación por múltiples tecnologías: +100")
         elif coincidencias_tecnologicas >= 2:
             score_total += 50   # Bonificación por buen dominio
-            logging.info(f"Bonificación por buen dominio tecnológico: +50")
         
         # ===== AJUSTE POR PRIORIDAD DEL ROL =====
-        # Los roles con alta prioridad en la empresa reciben ajuste positivo
-        if empleo.prioridad_rol == 1:  # Alta prioridad
+        if empleo.prioridad == 1:  # Alta prioridad
             score_total = int(score_total * 1.2)  # +20%
-            logging.info(f"Ajuste por alta prioridad: +20%")
-        elif empleo.prioridad_rol == 2:  # Media prioridad
+        elif empleo.prioridad == 2:  # Media prioridad
             score_total = int(score_total * 1.1)  # +10%
-            logging.info(f"Ajuste por prioridad media: +10%")
         # Prioridad 3 (baja) no recibe ajuste
         
         # ===== LIMITACIÓN DE SCORE MÁXIMO =====
-        score_final = min(score_total, 1000)  # Máximo 1000 puntos
+        return min(score_total, 1000)  # Máximo 1000 puntos
+    
+    def explicar_afinidad(self, egresado, empleo):
+        """
+        Desglose del score de afinidad entre un egresado y un empleo.
+        
+        Calcula lo mismo que afinidad_codificada pero devolviendo el aporte de
+        cada criterio. Es la alternativa a registrar cada coincidencia en el
+        log: solo se usa cuando se pide (?explain=1 en /trabajos).
         
-        logging.info(f"Score final para {empleo.titulo}: {score_final}")
-        return score_final
+        Returns:
+            dict: Aporte del rol, la especialización, cada tecnología, la
+                bonificación y la prioridad, junto con el score final
+        """
+        perfil = self.codificar_egresado(egresado)
+        codificado = self.codificar_empleo(empleo)
+        
+        explicacion = {"rol": None, "especializacion": None, "tecnologias": []}
+        subtotal = 0
+        
+        if perfil.rol is not None and perfil.rol == codificado.rol:
+            puntos = self.pesos_nodos[perfil.rol] * 50
+            explicacion["rol"] = {"valor": self.nodos[perfil.rol].valor,
+                                  "peso": self.pesos_nodos[perfil.rol], "puntos": puntos}
+            subtotal += puntos
+        
+        if perfil.especializacion is not None and perfil.especializacion == codificado.especializacion:
+            puntos = self.pesos_nodos[perfil.especializacion] * 30
+            explicacion["especializacion"] = {"valor": self.nodos[perfil.especializacion].valor,
+                                              "peso": self.pesos_nodos[perfil.especializacion],
+                                              "puntos": puntos}
+            subtotal += puntos
+        
+        comunes = perfil.tecnologias & codificado.tecnologias
+        while comunes:
+            bit = comunes & -comunes
+            id_nodo = bit.bit_length() - 1
+            puntos = self.pesos_nodos[id_nodo] * 15
+            explicacion["tecnologias"].append({"valor": self.nodos[id_nodo].valor,
+                                               "peso": self.pesos_nodos[id_nodo], "puntos": puntos})
+            subtotal += puntos
+            comunes ^= bit
+        
+        coincidencias = len(explicacion["tecnologias"])
+        bonificacion = 100 if coincidencias >= 3 else 50 if coincidencias >= 2 else 0
+        subtotal += bonificacion
+        
+        multiplicador = {1: 1.2, 2: 1.1}.get(codificado.prioridad, 1.0)
+        ajustado = int(subtotal * multiplicador) if multiplicador != 1.0 else subtotal
+        
+        explicacion.update({
+            "bonificacion_tecnologias": bonificacion,
+            "subtotal": subtotal,
+            "prioridad_rol": codificado.prioridad,
+            "multiplicador_prioridad": multiplicador,
+            "score_sin_limite": ajustado,
+            "score": min(ajustado, 1000)
+        })
+        return explicacion
 
 # =============================================
 # INSTANCIA GLOBAL DEL ÁRBOL
@@ -338,44 +535,244 @@ arbol_jerarquico = ArbolJerarquico()
 # =============================================
 # BASE DE DATOS - SOLO EMPLEOS DE SOFTWARE
 # =============================================
-# Importar los datos actualizados de software development
-from tree_models import egresados_data, empleos_data
+# Egresados y empleos salen del repositorio: en memoria (datos de tree_models.py,
+# por defecto) o SQLite con REPOSITORIO=sqlite:///ruta.db (ver tree_repositorio.py)
+from app.paginacion import leer_paginacion, seleccionar_pagina
+from app.cache import CacheRanking
+from app.tokens import CacheTokens
+from app.egresados import ficha_coincide
+import tree_vectorizado
+
+# El repositorio y sus estructuras derivadas se construyen en la primera
+# petición que los usa, no al importar (en Vercel cada arranque en frío paga
+# la importación y /health no necesita los datos). INICIALIZACION=inmediata
+# los construye al importar; INSTANTANEA=ruta.pkl los carga ya preparados
+# (ver tree_arranque.py).
+_repositorio = None
+_lock_repositorio = threading.Lock()
+
+def _construir_repositorio():
+    """Repositorio desde la instantánea (si hay una válida) o desde los datos, con sus índices"""
+    from tree_arranque import cargar_instantanea, preparar_repositorio
+    
+    repositorio = None
+    if os.environ.get('INSTANTANEA'):
+        repositorio = cargar_instantanea(os.environ['INSTANTANEA'], arbol_jerarquico)
+    if repositorio is None:
+        from tree_repositorio import crear_repositorio
+        repositorio = preparar_repositorio(crear_repositorio(), arbol_jerarquico)
+    
+    if repositorio.catalogo is not None:
+        # Empleos en memoria ya codificados: el árbol solo se engancha a los cambios
+        repositorio.catalogo.registrar(arbol_jerarquico)
+    return repositorio
+
+def obtener_repositorio():
+    """Repositorio activo, construyéndolo la primera vez que se pide"""
+    global _repositorio
+    if _repositorio is None:
+        with _lock_repositorio:
+            if _repositorio is None:
+                _repositorio = _construir_repositorio()
+    return _repositorio
+
+def __getattr__(nombre):
+    """`tree_backend.repositorio` y `tree_backend.catalogo_empleos` (None si los empleos viven en SQLite)"""
+    if nombre == 'repositorio':
+        return obtener_repositorio()
+    if nombre == 'catalogo_empleos':
+        return obtener_repositorio().catalogo
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+# Caché de rankings por egresado (clave: cédula, motor y versiones de catálogo, árbol y perfil)
+cache_rankings = CacheRanking(
+    max_entradas=int(os.environ.get('CACHE_RANKING_MAX_ENTRADAS', '1024')),
+    ttl_segundos=int(os.environ.get('CACHE_RANKING_TTL', '300'))
+)
+
+# Tokens JWT ya verificados (payload reutilizado hasta su exp; ver app/tokens.py)
+cache_tokens = CacheTokens(max_entradas=int(os.environ.get('CACHE_TOKENS_MAX_ENTRADAS', '4096')))
+
+# Motor vectorizado (NumPy, opcional); se construye la primera vez que se pide
+_motor_vectorizado = None
+_lock_motor_vectorizado = threading.Lock()
+
+def obtener_motor_vectorizado():
+    """
+    Devuelve el motor vectorizado conectado al catálogo, o None si NumPy no
+    está instalado o el catálogo no está en memoria
+    """
+    global _motor_vectorizado
+    catalogo_empleos = obtener_repositorio().catalogo
+    if _motor_vectorizado is None and catalogo_empleos is not None and tree_vectorizado.numpy_disponible():
+        # Con el lock: dos peticiones simultáneas no registran dos motores como oyentes
+        with _lock_motor_vectorizado:
+            if _motor_vectorizado is None:
+                _motor_vectorizado = tree_vectorizado.MotorVectorizado(arbol_jerarquico).conectar(catalogo_empleos)
+    return _motor_vectorizado
 
 # =============================================
 # FUNCIONES DE AUTENTICACIÓN
 # =============================================
 def generar_token(egresado):
-    """Genera token JWT para el egresado"""
+    """
+    Genera token JWT compacto para el egresado.
+    
+    En lugar del perfil en texto lleva su codificación en el árbol:
+    sub (cédula), pv (versión del perfil), av (versión del árbol), r y e (ids
+    de nodo del rol y la especialización) y t (máscara de tecnologías en
+    hexadecimal). /trabajos puntúa con esos claims sin buscar al egresado.
+    """
+    import jwt  # Diferido: /health no lo necesita (ver tree_arranque.py)
+    
+    perfil = arbol_jerarquico.codificar_egresado(egresado)
     payload = {
-        'cedula': egresado.cedula,
-        'red': egresado.red,
-        'perfil': egresado.perfil,
-        'rol_principal': egresado.rol_principal,
-        'especializacion': egresado.especializacion,
+        'sub': egresado.cedula,
+        'pv': egresado.version_perfil,
+        'av': arbol_jerarquico.version,
+        'r': perfil.rol,
+        'e': perfil.especializacion,
+        't': format(perfil.tecnologias, 'x'),
         'exp': datetime.utcnow() + timedelta(hours=2)
     }
     return jwt.encode(payload, app.config['SECRET_KEY'], algorithm='HS256')
 
-def verificar_token(token):
-    """Verifica y decodifica el token JWT"""
+class EgresadoToken:
+    """
+    Perfil del egresado reconstruido desde los claims compactos del token.
+    
+    Tiene lo que usan el ranking y ?explain=1: cédula, versión del perfil,
+    nombres de rol, especialización y tecnologías (los del árbol) y la
+    codificación ya calculada, así que no hace falta consultar el repositorio.
+    """
+    def __init__(self, cedula, version_perfil, perfil, arbol):
+        self.cedula = cedula
+        self.version_perfil = version_perfil
+        self.rol_principal = arbol.nodos[perfil.rol].valor if perfil.rol is not None else ""
+        self.especializacion = (arbol.nodos[perfil.especializacion].valor
+                                if perfil.especializacion is not None else "")
+        self.tecnologias = arbol.decodificar_tecnologias(perfil.tecnologias)
+        self.codificacion = (arbol.version, perfil)
+
+def resumen_egresado(egresado, repositorio):
+    """
+    Bloque "egresado" de /trabajos con los nombres del árbol para el rol y la
+    especialización, así el cuerpo es el mismo venga el perfil del token o del
+    repositorio (el ETag no distingue el origen). Red y perfil (texto) no van
+    en el token: si el perfil vino del token se leen del repositorio.
+    """
+    perfil = arbol_jerarquico.codificar_egresado(egresado)
+    completo = repositorio.obtener_egresado(egresado.cedula) if isinstance(egresado, EgresadoToken) else egresado
+    def nombre(id_nodo):
+        return arbol_jerarquico.nodos[id_nodo].valor if id_nodo is not None else ""
+    return {
+        "red": completo.red if completo else "",
+        "perfil": completo.perfil if completo else "",
+        "cedula": egresado.cedula,
+        "rol_principal": nombre(perfil.rol),
+        "especializacion": nombre(perfil.especializacion),
+        "version_perfil": egresado.version_perfil
+    }
+
+def egresado_desde_token(data):
+    """
+    EgresadoToken con los claims del token, o None si el token no trae el
+    formato compacto o se generó con otra versión del árbol.
+    """
+    if data.get('av') != arbol_jerarquico.version or 'pv' not in data:
+        return None
+    total_nodos = len(arbol_jerarquico.nodos)
     try:
-        payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload
+        rol, especializacion = data['r'], data['e']
+        tecnologias = int(data['t'], 16)
+    except (KeyError, TypeError, ValueError):
+        return None
+    for id_nodo in (rol, especializacion):
+        if id_nodo is not None and not (isinstance(id_nodo, int) and 0 <= id_nodo < total_nodos):
+            return None
+    if tecnologias < 0 or tecnologias.bit_length() > total_nodos:
+        return None
+    perfil = PerfilCodificado(rol, especializacion, tecnologias)
+    return EgresadoToken(data['sub'], data['pv'], perfil, arbol_jerarquico)
+
+def decodificar_token(token, secreto):
+    """Verifica la firma y decodifica el token JWT (None si es inválido o expiró)"""
+    import jwt
+    try:
+        return jwt.decode(token, secreto, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+def verificar_token(token):
+    """Verifica y decodifica el token JWT (los ya verificados salen de la caché hasta su exp)"""
+    return cache_tokens.verificar(token, app.config['SECRET_KEY'], decodificar_token)
+
+def revocar_token(token):
+    """Revoca un token antes de su expiración (por ejemplo al cerrar sesión)"""
+    payload = decodificar_token(token, app.config['SECRET_KEY'])
+    if payload is not None:
+        cache_tokens.revocar(token, exp=payload.get('exp'))
+
 def extraer_token_del_header(auth_header):
     """Extrae el token del header Authorization"""
     if auth_header and auth_header.startswith('Bearer '):
         return auth_header.split(' ')[1]
     return None
 
+def es_administrador(auth_header):
+    """True si el header Authorization trae el ADMIN_TOKEN configurado"""
+    esperado = app.config.get('ADMIN_TOKEN')
+    token = extraer_token_del_header(auth_header)
+    if not esperado or not token:
+        return False
+    return hmac.compare_digest(token.encode(), esperado.encode())
+
 # =============================================
 # ALGORITMO DE ORDENAMIENTO POR ÁRBOL
 # =============================================
-def ordenar_empleos_por_arbol(egresado, empleos):
+def puntuar_empleos_por_arbol(egresado, empleos, indice=None):
+    """
+    Calcula el score de afinidad del egresado con cada empleo.
+    
+    Args:
+        egresado: Objeto Egresado con perfil del usuario
+        empleos: Lista de objetos Empleo disponibles
+        indice: Objeto con `candidatos(egresado)` (IndiceInvertidoEmpleos o el
+            repositorio), opcional. Si se indica, solo se puntúan
+            los empleos candidatos (los que comparten rol, especialización o
+            alguna tecnología con el egresado) en lugar de todo `empleos`.
+    
+    Returns:
+        list: Tuplas (score, empleo) con score > 0, en el orden del catálogo
+    """
+    if indice is not None:
+        empleos = indice.candidatos(egresado)
+    
+    # Calcular score de afinidad para cada empleo usando el árbol jerárquico.
+    # Sin logs por empleo: el desglose de cada score se pide con ?explain=1.
+    afinidad = arbol_jerarquico.afinidad_codificada
+    codificar_empleo = arbol_jerarquico.codificar_empleo
+    perfil = arbol_jerarquico.codificar_egresado(egresado)
+    
+    empleos_con_score = []
+    for empleo in empleos:
+        score = afinidad(perfil, codificar_empleo(empleo))
+        
+        if score > 0:  # Solo incluir empleos con alguna afinidad
+            empleos_con_score.append((score, empleo))
+    
+    return empleos_con_score
+
+def empleo_con_score(score, empleo):
+    """Diccionario de respuesta de un empleo con su score de afinidad"""
+    empleo_dict = empleo.to_dict()
+    empleo_dict["score_afinidad"] = score
+    empleo_dict["algoritmo_usado"] = "arbol_jerarquico"
+    return empleo_dict
+
+def ordenar_empleos_por_arbol(egresado, empleos, indice=None, motor=None, limit=None, offset=0):
     """
     Ordena los empleos usando el algoritmo de árbol jerárquico.
     
@@ -389,37 +786,54 @@ def ordenar_empleos_por_arbol(egresado, empleos):
     Args:
         egresado: Objeto Egresado con perfil del usuario
         empleos: Lista de objetos Empleo disponibles
+        indice: IndiceInvertidoEmpleos opcional (ver puntuar_empleos_por_arbol)
+        motor: MotorVectorizado opcional. Si se indica, puntúa su propio
+            catálogo en lote con NumPy y se ignoran `empleos` e `indice`.
+        limit: Tamaño de la página (None = todos los empleos relevantes)
+        offset: Empleos a saltar desde el más afín
     
     Returns:
         list: Empleos ordenados por afinidad descendente
     """
-    empleos_con_score = []
+    if motor is not None:
+        _, pagina = motor.ordenar(egresado, limit, offset)
+    else:
+        # Selección parcial por heap: solo se ordena lo necesario para la página
+        pagina = seleccionar_pagina(puntuar_empleos_por_arbol(egresado, empleos, indice), limit, offset)
+    return [empleo_con_score(score, empleo) for score, empleo in pagina]
+
+def obtener_ranking_egresado(egresado, nombre_motor="arbol", motor=None, limit=None, offset=0):
+    """
+    Página del ranking del egresado, pasando por la caché de rankings.
     
-    logging.info(f"Iniciando ordenamiento por árbol para egresado: {egresado.nombre}")
-    logging.info(f"Rol: {egresado.rol_principal}, Especialización: {egresado.especializacion}")
-    logging.info(f"Tecnologías: {egresado.tecnologias}")
+    La caché guarda el ranking completo ya ordenado, así que refrescar o
+    pedir otra página no vuelve a puntuar. Si la caché está desactivada se
+    puntúa y se selecciona solo la página pedida.
     
-    # Calcular score de afinidad para cada empleo usando el árbol jerárquico
-    for empleo in empleos:
-        score = arbol_jerarquico.calcular_afinidad_egresado_empleo(egresado, empleo)
-        
-        if score > 0:  # Solo incluir empleos con alguna afinidad
-            empleo_dict = empleo.to_dict()
-            empleo_dict["score_afinidad"] = score
-            empleo_dict["algoritmo_usado"] = "arbol_jerarquico"
-            empleos_con_score.append(empleo_dict)
-            
-            logging.info(f"Empleo: {empleo.titulo} - Score: {score}")
-    
-    # Ordenar por score de afinidad (mayor a menor)
-    # Este es el reemplazo directo del sistema de colas FIFO
-    empleos_ordenados = sorted(empleos_con_score, 
-                              key=lambda x: x["score_afinidad"], 
-                              reverse=True)
+    Returns:
+        tuple: (total de empleos relevantes, lista de tuplas (score, empleo))
+    """
+    repositorio = obtener_repositorio()
+    clave = (egresado.cedula, nombre_motor, repositorio.version, arbol_jerarquico.version,
+             egresado.version_perfil)
+    ranking = cache_rankings.obtener(clave)
     
-    logging.info(f"Ordenamiento completado. {len(empleos_ordenados)} empleos relevantes encontrados.")
+    if ranking is None:
+        if not cache_rankings.activa:
+            if motor is not None:
+                return motor.ordenar(egresado, limit, offset)
+            puntuados = puntuar_empleos_por_arbol(egresado, (), indice=repositorio)
+            return len(puntuados), seleccionar_pagina(puntuados, limit, offset)
+        
+        if motor is not None:
+            _, ranking = motor.ordenar(egresado)
+        else:
+            ranking = seleccionar_pagina(
+                puntuar_empleos_por_arbol(egresado, (), indice=repositorio))
+        cache_rankings.guardar(clave, ranking)
     
-    return empleos_ordenados
+    fin = None if limit is None else offset + limit
+    return len(ranking), ranking[offset:fin]
 
 # =============================================
 # ENDPOINTS
@@ -434,8 +848,10 @@ def home():
         "especialidad": "Empleos de desarrollo de software",
         "endpoints": [
             "POST /login - Autenticación",
+            "POST /logout - Cerrar sesión (revoca el token)",
             "GET /trabajos - Obtener trabajos ordenados por árbol (requiere token)",
             "GET /arbol-info - Información sobre la estructura del árbol",
+            "POST/PUT/DELETE /empleos - Administrar empleos (requiere ADMIN_TOKEN)",
             "GET /health - Estado de la API"
         ]
     })
@@ -450,9 +866,14 @@ def health_check():
         "algoritmo": "arbol_jerarquico"
     })
 
-@app.route("/arbol-info", methods=["GET"])
-def arbol_info():
-    """Información sobre la estructura del árbol jerárquico"""
+# /arbol-info codificado una vez por versión del árbol: (versión, etag, cuerpo)
+_arbol_info = None
+
+def arbol_info_codificada():
+    """ETag y cuerpo JSON de /arbol-info; se recalculan solo si cambia la versión del árbol"""
+    global _arbol_info
+    if _arbol_info is not None and _arbol_info[0] == arbol_jerarquico.version:
+        return _arbol_info[1], _arbol_info[2]
     
     def nodo_to_dict(nodo, incluir_hijos=True):
         """Convierte un nodo del árbol a diccionario para JSON"""
@@ -468,12 +889,24 @@ def arbol_info():
         
         return nodo_dict
     
-    return jsonify({
+    cuerpo = (app.json.dumps({
         "estructura_arbol": nodo_to_dict(arbol_jerarquico.raiz),
         "total_nodos": len(list(_obtener_todos_los_nodos(arbol_jerarquico.raiz))),
         "roles_principales": [hijo.valor for hijo in arbol_jerarquico.raiz.hijos],
         "descripcion": "Árbol jerárquico para matching de empleos de software"
-    })
+    }) + "\n").encode()
+    _arbol_info = (arbol_jerarquico.version, etag_de("arbol-info", arbol_jerarquico.version, cuerpo), cuerpo)
+    return _arbol_info[1], _arbol_info[2]
+
+@app.route("/arbol-info", methods=["GET"])
+def arbol_info():
+    """Información sobre la estructura del árbol jerárquico (cacheable por un CDN)"""
+    cache_control = app.config['CACHE_CONTROL_ARBOL']
+    etag, cuerpo = arbol_info_codificada()
+    no_modificado = no_modificada(etag, cache_control)
+    if no_modificado is not None:
+        return no_modificado
+    return con_validadores(app.response_class(cuerpo, mimetype="application/json"), etag, cache_control)
 
 def _obtener_todos_los_nodos(nodo):
     """Función auxiliar para obtener todos los nodos del árbol"""
@@ -496,11 +929,12 @@ def login():
             return jsonify({"msg": "Cédula y ficha son requeridos"}), 400
 
         # Buscar egresado
-        egresado = next((e for e in egresados_data if e.cedula == cedula and e.ficha == ficha), None)
-        if not egresado:
+        egresado = obtener_repositorio().obtener_egresado(cedula)
+        if not ficha_coincide(egresado, ficha):
             return jsonify({"msg": "Credenciales inválidas"}), 401
 
         token = generar_token(egresado)
+        registrar_evento("login.resumen", cedula=cedula)
 
         return jsonify({
             "token": token,
@@ -515,8 +949,22 @@ def login():
         })
         
     except Exception as e:
+        registrar_evento("login.error", nivel=logging.ERROR, exc_info=True, error=str(e))
         return jsonify({"msg": "Error interno del servidor", "error": str(e)}), 500
 
+@app.route("/logout", methods=["POST"])
+def logout():
+    """Cierra la sesión: el token se rechaza desde ya aunque no haya expirado"""
+    token = extraer_token_del_header(request.headers.get("Authorization"))
+    if not token:
+        return jsonify({"msg": "Token requerido"}), 401
+    data = verificar_token(token)
+    if not data:
+        return jsonify({"msg": "Token inválido o expirado"}), 401
+    revocar_token(token)
+    registrar_evento("logout.resumen", cedula=data.get("sub") or data.get("cedula"))
+    return jsonify({"msg": "Sesión cerrada"})
+
 @app.route("/trabajos", methods=["GET"])
 def get_trabajos():
     """
@@ -525,6 +973,7 @@ def get_trabajos():
     Este endpoint reemplaza completamente el sistema de colas FIFO.
     Ahora usa el árbol jerárquico para calcular afinidades y ordenar empleos.
     """
+    inicio = time.perf_counter()
     try:
         auth_header = request.headers.get("Authorization")
         token = extraer_token_del_header(auth_header)
@@ -536,26 +985,65 @@ def get_trabajos():
         if not data:
             return jsonify({"msg": "Token inválido o expirado"}), 401
 
-        # Obtener egresado
-        cedula = data["cedula"]
-        egresado = next((e for e in egresados_data if e.cedula == cedula), None)
-        if not egresado:
+        cedula = data.get("sub") or data.get("cedula")
+        repositorio = obtener_repositorio()
+        version_perfil = repositorio.version_perfil(cedula)
+        if version_perfil is None:
             return jsonify({"msg": "Egresado no encontrado"}), 404
 
+        # Motor de cálculo: "arbol" (Python, por defecto) o "vectorizado" (NumPy)
+        nombre_motor = request.args.get("motor", "arbol")
+        if nombre_motor not in ("arbol", "vectorizado"):
+            return jsonify({"msg": "Motor inválido. Use 'arbol' o 'vectorizado'"}), 400
+        motor = None
+        if nombre_motor == "vectorizado":
+            motor = obtener_motor_vectorizado()
+            if motor is None:
+                return jsonify({"msg": "Motor vectorizado no disponible (requiere NumPy y el catálogo en memoria)"}), 400
+
+        try:
+            limit, offset = leer_paginacion(request.args)
+        except ValueError as e:
+            return jsonify({"msg": str(e)}), 400
+        explicar = request.args.get("explain", "").lower() in ("1", "true", "si", "sí")
+
+        # El cuerpo solo cambia con los empleos (su huella, que vale entre procesos),
+        # el árbol y el perfil: si el cliente ya lo tiene se responde 304 sin puntuar ni serializar
+        def etag_trabajos(version_perfil):
+            return etag_de(cedula, version_perfil, repositorio.huella, arbol_jerarquico.version,
+                           nombre_motor, limit, offset, explicar)
+        no_modificado = no_modificada(etag_trabajos(version_perfil), CACHE_PRIVADA, "Authorization")
+        if no_modificado is not None:
+            registrar_evento("trabajos.resumen", cedula=cedula, motor=nombre_motor, no_modificado=True,
+                             duracion_ms=round((time.perf_counter() - inicio) * 1000, 3))
+            return no_modificado
+
+        # Perfil desde los claims del token; solo se busca al egresado si su
+        # perfil cambió después de emitir el token (o el token es del formato anterior)
+        egresado = egresado_desde_token(data)
+        origen_perfil = "token"
+        if egresado is None or egresado.version_perfil != version_perfil:
+            egresado = repositorio.obtener_egresado(cedula)
+            origen_perfil = "repositorio"
+            if not egresado:
+                return jsonify({"msg": "Egresado no encontrado"}), 404
+
         # ===== ALGORITMO DE ORDENAMIENTO POR ÁRBOL =====
-        # Reemplaza completamente el sistema anterior de colas FIFO
-        trabajos_ordenados = ordenar_empleos_por_arbol(egresado, empleos_data)
+        # Reemplaza completamente el sistema anterior de colas FIFO.
+        # Solo se materializa y serializa la página pedida.
+        total, pagina = obtener_ranking_egresado(egresado, nombre_motor, motor, limit, offset)
 
-        return jsonify({
-            "trabajos": trabajos_ordenados,
-            "total": len(trabajos_ordenados),
-            "egresado": {
-                "red": data["red"],
-                "perfil": data["perfil"],
-                "rol_principal": data.get("rol_principal", ""),
-                "especializacion": data.get("especializacion", "")
-            },
+        registrar_evento("trabajos.resumen", cedula=cedula, motor=nombre_motor, total=total,
+                         devueltos=len(pagina), origen_perfil=origen_perfil,
+                         duracion_ms=round((time.perf_counter() - inicio) * 1000, 3))
+
+        respuesta = {
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "egresado": resumen_egresado(egresado, repositorio),
             "algoritmo": "arbol_jerarquico_v3",
+            "motor": nombre_motor,
             "descripcion": "Empleos ordenados por afinidad usando estructura de árbol jerárquico",
             "criterios_ordenamiento": [
                 "Coincidencia de rol principal (peso alto)",
@@ -564,15 +1052,102 @@ def get_trabajos():
                 "Bonificaciones por múltiples coincidencias",
                 "Ajuste por prioridad del rol en empresa"
             ]
-        })
+        }
+        
+        # Modo explicación: desglose del score de cada empleo de la página
+        if explicar:
+            trabajos_ordenados = [empleo_con_score(score, empleo) for score, empleo in pagina]
+            for trabajo, (_, empleo) in zip(trabajos_ordenados, pagina):
+                trabajo["explicacion"] = arbol_jerarquico.explicar_afinidad(egresado, empleo)
+            respuesta["trabajos"] = trabajos_ordenados
+            salida = jsonify(respuesta)
+        else:
+            # Cada empleo ya está codificado: se empalma su JSON con el score
+            salida = respuesta_json(respuesta, trabajos=arreglo_empleos(
+                pagina, "score_afinidad", {"algoritmo_usado": "arbol_jerarquico"}))
+        return con_validadores(salida, etag_trabajos(egresado.version_perfil), CACHE_PRIVADA, "Authorization")
         
     except Exception as e:
-        logging.exception("Error en get_trabajos")
+        registrar_evento("trabajos.error", nivel=logging.ERROR, exc_info=True, error=str(e))
         return jsonify({"msg": "Error interno del servidor", "error": str(e)}), 500
 
+# =============================================
+# ADMINISTRACIÓN DE EMPLEOS
+# =============================================
+# Cada cambio pasa por el repositorio; el catálogo notifica a sus oyentes
+# (índice invertido, codificación del árbol, motor vectorizado), que solo
+# actualizan lo que toca al empleo. La versión del repositorio cambia, así
+# que el siguiente /trabajos ya no usa rankings cacheados.
+def invalidar_rankings_obsoletos():
+    """Quita de la caché los rankings calculados con otra versión de los empleos"""
+    version = obtener_repositorio().version
+    cache_rankings.invalidar(lambda clave: clave[2] != version)
+
+@app.route("/empleos", methods=["POST"])
+def crear_empleo():
+    """Agrega un empleo al catálogo (requiere ADMIN_TOKEN)"""
+    if not es_administrador(request.headers.get("Authorization")):
+        return jsonify({"msg": "No autorizado"}), 403
+    from tree_importar import FilaInvalida, validar_empleo
+    try:
+        empleo = validar_empleo(request.get_json(silent=True), arbol_jerarquico)
+        obtener_repositorio().agregar_empleo(empleo)
+    except FilaInvalida as e:
+        return jsonify({"msg": str(e)}), 400
+    except KeyError:
+        return jsonify({"msg": "Ya existe un empleo con ese id"}), 409
+
+    invalidar_rankings_obsoletos()
+    registrar_evento("empleos.agregado", id=empleo.id)
+    return jsonify(empleo.to_dict()), 201
+
+@app.route("/empleos/<int:id_empleo>", methods=["PUT"])
+def actualizar_empleo(id_empleo):
+    """Reemplaza un empleo conservando su posición en el catálogo (requiere ADMIN_TOKEN)"""
+    if not es_administrador(request.headers.get("Authorization")):
+        return jsonify({"msg": "No autorizado"}), 403
+    from tree_importar import FilaInvalida, validar_empleo
+    datos = request.get_json(silent=True)
+    if isinstance(datos, dict):
+        if datos.setdefault("id", id_empleo) != id_empleo:
+            return jsonify({"msg": "El id del cuerpo no coincide con el de la ruta"}), 400
+    try:
+        empleo = validar_empleo(datos, arbol_jerarquico)
+        obtener_repositorio().actualizar_empleo(empleo)
+    except FilaInvalida as e:
+        return jsonify({"msg": str(e)}), 400
+    except KeyError:
+        return jsonify({"msg": "Empleo no encontrado"}), 404
+
+    invalidar_rankings_obsoletos()
+    registrar_evento("empleos.actualizado", id=id_empleo)
+    return jsonify(empleo.to_dict())
+
+@app.route("/empleos/<int:id_empleo>", methods=["DELETE"])
+def retirar_empleo(id_empleo):
+    """Retira un empleo del catálogo (requiere ADMIN_TOKEN)"""
+    if not es_administrador(request.headers.get("Authorization")):
+        return jsonify({"msg": "No autorizado"}), 403
+    try:
+        obtener_repositorio().retirar_empleo(id_empleo)
+    except KeyError:
+        return jsonify({"msg": "Empleo no encontrado"}), 404
+
+    invalidar_rankings_obsoletos()
+    registrar_evento("empleos.retirado", id=id_empleo)
+    return jsonify({"msg": "Empleo retirado", "id": id_empleo})
+
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    """Contadores de la caché de rankings, la de tokens verificados y la compresión"""
+    compresion = app.extensions.get("compresion")
+    return jsonify({**cache_rankings.estadisticas(), "tokens": cache_tokens.estadisticas(),
+                    "compresion": compresion.estadisticas() if compresion else None})
+
 # Debug endpoint para verificar datos cargados
 @app.route('/debug-data', methods=['GET'])
 def debug_data():
+    repositorio = obtener_repositorio()
     try:
         egresados_sample = [
             {
@@ -584,7 +1159,7 @@ def debug_data():
                 'especializacion': e.especializacion,
                 'tecnologias': e.tecnologias[:3] if e.tecnologias else []  # Solo las primeras 3
             }
-            for e in egresados_data[:3]  # Solo los primeros 3 egresados
+            for e in repositorio.egresados(3)  # Solo los primeros 3 egresados
         ]
         empleos_sample = [
             {
@@ -594,15 +1169,15 @@ def debug_data():
                 'tecnologias_requeridas': emp.tecnologias_requeridas[:3] if emp.tecnologias_requeridas else [],
                 'prioridad_rol': emp.prioridad_rol
             }
-            for emp in empleos_data[:5]  # Solo los primeros 5 empleos
+            for emp in repositorio.empleos(5)  # Solo los primeros 5 empleos
         ]
         
         return jsonify({
             'algoritmo': 'arbol_jerarquico',
             'egresados_sample': egresados_sample,
             'empleos_sample': empleos_sample,
-            'egresados_count': len(egresados_data),
-            'empleos_count': len(empleos_data),
+            'egresados_count': repositorio.contar_egresados(),
+            'empleos_count': repositorio.contar_empleos(),
             'estructura_arbol': 'Ver /arbol-info para detalles completos'
         })
     except Exception as e:
@@ -612,10 +1187,23 @@ def debug_data():
 # =============================================
 # CONFIGURACIÓN PARA VERCEL
 # =============================================
+# Compresión gzip/deflate de las respuestas (ver app/compresion.py; COMPRESION_NIVEL=0 la desactiva)
+instalar_compresion(
+    app,
+    nivel=int(os.environ.get('COMPRESION_NIVEL', '6')),
+    tamano_minimo=int(os.environ.get('COMPRESION_MIN_BYTES', '1024')),
+    max_entradas=int(os.environ.get('COMPRESION_CACHE_ENTRADAS', '256'))
+)
+
 # Variable requerida por Vercel
 application = app
 
+# Servidores de larga duración: construir los datos ahora y no en la primera petición
+if os.environ.get('INICIALIZACION', 'perezosa').lower() == 'inmediata':
+    obtener_repositorio()
+
 if __name__ == "__main__":
-    # Configurar logging para desarrollo
-    logging.basicConfig(level=logging.INFO)
+    # En desarrollo registrar todos los eventos (sin muestreo)
+    from app.registro import ajustar_muestreo
+    ajustar_muestreo({"trabajos.resumen": 1.0, "login.resumen": 1.0})
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
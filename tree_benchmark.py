@@ -0,0 +1,314 @@
+"""
+Micro-benchmarks de las funciones de scoring
+
+Mide, sobre los módulos reales (no copias), cuántas operaciones por segundo
+hacen y cuánta memoria reservan:
+
+- ArbolJerarquico.calcular_afinidad_egresado_empleo (una operación = un par egresado-empleo)
+- ordenar_empleos_por_arbol (una operación = la primera página de 20 de un egresado
+  sobre todo el catálogo)
+- calcular_score_por_palabras_clave de app/palabras_clave.py (la de app/routes.py)
+  y de index.py (una operación = un par egresado-empleo)
+- ArbolJerarquico.buscar_nodo por el índice hash y recorriendo el subárbol desde
+  la raíz (una operación = una búsqueda)
+
+Cada caso se mide con catálogos de 100, 10k, 100k y 1M empleos y árboles de
+50, 500 y 5k nodos (el árbol real con ramas sintéticas agregadas), con datos
+de tree_sintetico.py que siguen la taxonomía de cada árbol. Las palabras
+clave no dependen del árbol y buscar_nodo no depende del catálogo, así que
+solo se miden por el tamaño que les afecta.
+
+Cada pasada hace a lo sumo OPERACIONES_POR_PASADA pares (una muestra
+repartida por todo el catálogo) y ordenar_empleos_por_arbol ordena para
+menos egresados cuanto más grande es el catálogo, así 1M de empleos se mide
+en segundos por pasada. La muestra de cada caso queda en "operaciones".
+
+Antes de medir se ejecuta una pasada de calentamiento (también llena las
+codificaciones que el servidor guarda en cada empleo y egresado), y cada
+repetición corre con el recolector de basura desactivado, como timeit. Se
+informan la mejor y la mediana de las repeticiones. La memoria se mide en una
+pasada aparte con tracemalloc (que hace más lento el código): pico de bytes
+reservados durante una pasada y bytes que quedan retenidos al terminarla.
+
+Uso:
+    python tree_benchmark.py
+    python tree_benchmark.py --catalogos 100 10000 --arboles 50 500 --repeticiones 3 \\
+        --salida benchmark.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tree_backend
+from tree_backend import ArbolJerarquico, NodoArbol, ordenar_empleos_por_arbol
+from tree_sintetico import GeneradorSintetico
+from app.palabras_clave import calcular_score_por_palabras_clave
+
+CATALOGOS = (100, 10_000, 100_000, 1_000_000)
+ARBOLES = (50, 500, 5_000)
+EGRESADOS = 32
+TAMANO_PAGINA = 20
+
+# Tope de operaciones por pasada: con catálogos o árboles grandes se toma una
+# muestra repartida por todo el catálogo (o el árbol) en lugar de recorrerlo entero
+OPERACIONES_POR_PASADA = 200_000
+EMPLEOS_POR_PASADA_ORDENAR = 200_000
+BUSQUEDAS_RECORRIDO = 250
+
+# Especializaciones y tecnologías de cada rol sintético agregado al árbol
+ESPECIALIZACIONES_POR_ROL = 3
+TECNOLOGIAS_POR_ESPECIALIZACION = 5
+
+
+class ArbolSintetico(ArbolJerarquico):
+    """
+    Árbol real ampliado con roles sintéticos hasta tener `total_nodos` nodos.
+
+    Cada rol sintético tiene ESPECIALIZACIONES_POR_ROL especializaciones con
+    TECNOLOGIAS_POR_ESPECIALIZACION tecnologías; el último se corta donde
+    se llega al total.
+    """
+
+    def __init__(self, total_nodos):
+        self.total_nodos = total_nodos
+        super().__init__()
+
+    def _construir_arbol(self):
+        super()._construir_arbol()
+        nodos = _contar_nodos(self.raiz)
+        numero_rol = 0
+        while nodos < self.total_nodos:
+            numero_rol += 1
+            rol = NodoArbol(f"Rol sintético {numero_rol}", peso=8)
+            self.raiz.agregar_hijo(rol)
+            nodos += 1
+            for e in range(ESPECIALIZACIONES_POR_ROL):
+                if nodos >= self.total_nodos:
+                    break
+                especializacion = NodoArbol(f"Especialización {numero_rol}.{e}", peso=7)
+                rol.agregar_hijo(especializacion)
+                nodos += 1
+                for t in range(TECNOLOGIAS_POR_ESPECIALIZACION):
+                    if nodos >= self.total_nodos:
+                        break
+                    especializacion.agregar_hijo(NodoArbol(f"Tecnología {numero_rol}.{e}.{t}", peso=6))
+                    nodos += 1
+
+
+def _contar_nodos(nodo):
+    return 1 + sum(_contar_nodos(hijo) for hijo in nodo.hijos)
+
+
+def generar_datos(arbol, empleos, egresados=EGRESADOS, semilla=0):
+    """
+    Egresados y empleos de tree_sintetico.py que siguen la taxonomía de `arbol`
+
+    Returns:
+        tuple: (lista de Egresado, lista de Empleo)
+    """
+    generador = GeneradorSintetico(arbol, semilla)
+    return list(generador.egresados(egresados)), list(generador.empleos(empleos))
+
+
+def _muestra(secuencia, maximo):
+    """Hasta `maximo` elementos repartidos uniformemente por la secuencia"""
+    paso = -(-len(secuencia) // maximo)
+    return secuencia[::paso]
+
+
+def medir(pasada, operaciones, repeticiones=5):
+    """
+    Mide `pasada()`, que hace `operaciones` operaciones.
+
+    Returns:
+        dict: operaciones por segundo (mejor y mediana), µs por operación y memoria
+    """
+    pasada()  # Calentamiento
+    tiempos = []
+    gc_activo = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            pasada()
+            tiempos.append(time.perf_counter() - inicio)
+    finally:
+        if gc_activo:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes, _ = tracemalloc.get_traced_memory()
+        resultado = pasada()
+        despues, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+
+    mejor, mediana = min(tiempos), statistics.median(tiempos)
+    return {
+        "operaciones": operaciones,
+        "ops_s": round(operaciones / mejor, 1),
+        "ops_s_mediana": round(operaciones / mediana, 1),
+        "us_por_op": round(mejor / operaciones * 1e6, 3),
+        "pico_bytes": pico - antes,
+        "bytes_retenidos": despues - antes
+    }
+
+
+@contextlib.contextmanager
+def _arbol_del_backend(arbol):
+    """ordenar_empleos_por_arbol puntúa con el árbol del módulo: se reemplaza mientras se mide"""
+    anterior = tree_backend.arbol_jerarquico
+    tree_backend.arbol_jerarquico = arbol
+    try:
+        yield
+    finally:
+        tree_backend.arbol_jerarquico = anterior
+
+
+def _casos_arbol(arbol, egresados, empleos):
+    """Pasadas que dependen del árbol y del catálogo"""
+
+    pares = _muestra(empleos, OPERACIONES_POR_PASADA)
+    # Cada ranking recorre todo el catálogo: menos egresados por pasada cuanto más grande
+    rankings = egresados[:max(1, min(len(egresados), EMPLEOS_POR_PASADA_ORDENAR // len(empleos)))]
+
+    def afinidad():
+        calcular = arbol.calcular_afinidad_egresado_empleo
+        return [calcular(egresados[i % len(egresados)], empleo) for i, empleo in enumerate(pares)]
+
+    def ordenar():
+        with _arbol_del_backend(arbol):
+            return [ordenar_empleos_por_arbol(egresado, empleos, limit=TAMANO_PAGINA) for egresado in rankings]
+
+    return {"calcular_afinidad_egresado_empleo": (afinidad, len(pares)),
+            "ordenar_empleos_por_arbol": (ordenar, len(rankings))}
+
+
+def _casos_palabras_clave(egresados, empleos):
+    """Pasadas de las dos versiones del score por palabras clave"""
+    import index
+
+    pares = _muestra(empleos, OPERACIONES_POR_PASADA)
+
+    def pasada(calcular):
+        return lambda: [calcular(egresados[i % len(egresados)], empleo) for i, empleo in enumerate(pares)]
+
+    return {"calcular_score_por_palabras_clave[app]": (pasada(calcular_score_por_palabras_clave), len(pares)),
+            "calcular_score_por_palabras_clave[index]": (pasada(index.calcular_score_por_palabras_clave),
+                                                         len(pares))}
+
+
+def _casos_buscar_nodo(arbol):
+    """
+    Búsqueda de cada nodo del árbol (más un nombre ausente) por índice y,
+    para una muestra de BUSQUEDAS_RECORRIDO nombres, recorriendo desde la raíz
+    """
+    nombres = [nodo.valor for nodo in arbol.nodos] + ["No existe"]
+    muestra = _muestra(nombres[:-1], BUSQUEDAS_RECORRIDO) + ["No existe"]
+
+    def por_indice():
+        return [arbol.buscar_nodo(nombre) for nombre in nombres]
+
+    def por_recorrido():
+        return [arbol.buscar_nodo(nombre, arbol.raiz) for nombre in muestra]
+
+    return {"buscar_nodo": (por_indice, len(nombres)),
+            "buscar_nodo[subarbol]": (por_recorrido, len(muestra))}
+
+
+def ejecutar(catalogos=CATALOGOS, arboles=ARBOLES, repeticiones=5, semilla=0, progreso=None):
+    """
+    Ejecuta todos los casos.
+
+    Args:
+        progreso: función opcional que recibe cada resultado al terminarlo
+
+    Returns:
+        list: un dict por caso con funcion, empleos, nodos y las medidas de medir()
+    """
+    resultados = []
+
+    def registrar(funcion, empleos, nodos, caso):
+        pasada, operaciones = caso
+        resultado = {"funcion": funcion, "empleos": empleos, "nodos": nodos,
+                     **medir(pasada, operaciones, repeticiones)}
+        resultados.append(resultado)
+        if progreso:
+            progreso(resultado)
+
+    catalogo_max = max(catalogos, default=0)
+    for total_nodos in arboles:
+        arbol = ArbolSintetico(total_nodos)
+        for funcion, caso in _casos_buscar_nodo(arbol).items():
+            registrar(funcion, None, len(arbol.nodos), caso)
+
+        # Un catálogo por árbol (las codificaciones guardadas son del árbol); los menores son prefijos
+        egresados, empleos = generar_datos(arbol, catalogo_max, semilla=semilla)
+        for tamano in catalogos:
+            for funcion, caso in _casos_arbol(arbol, egresados, empleos[:tamano]).items():
+                registrar(funcion, tamano, len(arbol.nodos), caso)
+        del empleos
+
+    if catalogos:
+        # Las palabras clave solo dependen del catálogo: se mide con el árbol real
+        egresados, empleos = generar_datos(ArbolJerarquico(), catalogo_max, semilla=semilla)
+        for tamano in catalogos:
+            for funcion, caso in _casos_palabras_clave(egresados, empleos[:tamano]).items():
+                registrar(funcion, tamano, None, caso)
+    return resultados
+
+
+def _imprimir(resultado):
+    empleos = "-" if resultado["empleos"] is None else resultado["empleos"]
+    nodos = "-" if resultado["nodos"] is None else resultado["nodos"]
+    print(f"{resultado['funcion']:<42} empleos={empleos:<8} nodos={nodos:<5} "
+          f"{resultado['ops_s']:>14,.1f} ops/s {resultado['us_por_op']:>10.3f} µs/op "
+          f"pico {resultado['pico_bytes']:>12,} B", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de las funciones de scoring")
+    parser.add_argument("--catalogos", type=int, nargs="*", default=list(CATALOGOS),
+                        help="Tamaños de catálogo (empleos)")
+    parser.add_argument("--arboles", type=int, nargs="*", default=list(ARBOLES),
+                        help="Tamaños de árbol (nodos; menos que el árbol real lo deja igual)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="Archivo JSON (por defecto la salida estándar)")
+    args = parser.parse_args(argv)
+    if args.repeticiones < 1 or any(tamano < 1 for tamano in args.catalogos + args.arboles):
+        print("Las repeticiones y los tamaños deben ser mayores que 0", file=sys.stderr)
+        return 2
+
+    resultado = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticiones": args.repeticiones,
+        "semilla": args.semilla,
+        "casos": ejecutar(args.catalogos, args.arboles, args.repeticiones, args.semilla, _imprimir)
+    }
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Importación masiva de egresados y empleos desde CSV o JSONL
+
+Lee los archivos fila a fila, valida cada fila contra los campos de Egresado
+y Empleo (tree_models.py), incluido que cada tecnología exista como nodo del
+ArbolJerarquico, y escribe en el repositorio activo por lotes, un lote por
+transacción. Los índices del repositorio (SQLite o catálogo en memoria) se
+actualizan con cada lote. La memoria depende del tamaño del lote, no del
+tamaño del archivo.
+
+Uso:
+    python tree_importar.py --egresados egresados.csv --empleos empleos.jsonl \\
+        --repositorio sqlite:///datos.db --lote 5000
+
+Formatos:
+    JSONL: un objeto por línea con los campos del constructor; las
+        tecnologías como lista.
+    CSV: encabezado con los nombres de los campos; las tecnologías
+        separadas por "|" (por ejemplo "React|Node.js|PostgreSQL").
+
+Las filas inválidas o duplicadas se informan por stderr con su número de
+línea y no detienen la importación.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tree_models import Egresado, Empleo
+
+CAMPOS_EGRESADO = ("cedula", "ficha", "nombre", "red", "perfil",
+                   "rol_principal", "especializacion", "tecnologias")
+CAMPOS_EMPLEO = ("id", "titulo", "descripcion", "perfil_requerido", "salario", "ubicacion",
+                 "rol_requerido", "especializacion_requerida", "tecnologias_requeridas", "prioridad_rol")
+
+SEPARADOR_TECNOLOGIAS = "|"
+
+# Errores por archivo que se muestran antes de resumir el resto
+MAX_ERRORES_MOSTRADOS = 20
+
+
+class FilaInvalida(ValueError):
+    """Fila que no se puede convertir en Egresado o Empleo"""
+
+
+def leer_filas(ruta):
+    """
+    Lee un CSV o un JSONL (según la extensión) fila a fila.
+
+    Yields:
+        tuple: (número de línea, dict con los campos de la fila)
+    """
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        if ruta.lower().endswith(".csv"):
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+        else:
+            for numero, linea in enumerate(archivo, start=1):
+                linea = linea.strip()
+                if not linea:
+                    continue
+                try:
+                    yield numero, json.loads(linea)
+                except json.JSONDecodeError as e:
+                    yield numero, FilaInvalida(f"JSON inválido: {e.msg}")
+
+
+def _texto(fila, campo, requerido=False):
+    valor = fila.get(campo)
+    valor = "" if valor is None else str(valor).strip()
+    if requerido and not valor:
+        raise FilaInvalida(f"Falta el campo '{campo}'")
+    return valor
+
+
+def _tecnologias(fila, campo, arbol):
+    valor = fila.get(campo) or []
+    if isinstance(valor, str):
+        valor = valor.split(SEPARADOR_TECNOLOGIAS)
+    if not isinstance(valor, list):
+        raise FilaInvalida(f"'{campo}' debe ser una lista de tecnologías")
+    tecnologias = [str(tech).strip() for tech in valor if str(tech).strip()]
+    desconocidas = [tech for tech in tecnologias if arbol.obtener_nodo(tech) is None]
+    if desconocidas:
+        raise FilaInvalida(f"Tecnologías que no existen en el árbol: {', '.join(desconocidas)}")
+    return tecnologias
+
+
+def _entero(fila, campo, requerido=False):
+    valor = fila.get(campo)
+    if valor is None or valor == "":
+        if requerido:
+            raise FilaInvalida(f"Falta el campo '{campo}'")
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise FilaInvalida(f"'{campo}' debe ser un entero") from None
+
+
+def _verificar_campos(fila, campos):
+    if not isinstance(fila, dict):
+        raise FilaInvalida("La fila debe ser un objeto")
+    desconocidos = set(fila) - set(campos)
+    if desconocidos:
+        raise FilaInvalida(f"Campos desconocidos: {', '.join(sorted(map(str, desconocidos)))}")
+
+
+def validar_egresado(fila, arbol):
+    """Convierte una fila en Egresado o lanza FilaInvalida"""
+    _verificar_campos(fila, CAMPOS_EGRESADO)
+    return Egresado(
+        cedula=_texto(fila, "cedula", requerido=True),
+        ficha=_texto(fila, "ficha", requerido=True),
+        nombre=_texto(fila, "nombre"),
+        red=_texto(fila, "red"),
+        perfil=_texto(fila, "perfil"),
+        rol_principal=_texto(fila, "rol_principal"),
+        especializacion=_texto(fila, "especializacion"),
+        tecnologias=_tecnologias(fila, "tecnologias", arbol)
+    )
+
+
+def validar_empleo(fila, arbol):
+    """Convierte una fila en Empleo o lanza FilaInvalida"""
+    _verificar_campos(fila, CAMPOS_EMPLEO)
+    prioridad = _entero(fila, "prioridad_rol")
+    if prioridad is not None and prioridad not in (1, 2, 3):
+        raise FilaInvalida("'prioridad_rol' debe ser 1, 2 o 3")
+    salario = fila.get("salario")
+    if isinstance(salario, str):
+        salario = salario.strip()
+        salario = int(salario) if salario.isdigit() else salario
+    return Empleo(
+        id=_entero(fila, "id", requerido=True),
+        titulo=_texto(fila, "titulo", requerido=True),
+        descripcion=_texto(fila, "descripcion"),
+        perfil_requerido=_texto(fila, "perfil_requerido"),
+        salario=salario,
+        ubicacion=_texto(fila, "ubicacion"),
+        rol_requerido=_texto(fila, "rol_requerido"),
+        especializacion_requerida=_texto(fila, "especializacion_requerida"),
+        tecnologias_requeridas=_tecnologias(fila, "tecnologias_requeridas", arbol),
+        prioridad_rol=prioridad if prioridad is not None else 3
+    )
+
+
+class Resultado:
+    """Contadores de una importación"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.importados = 0
+        self.rechazados = 0
+        self.inicio = time.perf_counter()
+
+    @property
+    def filas_por_segundo(self):
+        duracion = time.perf_counter() - self.inicio
+        return (self.importados + self.rechazados) / duracion if duracion > 0 else 0.0
+
+    def resumen(self):
+        return (f"{self.nombre}: {self.importados} importados, {self.rechazados} rechazados, "
+                f"{time.perf_counter() - self.inicio:.2f}s ({self.filas_por_segundo:,.0f} filas/s)")
+
+
+def importar_archivo(ruta, validar, guardar, arbol, tamano_lote=1000, nombre=None,
+                     progreso_cada=100000, salida_errores=sys.stderr):
+    """
+    Importa un archivo por lotes.
+
+    Args:
+        validar: validar_egresado o validar_empleo
+        guardar (callable): Recibe una lista de objetos y los escribe en una
+            transacción; lanza KeyError si alguno está duplicado
+        progreso_cada (int): Cada cuántas filas informar el avance (0 = nunca)
+
+    Returns:
+        Resultado: Contadores de la importación
+    """
+    resultado = Resultado(nombre or os.path.basename(ruta))
+
+    def rechazar(numero, motivo):
+        resultado.rechazados += 1
+        if resultado.rechazados <= MAX_ERRORES_MOSTRADOS:
+            print(f"{ruta}:{numero}: {motivo}", file=salida_errores)
+
+    def escribir(lote):
+        try:
+            guardar([objeto for _, objeto in lote])
+            resultado.importados += len(lote)
+        except KeyError:
+            # Aislar los duplicados del lote fila a fila
+            for numero, objeto in lote:
+                try:
+                    guardar([objeto])
+                    resultado.importados += 1
+                except KeyError:
+                    rechazar(numero, "Registro duplicado")
+
+    filas = leer_filas(ruta)
+    siguiente_progreso = progreso_cada
+    while True:
+        bloque = list(islice(filas, tamano_lote))
+        if not bloque:
+            break
+        lote = []
+        for numero, fila in bloque:
+            try:
+                if isinstance(fila, FilaInvalida):
+                    raise fila
+                lote.append((numero, validar(fila, arbol)))
+            except FilaInvalida as e:
+                rechazar(numero, e)
+        if lote:
+            escribir(lote)
+
+        procesadas = resultado.importados + resultado.rechazados
+        if progreso_cada and procesadas >= siguiente_progreso:
+            print(f"  {resultado.nombre}: {procesadas} filas ({resultado.filas_por_segundo:,.0f} filas/s)",
+                  file=salida_errores)
+            siguiente_progreso = (procesadas // progreso_cada + 1) * progreso_cada
+
+    if resultado.rechazados > MAX_ERRORES_MOSTRADOS:
+        print(f"{ruta}: {resultado.rechazados - MAX_ERRORES_MOSTRADOS} errores más sin mostrar",
+              file=salida_errores)
+    return resultado
+
+
+def construir_parser():
+    parser = argparse.ArgumentParser(description="Importa egresados y empleos (CSV o JSONL) al repositorio")
+    parser.add_argument("--egresados", help="Archivo CSV o JSONL de egresados")
+    parser.add_argument("--empleos", help="Archivo CSV o JSONL de empleos")
+    parser.add_argument("--repositorio",
+                        help="Repositorio destino, p. ej. sqlite:///datos.db (por defecto REPOSITORIO)")
+    parser.add_argument("--lote", type=int, default=1000, help="Filas por transacción")
+    return parser
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    if not args.egresados and not args.empleos:
+        print("Indique --egresados y/o --empleos", file=sys.stderr)
+        return 2
+    if args.lote < 1:
+        print("--lote debe ser mayor que 0", file=sys.stderr)
+        return 2
+
+    from tree_backend import arbol_jerarquico
+    from tree_repositorio import crear_repositorio
+
+    repositorio = crear_repositorio(args.repositorio or os.environ.get("REPOSITORIO") or "memoria")
+    if repositorio.catalogo is not None:
+        print("Aviso: el repositorio en memoria no se guarda al terminar "
+              "(use --repositorio sqlite:///ruta.db)", file=sys.stderr)
+
+    for ruta, validar, guardar in (
+            (args.egresados, validar_egresado, lambda lote: repositorio.importar(egresados=lote)),
+            (args.empleos, validar_empleo, lambda lote: repositorio.importar(empleos=lote))):
+        if ruta:
+            print(importar_archivo(ruta, validar, guardar, arbol_jerarquico, args.lote).resumen(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
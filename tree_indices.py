@@ -0,0 +1,101 @@
+"""
+Índices sobre el catálogo de empleos para el ordenamiento por árbol jerárquico
+"""
+import threading
+
+
+class IndiceInvertidoEmpleos:
+    """
+    Índice invertido: término -> claves de los empleos que lo requieren.
+
+    Se indexan el rol requerido, la especialización requerida y cada una de
+    las tecnologías requeridas (sin distinguir mayúsculas). Un empleo solo
+    puede tener afinidad > 0 con un egresado si comparte al menos uno de
+    esos términos, así que la unión de las listas de publicación de los
+    términos del egresado contiene a todos los empleos relevantes.
+
+    Se registra como oyente de un CatalogoEmpleos para mantenerse al día.
+    Los cambios y las consultas toman el mismo lock (las listas de publicación
+    son sets que se modifican en el lugar).
+    """
+
+    def __init__(self):
+        self.catalogo = None
+        self._por_rol = {}
+        self._por_especializacion = {}
+        self._por_tecnologia = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # El lock no se puede serializar (instantáneas de arranque, tree_arranque.py)
+        estado = self.__dict__.copy()
+        del estado["_lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _publicar(indice, termino, clave):
+        if termino:
+            indice.setdefault(termino.lower(), set()).add(clave)
+
+    def al_agregar(self, clave, empleo):
+        """Agrega un empleo a las listas de publicación"""
+        with self._lock:
+            self._agregar(clave, empleo)
+
+    def _agregar(self, clave, empleo):
+        self._publicar(self._por_rol, empleo.rol_requerido, clave)
+        self._publicar(self._por_especializacion, empleo.especializacion_requerida, clave)
+        for tech in empleo.tecnologias_requeridas or []:
+            self._publicar(self._por_tecnologia, tech, clave)
+
+    @staticmethod
+    def _despublicar(indice, termino, clave):
+        if termino:
+            claves = indice.get(termino.lower())
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del indice[termino.lower()]
+
+    def al_actualizar(self, clave, anterior, empleo):
+        """Mueve el empleo de las listas de sus términos anteriores a las de los nuevos"""
+        with self._lock:
+            self._retirar(clave, anterior)
+            self._agregar(clave, empleo)
+
+    def al_retirar(self, clave, empleo):
+        """Quita el empleo de las listas de publicación de sus términos"""
+        with self._lock:
+            self._retirar(clave, empleo)
+
+    def _retirar(self, clave, empleo):
+        self._despublicar(self._por_rol, empleo.rol_requerido, clave)
+        self._despublicar(self._por_especializacion, empleo.especializacion_requerida, clave)
+        for tech in empleo.tecnologias_requeridas or []:
+            self._despublicar(self._por_tecnologia, tech, clave)
+
+    def conectar(self, catalogo):
+        """Carga el índice desde el catálogo y se suscribe a sus cambios"""
+        self.catalogo = catalogo
+        catalogo.registrar(self)
+        return self
+
+    def claves_candidatas(self, egresado):
+        """Unión de las listas de publicación del rol, especialización y tecnologías del egresado"""
+        candidatas = set()
+        with self._lock:
+            if egresado.rol_principal:
+                candidatas |= self._por_rol.get(egresado.rol_principal.lower(), set())
+            if egresado.especializacion:
+                candidatas |= self._por_especializacion.get(egresado.especializacion.lower(), set())
+            for tech in egresado.tecnologias or []:
+                candidatas |= self._por_tecnologia.get(tech.lower(), set())
+        return candidatas
+
+    def candidatos(self, egresado):
+        """Empleos candidatos del egresado, en el orden del catálogo"""
+        return self.catalogo.en_orden(self.claves_candidatas(egresado))
@@ -21,6 +21,10 @@ class Egresado:
         self.rol_principal = rol_principal  # Development Team, QA Tester, UX/UI Designer
         self.especializacion = especializacion  # Frontend, Backend, Fullstack, etc.
         self.tecnologias = tecnologias  # Lista de tecnologías que maneja
+        # (versión del árbol, PerfilCodificado) asignado por ArbolJerarquico.codificar_egresado
+        self.codificacion = None
+        # Aumenta con cada cambio de perfil (ver app/egresados.py)
+        self.version_perfil = 0
         
     def to_dict(self):
         return {
@@ -50,6 +54,8 @@ class Empleo:
         self.especializacion_requerida = especializacion_requerida
         self.tecnologias_requeridas = tecnologias_requeridas
         self.prioridad_rol = prioridad_rol  # 1=alta, 2=media, 3=baja
+        # (versión del árbol, EmpleoCodificado) asignado por ArbolJerarquico.codificar_empleo
+        self.codificacion = None
 
     def to_dict(self):
         return {
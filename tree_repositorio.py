@@ -0,0 +1,585 @@
+"""
+Repositorio de egresados y empleos (árbol jerárquico)
+
+Abstrae de dónde salen los datos que usa tree_backend.py. Hay dos backends
+con la misma interfaz:
+
+- RepositorioMemoria: las listas de tree_models.py (comportamiento de
+  siempre), indexadas por cédula y con el catálogo de empleos y su índice
+  invertido en memoria.
+- RepositorioSQLite: una base SQLite con índices por cédula, rol requerido,
+  especialización requerida y perfil requerido, y las tecnologías en una
+  tabla normalizada con su tabla de unión. Los empleos no se cargan en la
+  memoria de cada worker: los candidatos de un egresado se consultan por
+  índice en cada ranking. Las búsquedas sin distinguir mayúsculas usan
+  columnas *_clave con str.lower() de Python (COLLATE NOCASE de SQLite solo
+  pliega ASCII: "DISEÑO" no coincidiría con "Diseño" como en memoria).
+
+Interfaz común:
+    obtener_egresado(cedula), version_perfil(cedula), egresados(limite),
+    contar_egresados(), agregar_egresado(egresado), actualizar_egresado(egresado),
+    obtener_empleo(id), empleos(limite),
+    contar_empleos(), agregar_empleo(empleo), actualizar_empleo(empleo),
+    retirar_empleo(id), candidatos(egresado),
+    empleos_por_perfil(perfil_requerido), importar(egresados, empleos),
+    version, huella, catalogo
+
+`catalogo` es el CatalogoEmpleos en memoria o None si los empleos viven
+fuera del proceso (SQLite). `version` cambia cada vez que cambian los
+empleos y forma parte de la clave de la caché de rankings. `huella`
+identifica además el conjunto de datos (contenido del catálogo en memoria,
+identidad de la base en SQLite) y es la que se usa en los ETags, que deben
+valer entre procesos.
+
+Uso (crear una base SQLite con los datos de tree_models.py):
+    python tree_repositorio.py datos.db
+    REPOSITORIO=sqlite:///datos.db python tree_backend.py
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+from itertools import groupby, islice
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.catalogo import CatalogoEmpleos
+from app.egresados import IndiceEgresados
+from tree_indices import IndiceInvertidoEmpleos
+from tree_models import Egresado, Empleo
+
+
+class RepositorioMemoria:
+    """Egresados y empleos en memoria, con índice por cédula e índice invertido de empleos"""
+
+    def __init__(self, egresados=(), empleos=()):
+        self._egresados = IndiceEgresados()
+        self.catalogo = CatalogoEmpleos(empleos, clave=attrgetter("id"))
+        self.indice = IndiceInvertidoEmpleos().conectar(self.catalogo)
+        for egresado in egresados:
+            self.agregar_egresado(egresado)
+
+    @property
+    def version(self):
+        return self.catalogo.version
+
+    @property
+    def huella(self):
+        return self.catalogo.huella
+
+    # ----- Egresados -----
+    def obtener_egresado(self, cedula):
+        """Egresado con esa cédula o None"""
+        return self._egresados.obtener(cedula)
+
+    def version_perfil(self, cedula):
+        """Versión del perfil del egresado o None si no existe"""
+        egresado = self._egresados.obtener(cedula)
+        return None if egresado is None else egresado.version_perfil
+
+    def egresados(self, limite=None):
+        """Egresados en orden de carga (los `limite` primeros si se indica)"""
+        return list(islice(self._egresados, limite))
+
+    def contar_egresados(self):
+        return len(self._egresados)
+
+    def agregar_egresado(self, egresado):
+        self._egresados.agregar(egresado)
+
+    def actualizar_egresado(self, egresado):
+        """Reemplaza el perfil del egresado con la misma cédula; devuelve la nueva versión del perfil"""
+        return self._egresados.actualizar(egresado)
+
+    # ----- Empleos -----
+    def obtener_empleo(self, id_empleo):
+        """Empleo con ese id o None"""
+        return self.catalogo.obtener(id_empleo)
+
+    def empleos(self, limite=None):
+        """Empleos en orden de carga (los `limite` primeros si se indica)"""
+        return list(islice(self.catalogo, limite))
+
+    def contar_empleos(self):
+        return len(self.catalogo)
+
+    def agregar_empleo(self, empleo):
+        return self.catalogo.agregar(empleo)
+
+    def actualizar_empleo(self, empleo):
+        """Reemplaza el empleo con el mismo id (KeyError si no existe)"""
+        return self.catalogo.actualizar(empleo.id, empleo)
+
+    def retirar_empleo(self, id_empleo):
+        """Quita el empleo del catálogo y lo devuelve (KeyError si no existe)"""
+        return self.catalogo.retirar(id_empleo)
+
+    def importar(self, egresados=(), empleos=()):
+        """
+        Agrega egresados y empleos; si alguna cédula o id ya existe no se agrega ninguno.
+
+        Raises:
+            KeyError: Si ya existe un egresado con esa cédula o un empleo con ese id
+        """
+        egresados, empleos = list(egresados), list(empleos)
+        cedulas = [egresado.cedula for egresado in egresados]
+        ids = [empleo.id for empleo in empleos]
+        if (len(set(cedulas)) < len(cedulas) or any(self._egresados.obtener(cedula) for cedula in cedulas)
+                or len(set(ids)) < len(ids) or any(self.catalogo.obtener(id_empleo) for id_empleo in ids)):
+            raise KeyError("Registro duplicado")
+        for egresado in egresados:
+            self.agregar_egresado(egresado)
+        for empleo in empleos:
+            self.agregar_empleo(empleo)
+
+    def candidatos(self, egresado):
+        """Empleos que comparten rol, especialización o alguna tecnología con el egresado, en orden de carga"""
+        return self.indice.candidatos(egresado)
+
+    def empleos_por_perfil(self, perfil_requerido):
+        """Empleos de un perfil requerido (red), en orden de carga"""
+        perfil = perfil_requerido.lower()
+        return [empleo for empleo in self.catalogo if (empleo.perfil_requerido or "").lower() == perfil]
+
+
+# =============================================
+# SQLITE
+# =============================================
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS egresados (
+    cedula          TEXT PRIMARY KEY,
+    ficha           TEXT NOT NULL,
+    nombre          TEXT,
+    red             TEXT,
+    perfil          TEXT,
+    rol_principal   TEXT,
+    especializacion TEXT,
+    version_perfil  INTEGER NOT NULL DEFAULT 0,
+    posicion        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_egresados_posicion ON egresados (posicion);
+
+-- posicion: orden de carga (desempata scores igual que el catálogo en memoria)
+-- *_clave: el campo con str.lower() de Python, para buscar sin distinguir mayúsculas
+CREATE TABLE IF NOT EXISTS empleos (
+    posicion                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    id                        INTEGER NOT NULL UNIQUE,
+    titulo                    TEXT,
+    descripcion               TEXT,
+    perfil_requerido          TEXT,
+    salario,                  -- sin tipo: se guarda tal cual (número o texto)
+    ubicacion                 TEXT,
+    rol_requerido             TEXT,
+    especializacion_requerida TEXT,
+    prioridad_rol             INTEGER,
+    perfil_clave              TEXT,
+    rol_clave                 TEXT,
+    especializacion_clave     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tecnologias (
+    id     INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    clave  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS empleo_tecnologias (
+    empleo     INTEGER NOT NULL REFERENCES empleos (posicion),
+    orden      INTEGER NOT NULL,
+    tecnologia INTEGER NOT NULL REFERENCES tecnologias (id),
+    PRIMARY KEY (empleo, orden)
+);
+CREATE INDEX IF NOT EXISTS idx_empleo_tecnologias_tecnologia ON empleo_tecnologias (tecnologia, empleo);
+
+CREATE TABLE IF NOT EXISTS egresado_tecnologias (
+    cedula     TEXT NOT NULL REFERENCES egresados (cedula),
+    orden      INTEGER NOT NULL,
+    tecnologia INTEGER NOT NULL REFERENCES tecnologias (id),
+    PRIMARY KEY (cedula, orden)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (clave, valor) VALUES ('version_empleos', 0);
+-- Identidad aleatoria de la base: otra base con el mismo contador de versión no comparte ETags
+INSERT OR IGNORE INTO meta (clave, valor) VALUES ('identidad', abs(random() / 2));
+"""
+
+# Columnas *_clave agregadas a bases creadas antes de tenerlas: tabla, columna, columna de origen
+COLUMNAS_CLAVE = (
+    ("empleos", "perfil_clave", "perfil_requerido"),
+    ("empleos", "rol_clave", "rol_requerido"),
+    ("empleos", "especializacion_clave", "especializacion_requerida"),
+    ("tecnologias", "clave", "nombre"),
+)
+
+# Se crean después de COLUMNAS_CLAVE (en una base anterior esas columnas aún no existen)
+INDICES = """
+CREATE INDEX IF NOT EXISTS idx_empleos_rol ON empleos (rol_clave);
+CREATE INDEX IF NOT EXISTS idx_empleos_especializacion ON empleos (especializacion_clave);
+CREATE INDEX IF NOT EXISTS idx_empleos_perfil ON empleos (perfil_clave);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tecnologias_clave ON tecnologias (clave);
+"""
+
+
+def clave_busqueda(texto):
+    """Forma de comparación sin mayúsculas, la misma que usan el repositorio en memoria y el árbol"""
+    return None if texto is None else texto.lower()
+
+_COLUMNAS_EMPLEO = ("e.posicion, e.id, e.titulo, e.descripcion, e.perfil_requerido, e.salario, "
+                    "e.ubicacion, e.rol_requerido, e.especializacion_requerida, e.prioridad_rol")
+
+# Empleos (filtrados por la subconsulta de posiciones) con sus tecnologías en orden
+_CONSULTA_EMPLEOS = f"""
+SELECT {_COLUMNAS_EMPLEO}, t.nombre
+FROM ({{posiciones}}) AS p
+JOIN empleos e ON e.posicion = p.posicion
+LEFT JOIN empleo_tecnologias et ON et.empleo = e.posicion
+LEFT JOIN tecnologias t ON t.id = et.tecnologia
+ORDER BY e.posicion, et.orden
+"""
+
+_CONSULTA_EGRESADOS = """
+SELECT g.cedula, g.ficha, g.nombre, g.red, g.perfil, g.rol_principal, g.especializacion,
+       g.version_perfil, t.nombre
+FROM ({posiciones}) AS p
+JOIN egresados g ON g.cedula = p.cedula
+LEFT JOIN egresado_tecnologias gt ON gt.cedula = g.cedula
+LEFT JOIN tecnologias t ON t.id = gt.tecnologia
+ORDER BY g.posicion, gt.orden
+"""
+
+
+class RepositorioSQLite:
+    """
+    Egresados y empleos en una base SQLite.
+
+    Cada hilo usa su propia conexión. Las filas se convierten en objetos
+    Egresado/Empleo de tree_models.py en cada consulta; la versión de los
+    empleos se guarda en la tabla meta, así que los cambios hechos por otro
+    proceso también invalidan la caché de rankings.
+    """
+
+    catalogo = None
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._ids_tecnologia = {}   # nombre en minúsculas -> id (solo ids ya confirmados)
+        with self._conexion() as conexion:
+            conexion.executescript(ESQUEMA)
+            self._agregar_columnas_clave(conexion)
+            conexion.executescript(INDICES)
+
+    @staticmethod
+    def _agregar_columnas_clave(conexion):
+        """Agrega y llena las columnas *_clave que le falten a una base anterior"""
+        conexion.create_function("clave_busqueda", 1, clave_busqueda, deterministic=True)
+        for tabla, columna, origen in COLUMNAS_CLAVE:
+            existentes = {fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla})")}
+            if columna not in existentes:
+                conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} TEXT")
+                conexion.execute(f"UPDATE {tabla} SET {columna} = clave_busqueda({origen})")
+        # Índices anteriores sobre las columnas originales (COLLATE NOCASE)
+        for indice, columna in (("idx_empleos_rol", "rol_clave"),
+                                ("idx_empleos_especializacion", "especializacion_clave"),
+                                ("idx_empleos_perfil", "perfil_clave")):
+            columnas = [fila[2] for fila in conexion.execute(f"PRAGMA index_info({indice})")]
+            if columnas and columnas != [columna]:
+                conexion.execute(f"DROP INDEX {indice}")
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta)
+            conexion.execute("PRAGMA foreign_keys = ON")
+            self._local.conexion = conexion
+        return conexion
+
+    @property
+    def version(self):
+        fila = self._conexion().execute(
+            "SELECT valor FROM meta WHERE clave = 'version_empleos'").fetchone()
+        return fila[0]
+
+    @property
+    def huella(self):
+        """Identidad de la base y versión de los empleos"""
+        valores = dict(self._conexion().execute(
+            "SELECT clave, valor FROM meta WHERE clave IN ('identidad', 'version_empleos')"))
+        return f"{valores['identidad']:x}-{valores['version_empleos']}"
+
+    # ----- Conversión de filas -----
+    @staticmethod
+    def _empleos_desde_filas(filas):
+        for _, grupo in groupby(filas, key=lambda fila: fila[0]):
+            grupo = list(grupo)
+            _, id_empleo, titulo, descripcion, perfil, salario, ubicacion, rol, especializacion, prioridad, _ = grupo[0]
+            tecnologias = [fila[-1] for fila in grupo if fila[-1] is not None]
+            yield Empleo(id_empleo, titulo, descripcion, perfil, salario, ubicacion,
+                         rol, especializacion, tecnologias, prioridad)
+
+    @staticmethod
+    def _egresados_desde_filas(filas):
+        for _, grupo in groupby(filas, key=lambda fila: fila[0]):
+            grupo = list(grupo)
+            cedula, ficha, nombre, red, perfil, rol, especializacion, version_perfil, _ = grupo[0]
+            tecnologias = [fila[-1] for fila in grupo if fila[-1] is not None]
+            egresado = Egresado(cedula, ficha, nombre, red, perfil, rol, especializacion, tecnologias)
+            egresado.version_perfil = version_perfil
+            yield egresado
+
+    def _consultar_empleos(self, posiciones, parametros=()):
+        cursor = self._conexion().execute(_CONSULTA_EMPLEOS.format(posiciones=posiciones), parametros)
+        return list(self._empleos_desde_filas(cursor))
+
+    def _consultar_egresados(self, cedulas, parametros=()):
+        cursor = self._conexion().execute(_CONSULTA_EGRESADOS.format(posiciones=cedulas), parametros)
+        return list(self._egresados_desde_filas(cursor))
+
+    def _ids_tecnologias(self, conexion, tecnologias, nuevas):
+        """Ids de las tecnologías, creando las que falten (`nuevas` recoge las creadas en la transacción)"""
+        ids = []
+        for nombre in tecnologias or []:
+            clave = clave_busqueda(nombre)
+            id_tecnologia = self._ids_tecnologia.get(clave) or nuevas.get(clave)
+            if id_tecnologia is None:
+                conexion.execute("INSERT OR IGNORE INTO tecnologias (nombre, clave) VALUES (?, ?)",
+                                 (nombre, clave))
+                id_tecnologia = conexion.execute(
+                    "SELECT id FROM tecnologias WHERE clave = ?", (clave,)).fetchone()[0]
+                nuevas[clave] = id_tecnologia
+            ids.append(id_tecnologia)
+        return ids
+
+    # ----- Egresados -----
+    def obtener_egresado(self, cedula):
+        """Egresado con esa cédula o None (búsqueda por clave primaria)"""
+        encontrados = self._consultar_egresados(
+            "SELECT cedula FROM egresados WHERE cedula = ?", (cedula,))
+        return encontrados[0] if encontrados else None
+
+    def version_perfil(self, cedula):
+        """Versión del perfil del egresado o None si no existe (sin leer sus tecnologías)"""
+        fila = self._conexion().execute(
+            "SELECT version_perfil FROM egresados WHERE cedula = ?", (cedula,)).fetchone()
+        return None if fila is None else fila[0]
+
+    def egresados(self, limite=None):
+        """Egresados en orden de carga (los `limite` primeros si se indica)"""
+        return self._consultar_egresados(
+            "SELECT cedula FROM egresados ORDER BY posicion LIMIT ?", (-1 if limite is None else limite,))
+
+    def contar_egresados(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM egresados").fetchone()[0]
+
+    def agregar_egresado(self, egresado):
+        self.importar(egresados=[egresado])
+
+    def actualizar_egresado(self, egresado):
+        """Reemplaza el perfil del egresado con la misma cédula; devuelve la nueva versión del perfil"""
+        conexion = self._conexion()
+        nuevas = {}
+        with conexion:
+            cursor = conexion.execute(
+                "UPDATE egresados SET ficha = ?, nombre = ?, red = ?, perfil = ?, rol_principal = ?, "
+                "especializacion = ?, version_perfil = version_perfil + 1 WHERE cedula = ?",
+                (egresado.ficha, egresado.nombre, egresado.red, egresado.perfil,
+                 egresado.rol_principal, egresado.especializacion, egresado.cedula))
+            if cursor.rowcount == 0:
+                raise KeyError(f"No existe un egresado con cédula {egresado.cedula!r}")
+            conexion.execute("DELETE FROM egresado_tecnologias WHERE cedula = ?", (egresado.cedula,))
+            conexion.executemany(
+                "INSERT INTO egresado_tecnologias (cedula, orden, tecnologia) VALUES (?, ?, ?)",
+                [(egresado.cedula, orden, id_tecnologia) for orden, id_tecnologia
+                 in enumerate(self._ids_tecnologias(conexion, egresado.tecnologias, nuevas))])
+            version_perfil = conexion.execute(
+                "SELECT version_perfil FROM egresados WHERE cedula = ?", (egresado.cedula,)).fetchone()[0]
+        self._ids_tecnologia.update(nuevas)
+        egresado.codificacion = None
+        egresado.version_perfil = version_perfil
+        return version_perfil
+
+    # ----- Empleos -----
+    def obtener_empleo(self, id_empleo):
+        """Empleo con ese id o None"""
+        encontrados = self._consultar_empleos("SELECT posicion FROM empleos WHERE id = ?", (id_empleo,))
+        return encontrados[0] if encontrados else None
+
+    def empleos(self, limite=None):
+        """Empleos en orden de carga (los `limite` primeros si se indica)"""
+        return self._consultar_empleos(
+            "SELECT posicion FROM empleos ORDER BY posicion LIMIT ?", (-1 if limite is None else limite,))
+
+    def contar_empleos(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM empleos").fetchone()[0]
+
+    def agregar_empleo(self, empleo):
+        self.importar(empleos=[empleo])
+        return empleo.id
+
+    def _escribir_tecnologias_empleo(self, conexion, posicion, tecnologias, nuevas):
+        conexion.executemany(
+            "INSERT INTO empleo_tecnologias (empleo, orden, tecnologia) VALUES (?, ?, ?)",
+            [(posicion, orden, id_tecnologia) for orden, id_tecnologia
+             in enumerate(self._ids_tecnologias(conexion, tecnologias, nuevas))])
+
+    @staticmethod
+    def _claves_empleo(empleo):
+        """Valores de perfil_clave, rol_clave y especializacion_clave"""
+        return (clave_busqueda(empleo.perfil_requerido), clave_busqueda(empleo.rol_requerido),
+                clave_busqueda(empleo.especializacion_requerida))
+
+    def _incrementar_version(self, conexion):
+        conexion.execute("UPDATE meta SET valor = valor + 1 WHERE clave = 'version_empleos'")
+
+    def actualizar_empleo(self, empleo):
+        """Reemplaza el empleo con el mismo id conservando su posición (KeyError si no existe)"""
+        conexion = self._conexion()
+        nuevas = {}
+        with conexion:
+            fila = conexion.execute("SELECT posicion FROM empleos WHERE id = ?", (empleo.id,)).fetchone()
+            if fila is None:
+                raise KeyError(f"No existe un empleo con id {empleo.id!r}")
+            conexion.execute(
+                "UPDATE empleos SET titulo = ?, descripcion = ?, perfil_requerido = ?, salario = ?, "
+                "ubicacion = ?, rol_requerido = ?, especializacion_requerida = ?, prioridad_rol = ?, "
+                "perfil_clave = ?, rol_clave = ?, especializacion_clave = ? WHERE posicion = ?",
+                (empleo.titulo, empleo.descripcion, empleo.perfil_requerido, empleo.salario,
+                 empleo.ubicacion, empleo.rol_requerido, empleo.especializacion_requerida,
+                 empleo.prioridad_rol, *self._claves_empleo(empleo), fila[0]))
+            conexion.execute("DELETE FROM empleo_tecnologias WHERE empleo = ?", (fila[0],))
+            self._escribir_tecnologias_empleo(conexion, fila[0], empleo.tecnologias_requeridas, nuevas)
+            self._incrementar_version(conexion)
+        self._ids_tecnologia.update(nuevas)
+
+    def retirar_empleo(self, id_empleo):
+        """Borra el empleo y lo devuelve (KeyError si no existe)"""
+        empleo = self.obtener_empleo(id_empleo)
+        if empleo is None:
+            raise KeyError(f"No existe un empleo con id {id_empleo!r}")
+        conexion = self._conexion()
+        with conexion:
+            conexion.execute(
+                "DELETE FROM empleo_tecnologias WHERE empleo = (SELECT posicion FROM empleos WHERE id = ?)",
+                (id_empleo,))
+            conexion.execute("DELETE FROM empleos WHERE id = ?", (id_empleo,))
+            self._incrementar_version(conexion)
+        return empleo
+
+    def candidatos(self, egresado):
+        """
+        Empleos que comparten rol, especialización o alguna tecnología con el
+        egresado, en orden de carga. Cada rama de la unión usa un índice.
+        """
+        ramas, parametros = [], []
+        if egresado.rol_principal:
+            ramas.append("SELECT posicion FROM empleos WHERE rol_clave = ?")
+            parametros.append(clave_busqueda(egresado.rol_principal))
+        if egresado.especializacion:
+            ramas.append("SELECT posicion FROM empleos WHERE especializacion_clave = ?")
+            parametros.append(clave_busqueda(egresado.especializacion))
+        tecnologias = [clave_busqueda(tech) for tech in egresado.tecnologias or []]
+        if tecnologias:
+            ramas.append(
+                "SELECT et.empleo AS posicion FROM tecnologias t "
+                "JOIN empleo_tecnologias et ON et.tecnologia = t.id "
+                f"WHERE t.clave IN ({', '.join('?' * len(tecnologias))})")
+            parametros.extend(tecnologias)
+        if not ramas:
+            return []
+        return self._consultar_empleos(" UNION ".join(ramas), parametros)
+
+    def empleos_por_perfil(self, perfil_requerido):
+        """Empleos de un perfil requerido (red), en orden de carga"""
+        return self._consultar_empleos(
+            "SELECT posicion FROM empleos WHERE perfil_clave = ?", (clave_busqueda(perfil_requerido),))
+
+    # ----- Carga -----
+    def importar(self, egresados=(), empleos=()):
+        """
+        Inserta egresados y empleos en una sola transacción.
+
+        Raises:
+            KeyError: Si ya existe un egresado con esa cédula o un empleo con ese id
+        """
+        conexion = self._conexion()
+        nuevas = {}
+        try:
+            with conexion:
+                posicion = conexion.execute(
+                    "SELECT COALESCE(MAX(posicion), -1) + 1 FROM egresados").fetchone()[0]
+                for egresado in egresados:
+                    conexion.execute(
+                        "INSERT INTO egresados (cedula, ficha, nombre, red, perfil, rol_principal, "
+                        "especializacion, posicion) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (egresado.cedula, egresado.ficha, egresado.nombre, egresado.red, egresado.perfil,
+                         egresado.rol_principal, egresado.especializacion, posicion))
+                    posicion += 1
+                    conexion.executemany(
+                        "INSERT INTO egresado_tecnologias (cedula, orden, tecnologia) VALUES (?, ?, ?)",
+                        [(egresado.cedula, orden, id_tecnologia) for orden, id_tecnologia
+                         in enumerate(self._ids_tecnologias(conexion, egresado.tecnologias, nuevas))])
+
+                agregados = 0
+                for empleo in empleos:
+                    cursor = conexion.execute(
+                        "INSERT INTO empleos (id, titulo, descripcion, perfil_requerido, salario, ubicacion, "
+                        "rol_requerido, especializacion_requerida, prioridad_rol, perfil_clave, rol_clave, "
+                        "especializacion_clave) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (empleo.id, empleo.titulo, empleo.descripcion, empleo.perfil_requerido,
+                         empleo.salario, empleo.ubicacion, empleo.rol_requerido,
+                         empleo.especializacion_requerida, empleo.prioridad_rol,
+                         *self._claves_empleo(empleo)))
+                    self._escribir_tecnologias_empleo(
+                        conexion, cursor.lastrowid, empleo.tecnologias_requeridas, nuevas)
+                    agregados += 1
+
+                if agregados:
+                    self._incrementar_version(conexion)
+        except sqlite3.IntegrityError as e:
+            raise KeyError(f"Registro duplicado: {e}") from e
+        # Los ids creados solo se recuerdan si la transacción se confirmó
+        self._ids_tecnologia.update(nuevas)
+
+
+def crear_repositorio(url=None):
+    """
+    Crea el repositorio indicado por `url` (o por la variable REPOSITORIO).
+
+    Args:
+        url (str): "memoria" (por defecto, datos de tree_models.py) o
+            "sqlite:///ruta/datos.db"
+    """
+    url = url or os.environ.get("REPOSITORIO", "memoria")
+    if url == "memoria":
+        from tree_models import egresados_data, empleos_data
+        return RepositorioMemoria(egresados_data, empleos_data)
+    if url.startswith("sqlite:///"):
+        return RepositorioSQLite(url[len("sqlite:///"):])
+    raise ValueError(f"Repositorio no soportado: {url!r}. Use 'memoria' o 'sqlite:///ruta.db'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crea una base SQLite con los datos de tree_models.py")
+    parser.add_argument("ruta", help="Archivo SQLite a crear")
+    args = parser.parse_args(argv)
+
+    from tree_models import egresados_data, empleos_data
+    repositorio = RepositorioSQLite(args.ruta)
+    try:
+        repositorio.importar(egresados_data, empleos_data)
+    except KeyError as e:
+        print(f"{args.ruta}: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.ruta}: {repositorio.contar_egresados()} egresados, "
+          f"{repositorio.contar_empleos()} empleos", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+Generador de datos sintéticos según la taxonomía del ArbolJerarquico
+
+Produce cualquier cantidad de egresados y empleos para benchmarks y pruebas
+de carga, mucho más allá de los 12 egresados y 20 empleos de tree_models.py.
+Recorre el árbol (el del backend o uno propio, p. ej. el ArbolSintetico de
+tree_benchmark.py) y reparte los registros así:
+
+- Rol: proporcional al cuadrado de su peso (Development Team aparece más).
+- Especialización: cualquier nodo interno bajo el rol (Fullstack, Frontend,
+  Backend...), proporcional a su peso; sus tecnologías son las hojas de su
+  subárbol.
+- Tecnologías: popularidad tipo Zipf dentro de cada especialización (las
+  primeras del árbol son las más comunes), 1 a 6 por egresado y 1 a 5 por
+  empleo, con alguna tecnología de otra especialización del mismo rol.
+- Empleos: nivel (junior, semi senior, senior) que fija el rango de salario
+  (log-normal, redondeado a $100.000), ciudad con pesos de mercado y
+  prioridad del rol 1/2/3 en 25/50/25 %.
+- Textos en español (perfil, descripción, perfil requerido) con palabras de
+  PALABRAS_TECNICAS según el rol, más alguna de otro sector.
+
+La misma semilla produce los mismos registros, y los egresados no dependen de
+cuántos empleos se generen (cada tipo usa su propio generador aleatorio).
+
+Uso:
+    python tree_sintetico.py --egresados 10000 --empleos 100000 --semilla 7 \\
+        --salida-egresados egresados.jsonl --salida-empleos empleos.jsonl
+    python tree_importar.py --egresados egresados.jsonl --empleos empleos.jsonl \\
+        --repositorio sqlite:///datos.db
+
+Formato de salida (JSONL): un objeto por línea con los campos de to_dict() de
+Egresado y Empleo en tree_models.py, el que leen tree_importar.py y
+ranking_offline.py.
+
+Desde Python, `poblar()` agrega los registros directamente a
+tree_models.egresados_data y empleos_data (antes de que tree_backend
+construya el repositorio, en la primera petición que lo usa).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tree_models import Egresado, Empleo
+from app.palabras_clave import PALABRAS_TECNICAS
+
+CEDULA_INICIAL = 1_000_000_000
+
+# Vocabulario de cada rol (solo palabras de PALABRAS_TECNICAS)
+VOCABULARIO_POR_ROL = {
+    "Development Team": ("software", "desarrollo", "programacion", "informatica", "sistemas",
+                         "aplicaciones", "web", "movil", "frontend", "backend", "fullstack", "digital"),
+    "QA Tester": ("calidad", "procesos", "software", "sistemas", "aplicaciones", "control",
+                  "automatizacion", "web", "gestion", "proyectos"),
+    "UX/UI Designer": ("diseño", "digital", "creatividad", "web", "movil", "aplicaciones",
+                       "cliente", "atencion", "proyectos"),
+}
+VOCABULARIO_GENERAL = ("software", "sistemas", "digital", "gestion", "proyectos", "procesos", "calidad")
+PROBABILIDAD_OTRO_SECTOR = 0.1
+
+CARGO_POR_ROL = {
+    "Development Team": "Desarrollador",
+    "QA Tester": "Analista QA",
+    "UX/UI Designer": "Diseñador UX/UI",
+}
+CARGO_GENERAL = "Profesional"
+
+# (nivel, peso, salario mediano en pesos)
+NIVELES = (("Junior", 35, 2_800_000), ("Semi Senior", 40, 3_800_000), ("Senior", 25, 5_200_000))
+DISPERSION_SALARIO = 0.15
+
+CIUDADES = (("Bogotá", 35), ("Medellín", 22), ("Cali", 12), ("Barranquilla", 7), ("Remoto", 7),
+            ("Cartagena", 5), ("Bucaramanga", 5), ("Pereira", 4), ("Manizales", 3))
+PRIORIDADES = ((1, 25), (2, 50), (3, 25))
+
+# Cantidad de tecnologías: (cantidad, peso)
+TECNOLOGIAS_EGRESADO = ((1, 5), (2, 15), (3, 30), (4, 25), (5, 15), (6, 10))
+TECNOLOGIAS_EMPLEO = ((1, 10), (2, 30), (3, 35), (4, 18), (5, 7))
+PROBABILIDAD_TECNOLOGIA_CRUZADA = 0.2
+
+NOMBRES = ("Ana", "Luis", "María", "Carlos", "Elena", "Diego", "Sofía", "Ricardo", "Camila", "Andrés",
+           "Valentina", "Fernando", "Laura", "Julián", "Daniela", "Santiago", "Paula", "Mateo",
+           "Isabella", "Sebastián", "Natalia", "Felipe", "Juliana", "Alejandro")
+APELLIDOS = ("Pérez", "Gómez", "Torres", "Ruiz", "Vargas", "Castro", "Mendoza", "López", "Rojas",
+             "Herrera", "Cruz", "Silva", "Rodríguez", "Martínez", "García", "Sánchez", "Ramírez",
+             "Moreno", "Jiménez", "Díaz", "Ortiz", "Restrepo", "Cardona", "Ospina")
+
+VERBOS_PERFIL = ("Desarrolla", "Diseña", "Implementa", "Gestiona", "Optimiza", "Coordina")
+VERBOS_EMPLEO = ("desarrollar", "diseñar", "implementar", "mantener", "probar", "mejorar")
+
+
+class _Distribucion:
+    """Elección ponderada con pesos acumulados precalculados (más rápida que random.choices en bucle)"""
+
+    def __init__(self, valores, pesos):
+        self.valores = list(valores)
+        self.acumulados = list(accumulate(pesos))
+
+    def elegir(self, aleatorio):
+        return self.valores[bisect(self.acumulados, aleatorio.random() * self.acumulados[-1])]
+
+    @classmethod
+    def de_pares(cls, pares):
+        pares = list(pares)
+        return cls([valor for valor, _ in pares], [peso for _, peso in pares])
+
+
+class _Especializacion:
+    """Especialización del árbol con sus tecnologías (hojas) y su popularidad tipo Zipf"""
+
+    def __init__(self, rol, nodo):
+        self.rol = rol
+        self.nombre = nodo.valor
+        self.tecnologias = _hojas(nodo)
+        self.popularidad = _Distribucion(self.tecnologias, [1 / (i + 1) for i in range(len(self.tecnologias))])
+
+    def muestra(self, aleatorio, cantidad):
+        """Hasta `cantidad` tecnologías distintas, las populares con más probabilidad"""
+        cantidad = min(cantidad, len(self.tecnologias))
+        elegidas = []
+        while len(elegidas) < cantidad:
+            tecnologia = self.popularidad.elegir(aleatorio)
+            if tecnologia not in elegidas:
+                elegidas.append(tecnologia)
+        return elegidas
+
+
+def _hojas(nodo):
+    if not nodo.hijos:
+        return [nodo.valor]
+    return [hoja for hijo in nodo.hijos for hoja in _hojas(hijo)]
+
+
+def _internos(nodo):
+    """Nodos con hijos del subárbol de `nodo` (incluido), en preorden"""
+    if not nodo.hijos:
+        return []
+    return [nodo] + [interno for hijo in nodo.hijos for interno in _internos(hijo)]
+
+
+class GeneradorSintetico:
+    """
+    Genera egresados y empleos que siguen la taxonomía de `arbol`.
+
+    Args:
+        arbol: ArbolJerarquico a recorrer (por defecto el de tree_backend)
+        semilla (int): Semilla de los generadores aleatorios
+    """
+
+    def __init__(self, arbol=None, semilla=0):
+        if arbol is None:
+            from tree_backend import arbol_jerarquico as arbol
+        self.semilla = semilla
+        self.vocabulario_otros = sorted(PALABRAS_TECNICAS)
+
+        # Solo roles con alguna especialización que tenga tecnologías
+        roles = []
+        self.especializaciones = {}
+        for rol in arbol.raiz.hijos:
+            internos = [interno for hijo in rol.hijos for interno in _internos(hijo)]
+            if not internos:
+                continue
+            especializaciones = [_Especializacion(rol.valor, nodo) for nodo in internos]
+            self.especializaciones[rol.valor] = (
+                _Distribucion(especializaciones, [nodo.peso for nodo in internos]), especializaciones)
+            roles.append(rol)
+        if not roles:
+            raise ValueError("El árbol no tiene roles con especializaciones")
+        self.roles = _Distribucion([rol.valor for rol in roles], [rol.peso ** 2 for rol in roles])
+
+        self.niveles = _Distribucion.de_pares((nivel, peso) for nivel, peso, _ in NIVELES)
+        self.salarios = {nivel: salario for nivel, _, salario in NIVELES}
+        self.ciudades = _Distribucion.de_pares(CIUDADES)
+        self.prioridades = _Distribucion.de_pares(PRIORIDADES)
+        self.tecnologias_egresado = _Distribucion.de_pares(TECNOLOGIAS_EGRESADO)
+        self.tecnologias_empleo = _Distribucion.de_pares(TECNOLOGIAS_EMPLEO)
+
+    def _aleatorio(self, tipo):
+        return random.Random(f"{self.semilla}:{tipo}")
+
+    def _especializacion(self, aleatorio):
+        distribucion, _ = self.especializaciones[self.roles.elegir(aleatorio)]
+        return distribucion.elegir(aleatorio)
+
+    def _tecnologias(self, aleatorio, especializacion, cantidad):
+        tecnologias = especializacion.muestra(aleatorio, cantidad)
+        if aleatorio.random() < PROBABILIDAD_TECNOLOGIA_CRUZADA:
+            # Alguna tecnología de otra especialización del mismo rol
+            _, todas = self.especializaciones[especializacion.rol]
+            extra = aleatorio.choice(todas).muestra(aleatorio, 1)[0]
+            if extra not in tecnologias:
+                tecnologias.append(extra)
+        return tecnologias
+
+    def _palabras(self, aleatorio, rol, cantidad):
+        vocabulario = VOCABULARIO_POR_ROL.get(rol, VOCABULARIO_GENERAL)
+        palabras = aleatorio.sample(vocabulario, min(cantidad, len(vocabulario)))
+        if aleatorio.random() < PROBABILIDAD_OTRO_SECTOR:
+            palabras[-1] = aleatorio.choice(self.vocabulario_otros)
+        return palabras
+
+    def egresados(self, cantidad, cedula_inicial=CEDULA_INICIAL):
+        """
+        Genera `cantidad` egresados (uno a la vez).
+
+        Yields:
+            Egresado: cédulas consecutivas desde `cedula_inicial`
+        """
+        aleatorio = self._aleatorio("egresados")
+        for i in range(cantidad):
+            especializacion = self._especializacion(aleatorio)
+            tecnologias = self._tecnologias(aleatorio, especializacion,
+                                            self.tecnologias_egresado.elegir(aleatorio))
+            palabras = self._palabras(aleatorio, especializacion.rol, 3)
+            yield Egresado(
+                cedula=str(cedula_inicial + i),
+                ficha=str(aleatorio.randrange(1_000_000, 3_000_000)),
+                nombre=f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}",
+                red="Software",
+                perfil=(f"{aleatorio.choice(VERBOS_PERFIL)} {palabras[0]} {' y '.join(palabras[1:])} "
+                        f"con experiencia en {_enumerar(tecnologias)}"),
+                rol_principal=especializacion.rol,
+                especializacion=especializacion.nombre,
+                tecnologias=tecnologias
+            )
+
+    def empleos(self, cantidad, id_inicial=1):
+        """
+        Genera `cantidad` empleos (uno a la vez).
+
+        Yields:
+            Empleo: ids consecutivos desde `id_inicial`
+        """
+        aleatorio = self._aleatorio("empleos")
+        for i in range(cantidad):
+            especializacion = self._especializacion(aleatorio)
+            tecnologias = self._tecnologias(aleatorio, especializacion,
+                                            self.tecnologias_empleo.elegir(aleatorio))
+            palabras = self._palabras(aleatorio, especializacion.rol, 4)
+            nivel = self.niveles.elegir(aleatorio)
+            salario = self.salarios[nivel] * math.exp(aleatorio.gauss(0, DISPERSION_SALARIO))
+            cargo = CARGO_POR_ROL.get(especializacion.rol, CARGO_GENERAL)
+            yield Empleo(
+                id=id_inicial + i,
+                titulo=f"{cargo} {especializacion.nombre} {nivel}",
+                descripcion=(f"Buscamos talento para {aleatorio.choice(VERBOS_EMPLEO)} {palabras[0]} "
+                             f"{palabras[1]} y {palabras[2]} usando {_enumerar(tecnologias)}"),
+                perfil_requerido=f"{cargo} con conocimientos en {palabras[3]} y {tecnologias[0]}",
+                salario=int(round(salario, -5)),
+                ubicacion=self.ciudades.elegir(aleatorio),
+                rol_requerido=especializacion.rol,
+                especializacion_requerida=especializacion.nombre,
+                tecnologias_requeridas=tecnologias,
+                prioridad_rol=self.prioridades.elegir(aleatorio)
+            )
+
+
+def _enumerar(elementos):
+    """'A', 'A y B', 'A, B y C'"""
+    if len(elementos) == 1:
+        return elementos[0]
+    return f"{', '.join(elementos[:-1])} y {elementos[-1]}"
+
+
+def escribir_jsonl(registros, ruta):
+    """
+    Escribe cada registro (Egresado o Empleo) como una línea JSON a medida que se genera.
+
+    Args:
+        ruta (str): Archivo de salida ("-" = salida estándar)
+
+    Returns:
+        int: Registros escritos
+    """
+    archivo = sys.stdout if ruta == "-" else open(ruta, "w", encoding="utf-8")
+    escritos = 0
+    try:
+        for registro in registros:
+            archivo.write(json.dumps(registro.to_dict(), ensure_ascii=False) + "\n")
+            escritos += 1
+    finally:
+        if archivo is not sys.stdout:
+            archivo.close()
+    return escritos
+
+
+def poblar(cantidad_egresados=0, cantidad_empleos=0, semilla=0, arbol=None, egresados=None, empleos=None):
+    """
+    Agrega registros sintéticos a las listas en memoria.
+
+    Por defecto son tree_models.egresados_data y empleos_data; tree_backend
+    las lee al construir el repositorio, así que hay que poblarlas antes de
+    la primera petición que lo usa. Las cédulas y los ids continúan después
+    de los existentes.
+
+    Returns:
+        tuple: (egresados agregados, empleos agregados)
+    """
+    if egresados is None or empleos is None:
+        import tree_models
+
+        egresados = tree_models.egresados_data if egresados is None else egresados
+        empleos = tree_models.empleos_data if empleos is None else empleos
+
+    generador = GeneradorSintetico(arbol, semilla)
+    cedulas = [int(egresado.cedula) for egresado in egresados if str(egresado.cedula).isdigit()]
+    antes_egresados, antes_empleos = len(egresados), len(empleos)
+    egresados.extend(generador.egresados(cantidad_egresados, max(cedulas + [CEDULA_INICIAL - 1]) + 1))
+    empleos.extend(generador.empleos(cantidad_empleos, max((empleo.id for empleo in empleos), default=0) + 1))
+    return len(egresados) - antes_egresados, len(empleos) - antes_empleos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera egresados y empleos sintéticos (JSONL)")
+    parser.add_argument("--egresados", type=int, default=0, help="Cantidad de egresados")
+    parser.add_argument("--empleos", type=int, default=0, help="Cantidad de empleos")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida-egresados", default="egresados.jsonl", help="Archivo JSONL ('-' = salida estándar)")
+    parser.add_argument("--salida-empleos", default="empleos.jsonl", help="Archivo JSONL ('-' = salida estándar)")
+    args = parser.parse_args(argv)
+    if args.egresados < 0 or args.empleos < 0:
+        print("Las cantidades no pueden ser negativas", file=sys.stderr)
+        return 2
+    if not args.egresados and not args.empleos:
+        print("Indique --egresados y/o --empleos", file=sys.stderr)
+        return 2
+
+    generador = GeneradorSintetico(semilla=args.semilla)
+    for cantidad, registros, ruta in ((args.egresados, generador.egresados, args.salida_egresados),
+                                      (args.empleos, generador.empleos, args.salida_empleos)):
+        if cantidad:
+            inicio = time.perf_counter()
+            escritos = escribir_jsonl(registros(cantidad), ruta)
+            duracion = time.perf_counter() - inicio
+            print(f"{ruta}: {escritos} registros en {duracion:.2f}s "
+                  f"({escritos / max(duracion, 1e-9):,.0f} registros/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
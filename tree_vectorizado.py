@@ -0,0 +1,195 @@
+"""
+Motor vectorizado (NumPy) para el ordenamiento por árbol jerárquico
+
+Representa todo el catálogo de empleos como arreglos (id de rol, id de
+especialización, multiplicador de prioridad y matriz de incidencia
+empleo × tecnología) y calcula los scores de un egresado contra todos los
+empleos con unas pocas operaciones vectorizadas. Reproduce exactamente
+ArbolJerarquico.afinidad_codificada.
+
+NumPy es opcional: si no está instalado el motor no se puede crear y la API
+sigue usando el motor por árbol en Python. Se importa al crear el primer
+motor, no al importar este módulo (importar NumPy alarga el arranque en frío
+aunque la petición no use ?motor=vectorizado).
+"""
+import importlib.util
+import threading
+
+np = None
+
+# Multiplicador por prioridad del rol (1=alta +20%, 2=media +10%, 3=baja sin ajuste)
+MULTIPLICADORES_PRIORIDAD = {1: 1.2, 2: 1.1}
+
+SIN_NODO = -1  # id usado para rol/especialización fuera del árbol
+
+
+def numpy_disponible():
+    """True si NumPy está instalado (sin importarlo)"""
+    return np is not None or importlib.util.find_spec("numpy") is not None
+
+
+def _importar_numpy():
+    global np
+    if np is None and numpy_disponible():
+        import numpy
+        np = numpy
+    return np
+
+
+class MotorVectorizado:
+    """
+    Catálogo de empleos en forma de arreglos para puntuar en lote.
+
+    Se registra como oyente de un CatalogoEmpleos; cada empleo agregado
+    ocupa una fila nueva (los arreglos crecen duplicando su capacidad).
+    Las filas siguen el orden del catálogo para desempatar igual que el
+    ordenamiento en Python. Actualizar un empleo reescribe su fila y
+    retirarlo la deja con multiplicador 0 (score 0, nunca aparece).
+    Los cambios y las consultas toman el mismo lock, así una consulta no ve
+    una fila a medio escribir ni un empleo retirado entre puntuar y ordenar.
+    """
+
+    def __init__(self, arbol, capacidad_inicial=64):
+        if _importar_numpy() is None:
+            raise RuntimeError("El motor vectorizado requiere NumPy (pip install numpy)")
+
+        self.arbol = arbol
+        self.version_arbol = arbol.version
+        self._pesos = np.asarray(arbol.pesos_nodos, dtype=np.int64)
+        self._empleos = []
+        self._filas = {}   # clave del empleo -> fila
+        self._n = 0
+        self._lock = threading.Lock()
+
+        n_nodos = len(arbol.nodos)
+        self._rol = np.full(capacidad_inicial, SIN_NODO, dtype=np.int32)
+        self._especializacion = np.full(capacidad_inicial, SIN_NODO, dtype=np.int32)
+        self._multiplicador = np.ones(capacidad_inicial, dtype=np.float64)
+        self._tecnologias = np.zeros((capacidad_inicial, n_nodos), dtype=np.uint8)
+
+    def conectar(self, catalogo):
+        """Carga el catálogo y se suscribe a sus cambios"""
+        catalogo.registrar(self)
+        return self
+
+    def _asegurar_capacidad(self):
+        capacidad = len(self._rol)
+        if self._n < capacidad:
+            return
+        nueva = capacidad * 2
+        self._rol = np.concatenate([self._rol, np.full(capacidad, SIN_NODO, dtype=np.int32)])
+        self._especializacion = np.concatenate(
+            [self._especializacion, np.full(capacidad, SIN_NODO, dtype=np.int32)])
+        self._multiplicador = np.concatenate([self._multiplicador, np.ones(capacidad)])
+        tecnologias = np.zeros((nueva, self._tecnologias.shape[1]), dtype=np.uint8)
+        tecnologias[:capacidad] = self._tecnologias
+        self._tecnologias = tecnologias
+
+    def _escribir_fila(self, fila, empleo):
+        codificado = self.arbol.codificar_empleo(empleo)
+        self._rol[fila] = SIN_NODO if codificado.rol is None else codificado.rol
+        self._especializacion[fila] = (SIN_NODO if codificado.especializacion is None
+                                       else codificado.especializacion)
+        self._multiplicador[fila] = MULTIPLICADORES_PRIORIDAD.get(codificado.prioridad, 1.0)
+        self._tecnologias[fila] = 0
+        mascara = codificado.tecnologias
+        while mascara:
+            bit = mascara & -mascara
+            self._tecnologias[fila, bit.bit_length() - 1] = 1
+            mascara ^= bit
+
+    def al_agregar(self, clave, empleo):
+        """Agrega el empleo como una fila nueva de los arreglos"""
+        with self._lock:
+            self._asegurar_capacidad()
+            self._escribir_fila(self._n, empleo)
+            self._empleos.append(empleo)
+            self._filas[clave] = self._n
+            self._n += 1
+
+    def al_actualizar(self, clave, anterior, empleo):
+        """Reescribe la fila del empleo"""
+        with self._lock:
+            fila = self._filas[clave]
+            self._escribir_fila(fila, empleo)
+            self._empleos[fila] = empleo
+
+    def al_retirar(self, clave, empleo):
+        """Anula la fila del empleo (queda con score 0)"""
+        with self._lock:
+            fila = self._filas.pop(clave)
+            self._rol[fila] = SIN_NODO
+            self._especializacion[fila] = SIN_NODO
+            self._multiplicador[fila] = 0.0
+            self._tecnologias[fila] = 0
+            self._empleos[fila] = None
+
+    def puntuar(self, egresado):
+        """
+        Scores del egresado contra todo el catálogo.
+
+        Returns:
+            numpy.ndarray: Score (0-1000) de cada empleo, en orden del catálogo
+        """
+        with self._lock:
+            return self._puntuar(egresado)
+
+    def _puntuar(self, egresado):
+        if self.arbol.version != self.version_arbol:
+            raise RuntimeError("El árbol cambió; hay que reconstruir el motor vectorizado")
+
+        n = self._n
+        perfil = self.arbol.codificar_egresado(egresado)
+        score = np.zeros(n, dtype=np.int64)
+
+        # Rol ×50 y especialización ×30 (peso del nodo coincidente)
+        if perfil.rol is not None:
+            score += (self._rol[:n] == perfil.rol) * (self._pesos[perfil.rol] * 50)
+        if perfil.especializacion is not None:
+            score += ((self._especializacion[:n] == perfil.especializacion)
+                      * (self._pesos[perfil.especializacion] * 30))
+
+        # Tecnologías: solo las columnas que maneja el egresado
+        columnas = []
+        mascara = perfil.tecnologias
+        while mascara:
+            bit = mascara & -mascara
+            columnas.append(bit.bit_length() - 1)
+            mascara ^= bit
+        if columnas:
+            incidencia = self._tecnologias[:n, columnas].astype(np.int64)
+            score += incidencia @ (self._pesos[columnas] * 15)
+            coincidencias = incidencia.sum(axis=1)
+            score += np.where(coincidencias >= 3, 100, np.where(coincidencias >= 2, 50, 0))
+
+        # Prioridad: int(score × multiplicador) y máximo 1000
+        score = (score * self._multiplicador[:n]).astype(np.int64)
+        return np.minimum(score, 1000)
+
+    def ordenar(self, egresado, limit=None, offset=0):
+        """
+        Empleos con score > 0 ordenados de mayor a menor afinidad.
+
+        Con limit solo se ordena la página pedida (np.argpartition sobre una
+        clave score/posición única, así los empates conservan el orden del
+        catálogo igual que sin paginar).
+
+        Returns:
+            tuple: (total de empleos con score > 0, lista de tuplas (score, empleo))
+        """
+        with self._lock:
+            scores = self._puntuar(egresado)
+            filas = np.flatnonzero(scores > 0)
+            total = len(filas)
+
+            if limit is not None and offset + limit < total:
+                n = len(scores)
+                # Mayor score primero; a igual score, menor fila primero
+                clave = scores[filas] * (n + 1) + (n - filas)
+                mejores = np.argpartition(-clave, offset + limit - 1)[:offset + limit]
+                filas = filas[mejores[np.argsort(-clave[mejores])]]
+            else:
+                filas = filas[np.argsort(-scores[filas], kind="stable")]
+
+            fin = None if limit is None else offset + limit
+            return total, [(int(scores[fila]), self._empleos[fila]) for fila in filas[offset:fin]]